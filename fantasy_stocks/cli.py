@@ -0,0 +1,56 @@
+# fantasy_stocks/cli.py
+"""
+Admin command line.
+
+    python -m fantasy_stocks.cli close-week [--week 2025-W39] [--league 1 --league 2] [--workers 8]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from .db import SessionLocal
+from .logic.week_close import close_week_for_leagues
+from .services.periods import current_week_label, iso_week_bounds
+
+
+def _close_week(args: argparse.Namespace) -> int:
+    week = args.week or current_week_label()
+    try:
+        iso_week_bounds(week)
+    except ValueError as exc:
+        args.parser.error(f"--week: {exc}")  # exits 2 with the subcommand's usage
+    report = close_week_for_leagues(
+        SessionLocal,
+        week,
+        args.league or None,
+        workers=args.workers,
+        max_attempts=args.max_attempts,
+    )
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0 if report["failed"] == 0 else 1  # unknown league ids are reported, not fatal
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="fantasy_stocks", description="Fantasy Stocks admin commands")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    cw = sub.add_parser("close-week", help="Close a week for all (or selected) leagues in parallel")
+    cw.add_argument("--week", help="ISO week label, e.g. 2025-W39 (default: current week)")
+    cw.add_argument("--league", type=int, action="append", help="League id to close (repeatable; default: all)")
+    cw.add_argument("--workers", type=int, default=4, help="Worker threads, one DB session each")
+    cw.add_argument("--max-attempts", type=int, default=3, help="Attempts per league for transient DB errors")
+    cw.set_defaults(func=_close_week, parser=cw)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
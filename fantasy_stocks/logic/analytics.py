@@ -0,0 +1,237 @@
+# fantasy_stocks/logic/analytics.py
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TypedDict
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from .. import models
+from .elo import ELO_K, ELO_START, elo_update
+
+
+class TeamRecord(TypedDict):
+    wins: int
+    losses: int
+    ties: int
+    gp: int
+
+
+def pythag_expectation(pf: float, pa: float, exponent: float = 2.0) -> float:
+    """
+    Classic Pythagorean expectation: pf^x / (pf^x + pa^x).
+    Handles zero gracefully.
+    """
+    if pf <= 0 and pa <= 0:
+        return 0.5
+    return (pf**exponent) / ((pf**exponent) + (pa**exponent))
+
+
+def streak_from(results: list[str]) -> str:
+    """
+    Compute current streak string like 'W3','L2','T1'. Empty => ''.
+    """
+    if not results:
+        return ""
+    last = results[-1]
+    n = 0
+    for r in reversed(results):
+        if r == last:
+            n += 1
+        else:
+            break
+    return f"{last}{n}"
+
+
+def last5_from(results: list[str]) -> str:
+    """
+    Return 'W-L-T' counts for the last 5 (or fewer) results, e.g., '3-1-1'.
+    """
+    if not results:
+        return "0-0-0"
+    chunk = results[-5:]
+    w = sum(1 for r in chunk if r == "W")
+    losses = sum(1 for r in chunk if r == "L")
+    t = sum(1 for r in chunk if r == "T")
+    return f"{w}-{losses}-{t}"
+
+
+class LeagueAnalytics:
+    """
+    Per-request analytics for one league.
+
+    Loads the league's teams and scored matches once (two queries) and derives
+    PF/PA, games played, W/L/T records, result timelines, opponents and Elo in a
+    single chronological pass. SOS, Pythagorean expectation, streaks and last-5
+    are cheap reads over those accumulators.
+    """
+
+    def __init__(self, db: Session, league_id: int, elo_k: float = ELO_K) -> None:
+        self.league_id = league_id
+        self.elo_k = elo_k
+        self.teams: list[models.Team] = (
+            db.query(models.Team).filter(models.Team.league_id == league_id).order_by(models.Team.id.asc()).all()
+        )
+        self.name_by_id: dict[int, str] = {t.id: t.name for t in self.teams}
+        self.matches: list[models.Match] = (
+            db.query(models.Match)
+            .filter(
+                models.Match.league_id == league_id,
+                models.Match.home_points.isnot(None),
+                models.Match.away_points.isnot(None),
+            )
+            .order_by(models.Match.id.asc())
+            .all()
+        )
+
+        self.pf: dict[int, float] = {}
+        self.pa: dict[int, float] = {}
+        self.records: dict[int, TeamRecord] = {}
+        self.timelines: dict[int, list[str]] = {}
+        self.opponents: dict[int, list[int]] = {}
+        self.elo: dict[int, float] = {tid: ELO_START for tid in self.name_by_id}
+        self._scan()
+
+    def _team(self, tid: int) -> TeamRecord:
+        rec = self.records.get(tid)
+        if rec is None:
+            self.pf[tid] = 0.0
+            self.pa[tid] = 0.0
+            self.timelines[tid] = []
+            self.opponents[tid] = []
+            self.elo.setdefault(tid, ELO_START)
+            rec = self.records[tid] = TeamRecord(wins=0, losses=0, ties=0, gp=0)
+        return rec
+
+    def _scan(self) -> None:
+        k = self.elo_k
+        for m in self.matches:
+            a, b = m.home_team_id, m.away_team_id
+            hp = float(m.home_points or 0.0)
+            ap = float(m.away_points or 0.0)
+            ra, rb = self._team(a), self._team(b)
+
+            self.pf[a] += hp
+            self.pa[a] += ap
+            self.pf[b] += ap
+            self.pa[b] += hp
+            ra["gp"] += 1
+            rb["gp"] += 1
+            self.opponents[a].append(b)
+            self.opponents[b].append(a)
+
+            if hp > ap:
+                sa = 1.0
+                ra["wins"] += 1
+                rb["losses"] += 1
+                self.timelines[a].append("W")
+                self.timelines[b].append("L")
+            elif ap > hp:
+                sa = 0.0
+                rb["wins"] += 1
+                ra["losses"] += 1
+                self.timelines[a].append("L")
+                self.timelines[b].append("W")
+            else:
+                sa = 0.5
+                ra["ties"] += 1
+                rb["ties"] += 1
+                self.timelines[a].append("T")
+                self.timelines[b].append("T")
+
+            self.elo[a], self.elo[b] = elo_update(self.elo[a], self.elo[b], sa, k)
+
+    def team_name(self, tid: int) -> str:
+        return self.name_by_id.get(tid, f"Team {tid}")
+
+    def record(self, tid: int) -> TeamRecord:
+        return self.records.get(tid) or TeamRecord(wins=0, losses=0, ties=0, gp=0)
+
+    def pythag(self, tid: int, exponent: float = 2.0) -> float:
+        return pythag_expectation(self.pf.get(tid, 0.0), self.pa.get(tid, 0.0), exponent=exponent)
+
+    def sos(self, tid: int) -> float:
+        """Average opponents' PF per game across the games played so far."""
+        opps = self.opponents.get(tid)
+        if not opps:
+            return 0.0
+        total = sum(self.pf[o] / (self.records[o]["gp"] or 1) for o in opps)
+        return total / len(opps)
+
+    def streak(self, tid: int) -> str:
+        return streak_from(self.timelines.get(tid, []))
+
+    def last5(self, tid: int) -> str:
+        return last5_from(self.timelines.get(tid, []))
+
+
+H2H_STATS = ("gp", "w", "l", "t", "pf", "pa")
+
+
+class H2HMatrix:
+    """
+    Head-to-head aggregates for N teams as six stacked N x N planes (gp, w, l,
+    t, pf, pa) in one (6, N, N) float ndarray. Row i is the team at index i of
+    `team_ids`, column j its opponent; the diagonal stays zero.
+
+    The scored matches are read into index/point columns once and scattered
+    into every plane with `np.add.at`, so no per-cell Python loop is involved.
+    """
+
+    __slots__ = ("team_ids", "n", "data")
+
+    def __init__(self, team_ids: list[int], matches: Iterable[models.Match]) -> None:
+        self.team_ids = team_ids
+        n = self.n = len(team_ids)
+        self.data = np.zeros((len(H2H_STATS), n, n))
+        idx = {tid: i for i, tid in enumerate(team_ids)}
+
+        cols = [
+            (idx[m.home_team_id], idx[m.away_team_id], float(m.home_points or 0.0), float(m.away_points or 0.0))
+            for m in matches
+            if m.home_team_id in idx and m.away_team_id in idx and m.home_team_id != m.away_team_id
+        ]
+        if not cols:
+            return
+        a, b, hp, ap = (np.array(c) for c in zip(*cols, strict=True))
+        a, b = a.astype(np.intp), b.astype(np.intp)
+        # every match counts once from each side: rows (a, b) for home, (b, a) for away
+        rows, opps = np.concatenate([a, b]), np.concatenate([b, a])
+        pf, pa = np.concatenate([hp, ap]), np.concatenate([ap, hp])
+        gp, w, lo, t, pf_plane, pa_plane = self.data
+        np.add.at(gp, (rows, opps), 1.0)
+        np.add.at(w, (rows, opps), pf > pa)
+        np.add.at(lo, (rows, opps), pf < pa)
+        np.add.at(t, (rows, opps), pf == pa)
+        np.add.at(pf_plane, (rows, opps), pf)
+        np.add.at(pa_plane, (rows, opps), pa)
+
+    def plane(self, stat: str) -> np.ndarray:
+        """One stat's N x N plane (a view)."""
+        return self.data[H2H_STATS.index(stat)]
+
+    def cell(self, i: int, j: int) -> dict[str, float]:
+        return dict(zip(H2H_STATS, self.data[:, i, j].tolist(), strict=True))
+
+    def pairs(self) -> tuple[np.ndarray, np.ndarray]:
+        """Row and column indexes of the cells that have met at least once, row-major."""
+        return np.nonzero(self.data[0])
+
+    def dense(self) -> list[list[dict[str, float]]]:
+        """N x N nested lists of {gp,w,l,t,pf,pa} cells."""
+        return [
+            [dict(zip(H2H_STATS, cell, strict=True)) for cell in row] for row in self.data.transpose(1, 2, 0).tolist()
+        ]
+
+    def sparse(self) -> list[list]:
+        """[team_id, opponent_id, gp, w, l, t, pf, pa] for every pair that has met."""
+        i, j = self.pairs()
+        stats = self.data[:, i, j].T.tolist()
+        ids = self.team_ids
+        return [[ids[r], ids[c], *vals] for r, c, vals in zip(i.tolist(), j.tolist(), stats, strict=True)]
+
+    def columnar(self) -> dict[str, list[float]]:
+        """Each stat's plane as a row-major flat list (cell (i, j) at i*N + j)."""
+        flat = self.data.reshape(len(H2H_STATS), -1).tolist()
+        return dict(zip(H2H_STATS, flat, strict=True))
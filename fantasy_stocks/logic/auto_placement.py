@@ -1,9 +1,12 @@
 # fantasy_stocks/logic/auto_placement.py
 from __future__ import annotations
 
+from collections.abc import Iterable
+
 from sqlalchemy.orm import Session
 
 from .. import models
+from ..services import league_version
 from .lineup_rules import (
     BUCKET_ETF,
     BUCKET_LARGE_CAP,
@@ -23,19 +26,13 @@ FLEX_CAP = REQUIRED["FLEX"]
 STARTERS_TOTAL = sum(PRIMARY_REQUIRED.values()) + FLEX_CAP  # 8
 
 
-def _count_primary(db: Session, team_id: int) -> tuple[dict[str, int], int]:
-    """Return counts of ACTIVE starters by primary bucket and total active."""
-    rows = (
-        db.query(models.RosterSlot)
-        .filter(
-            models.RosterSlot.team_id == team_id,
-            models.RosterSlot.is_active.is_(True),  # Ã¢â€ Â fix: no == True
-        )
-        .all()
-    )
+def tally_active(slots: Iterable[models.RosterSlot]) -> tuple[dict[str, int], int]:
+    """Counts of ACTIVE starters by primary bucket, and total active, over already-loaded slots."""
     counts: dict[str, int] = {}
     total = 0
-    for s in rows:
+    for s in slots:
+        if not s.is_active:
+            continue
         b = (s.bucket or "").upper()
         if b in PRIMARY:
             counts[b] = counts.get(b, 0) + 1
@@ -50,6 +47,19 @@ def _count_primary(db: Session, team_id: int) -> tuple[dict[str, int], int]:
     return counts, total
 
 
+def _count_primary(db: Session, team_id: int) -> tuple[dict[str, int], int]:
+    """Return counts of ACTIVE starters by primary bucket and total active."""
+    rows = (
+        db.query(models.RosterSlot)
+        .filter(
+            models.RosterSlot.team_id == team_id,
+            models.RosterSlot.is_active.is_(True),  # Ã¢â€ Â fix: no == True
+        )
+        .all()
+    )
+    return tally_active(rows)
+
+
 def _surplus(counts: dict[str, int]) -> int:
     return sum(max(0, counts.get(b, 0) - PRIMARY_REQUIRED[b]) for b in PRIMARY)
 
@@ -93,6 +103,20 @@ def _can_activate_now(counts: dict[str, int], total_active: int, new_bucket: str
     return False
 
 
+def place_in_tally(counts: dict[str, int], total_active: int, bucket: str) -> tuple[bool, int]:
+    """
+    Activation decision for one more slot of primary `bucket` against an
+    in-memory tally (see `tally_active`), so a batch can place many new slots
+    without re-counting. Updates `counts` when activated; returns
+    (activated, new total active).
+    """
+    b = bucket.upper()
+    if b not in PRIMARY or not _can_activate_now(counts, total_active, b):
+        return False, total_active
+    counts[b] = counts.get(b, 0) + 1
+    return True, total_active + 1
+
+
 def auto_place_new_slot(db: Session, team_id: int, slot_id: int, primary_bucket: str) -> dict:
     """
     Decide activation for a newly acquired roster slot.
@@ -123,6 +147,9 @@ def auto_place_new_slot(db: Session, team_id: int, slot_id: int, primary_bucket:
         slot.is_active = activate
         changed = True
     if changed:
+        team = db.get(models.Team, team_id)
+        if team is not None:
+            league_version.touch(db, team.league_id)
         db.commit()
         db.refresh(slot)
 
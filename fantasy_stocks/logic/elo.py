@@ -0,0 +1,199 @@
+# fantasy_stocks/logic/elo.py
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from .. import models
+
+ELO_START = 1500.0
+ELO_K = 32.0  # the K persisted in team_elo; other K values are replayed on demand
+
+
+def match_outcome(hp: float, ap: float) -> float:
+    """Home side's Elo score: 1 for a win, 0 for a loss, 0.5 for a tie."""
+    if hp > ap:
+        return 1.0
+    if ap > hp:
+        return 0.0
+    return 0.5
+
+
+def elo_update(ra: float, rb: float, sa: float, k: float = ELO_K) -> tuple[float, float]:
+    """Classic Elo step for one game; `sa` is the first team's score (see match_outcome)."""
+    ea = 1.0 / (1.0 + 10.0 ** ((rb - ra) / 400.0))
+    eb = 1.0 / (1.0 + 10.0 ** ((ra - rb) / 400.0))
+    return ra + k * (sa - ea), rb + k * ((1.0 - sa) - eb)
+
+
+def rebuild_elo(db: Session, league_id: int) -> None:
+    """
+    Replay every scored match of a league in id order and rewrite its team_elo
+    and elo_history rows. Used for backfill, re-scored matches and matches
+    scored out of order. Does NOT commit.
+    """
+    db.flush()
+    team_ids = {tid for (tid,) in db.query(models.Team.id).filter(models.Team.league_id == league_id)}
+    ratings = {tid: ELO_START for tid in team_ids}
+    games = dict.fromkeys(team_ids, 0)
+    last: dict[int, int | None] = dict.fromkeys(team_ids)
+    history: list[dict] = []
+
+    played = (
+        db.query(
+            models.Match.id,
+            models.Match.week,
+            models.Match.home_team_id,
+            models.Match.away_team_id,
+            models.Match.home_points,
+            models.Match.away_points,
+        )
+        .filter(
+            models.Match.league_id == league_id,
+            models.Match.home_points.isnot(None),
+            models.Match.away_points.isnot(None),
+        )
+        .order_by(models.Match.id.asc())
+    )
+    for mid, week, home, away, hp, ap in played:
+        if home not in ratings or away not in ratings:
+            continue
+        before_h, before_a = ratings[home], ratings[away]
+        ratings[home], ratings[away] = elo_update(before_h, before_a, match_outcome(float(hp), float(ap)))
+        for tid, before in ((home, before_h), (away, before_a)):
+            games[tid] += 1
+            last[tid] = mid
+            history.append(
+                {
+                    "league_id": league_id,
+                    "team_id": tid,
+                    "match_id": mid,
+                    "week": week,
+                    "rating_before": before,
+                    "rating_after": ratings[tid],
+                }
+            )
+
+    db.query(models.EloHistory).filter(models.EloHistory.league_id == league_id).delete(synchronize_session=False)
+    db.query(models.TeamElo).filter(models.TeamElo.league_id == league_id).delete(synchronize_session=False)
+    if ratings:
+        now = datetime.utcnow()
+        db.execute(
+            insert(models.TeamElo),
+            [
+                {
+                    "league_id": league_id,
+                    "team_id": tid,
+                    "rating": ratings[tid],
+                    "games": games[tid],
+                    "last_match_id": last[tid],
+                    "updated_at": now,
+                }
+                for tid in sorted(ratings)
+            ],
+        )
+    if history:
+        db.execute(insert(models.EloHistory), history)
+
+
+def apply_elo(
+    db: Session,
+    league_id: int,
+    matches: Iterable[models.Match],
+    previous: dict[int, tuple[float | None, float | None]],
+) -> None:
+    """
+    Fold newly scored matches into the persisted ratings, in match id order.
+
+    `previous` holds each match's points before this scoring pass (keyed by
+    match id), as for apply_match_results. Matches whose points did not change
+    are ignored. A full rebuild runs instead when a match that already had
+    points is re-scored, when a new match is older than the newest one already
+    folded in, or when the league has no ratings yet. Does NOT commit.
+    """
+    fresh: list[models.Match] = []
+    for m in matches:
+        if m.home_points is None or m.away_points is None:
+            continue
+        old_hp, old_ap = previous.get(m.id, (None, None))
+        if old_hp is not None and old_ap is not None:
+            if (old_hp, old_ap) == (m.home_points, m.away_points):
+                continue
+            rebuild_elo(db, league_id)
+            return
+        fresh.append(m)
+    if not fresh:
+        return
+    fresh.sort(key=lambda m: m.id)
+
+    rows = {r.team_id: r for r in db.query(models.TeamElo).filter(models.TeamElo.league_id == league_id)}
+    newest = max((r.last_match_id or 0 for r in rows.values()), default=0)
+    if not rows or fresh[0].id < newest:
+        rebuild_elo(db, league_id)
+        return
+
+    now = datetime.utcnow()
+    history: list[dict] = []
+    for m in fresh:
+        pair = []
+        for tid in (m.home_team_id, m.away_team_id):
+            row = rows.get(tid)
+            if row is None:  # joined after the league's first scored match
+                row = rows[tid] = models.TeamElo(league_id=league_id, team_id=tid, rating=ELO_START, games=0)
+                db.add(row)
+            pair.append(row)
+        home, away = pair
+        before_h, before_a = home.rating, away.rating
+        home.rating, away.rating = elo_update(before_h, before_a, match_outcome(m.home_points, m.away_points))
+        for row, before in ((home, before_h), (away, before_a)):
+            row.games += 1
+            row.last_match_id = m.id
+            row.updated_at = now
+            history.append(
+                {
+                    "league_id": league_id,
+                    "team_id": row.team_id,
+                    "match_id": m.id,
+                    "week": m.week,
+                    "rating_before": before,
+                    "rating_after": row.rating,
+                }
+            )
+    db.execute(insert(models.EloHistory), history)
+
+
+def load_elo(db: Session, league_id: int) -> list[tuple[int, str, models.TeamElo | None]]:
+    """
+    (team_id, team_name, rating row) for every team of the league in one joined
+    read. A league with scored matches but no ratings at all (scored before the
+    table existed) is rebuilt once (committed) and re-read.
+    """
+
+    def _read():
+        return (
+            db.query(models.Team.id, models.Team.name, models.TeamElo)
+            .outerjoin(models.TeamElo, models.TeamElo.team_id == models.Team.id)
+            .filter(models.Team.league_id == league_id)
+            .order_by(models.Team.id.asc())
+            .all()
+        )
+
+    rows = _read()
+    if rows and all(row is None for _, _, row in rows):
+        has_scored = (
+            db.query(models.Match.id)
+            .filter(
+                models.Match.league_id == league_id,
+                models.Match.home_points.isnot(None),
+                models.Match.away_points.isnot(None),
+            )
+            .first()
+        )
+        if has_scored:
+            rebuild_elo(db, league_id)
+            db.commit()
+            rows = _read()
+    return [(tid, name, row) for tid, name, row in rows]
@@ -0,0 +1,129 @@
+# fantasy_stocks/logic/player_query.py
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any, NamedTuple
+
+from sqlalchemy import or_
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ColumnElement
+
+from .. import models
+from ..services.catalog import DESC_BY_DEFAULT, SORT_KEYS
+
+_NULLABLE_KEYS = frozenset({"market_cap", "adp", "proj_points"})
+KEYSET_INDEXES = ("ix_securities_market_cap_symbol", "ix_securities_adp_symbol", "ix_securities_proj_points_symbol")
+
+
+class PlayerOrder(NamedTuple):
+    key: str  # a SORT_KEYS entry, or "rank" for relevance-ordered text search
+    column: ColumnElement
+    descending: bool
+    symbol_desc: bool  # tie-break direction: flips with the order so the composite index serves both
+
+
+def install_indexes(engine: Engine) -> None:
+    """
+    Create the (sort key, symbol) indexes `page_players` relies on when they
+    are missing: `create_all` does not add indexes to a `securities` table
+    that already exists. Run at startup (CREATE INDEX IF NOT EXISTS).
+    """
+    for index in models.Security.__table__.indexes:
+        if index.name in KEYSET_INDEXES:
+            index.create(bind=engine, checkfirst=True)
+
+
+def resolve_order(sort: str | None, order: str | None, rank: ColumnElement[int] | None = None) -> PlayerOrder:
+    """
+    Order for catalog listings. Known sort keys use their default direction
+    (market_cap/proj_points desc, symbol/adp asc) unless `order` overrides it;
+    without a usable sort key a text search orders by relevance `rank`, and
+    everything else by symbol.
+    """
+    key = (sort or "").strip().lower()
+    if key not in SORT_KEYS:
+        if rank is not None:
+            return PlayerOrder("rank", rank, False, False)
+        key = "symbol"
+    default_desc = key in DESC_BY_DEFAULT
+    direction = (order or "").strip().lower()
+    descending = True if direction == "desc" else False if direction == "asc" else default_desc
+    return PlayerOrder(key, getattr(models.Security, key), descending, descending != default_desc)
+
+
+def encode_cursor(order: PlayerOrder, value: Any, symbol: str) -> str:
+    raw = json.dumps([order.key, order.descending, value, symbol], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(order: PlayerOrder, cursor: str) -> tuple[Any, str]:
+    """(sort value, symbol) of the last row of the previous page; ValueError when malformed or for another order."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key, descending, value, symbol = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise ValueError("malformed cursor") from exc
+    if key != order.key or descending != order.descending or not isinstance(symbol, str):
+        raise ValueError("cursor does not match this sort order")
+    if value is not None and not isinstance(value, int | float | str):
+        raise ValueError("malformed cursor")
+    return value, symbol
+
+
+def page_players(
+    query: Query, order: PlayerOrder, cursor: str | None, limit: int
+) -> tuple[list[models.Security], str | None]:
+    """
+    Keyset page of a filtered Security query: (rows, next cursor or None).
+
+    Rows are ordered by (sort value, symbol); the cursor is the pair from the
+    last row served, and the next page continues strictly after it, so pages
+    stay stable while rows are added or removed elsewhere in the list. Missing
+    values sort as the lowest (first ascending, last descending) and are read
+    as a separate segment, which keeps every query a single range scan of the
+    matching (sort key, symbol) index no matter how deep the page is.
+    """
+    S = models.Security
+    col = order.column
+    value, symbol = decode_cursor(order, cursor) if cursor else (None, None)
+
+    def after_symbol(q: Query) -> Query:
+        return q.filter(S.symbol < symbol if order.symbol_desc else S.symbol > symbol)
+
+    by_symbol = S.symbol.desc() if order.symbol_desc else S.symbol.asc()
+    need = limit + 1  # one extra row tells whether there is a next page
+    found: list[tuple[models.Security, Any]] = []
+
+    if order.key == "symbol":
+        q = after_symbol(query) if cursor else query
+        found = [(r, r.symbol) for r in q.order_by(by_symbol).limit(need)]
+    else:
+        segments = ["values"]
+        if order.key in _NULLABLE_KEYS:
+            segments = ["values", "nulls"] if order.descending else ["nulls", "values"]
+            if cursor:  # resume in the cursor's segment
+                segments = segments[segments.index("nulls" if value is None else "values") :]
+
+        for i, segment in enumerate(segments):
+            resume = cursor is not None and i == 0
+            if segment == "nulls":
+                q = query.filter(col.is_(None))
+                q = after_symbol(q) if resume else q
+                found.extend((r, None) for r in q.order_by(by_symbol).limit(need - len(found)))
+            else:
+                q = query.filter(col.isnot(None)) if order.key in _NULLABLE_KEYS else query
+                if resume:
+                    bound, past = (col <= value, col < value) if order.descending else (col >= value, col > value)
+                    tie = S.symbol < symbol if order.symbol_desc else S.symbol > symbol
+                    q = q.filter(bound, or_(past, tie))
+                q = q.add_columns(col).order_by(col.desc() if order.descending else col.asc(), by_symbol)
+                found.extend((r, v) for r, v in q.limit(need - len(found)))
+            if len(found) >= need:
+                break
+
+    rows = found[:limit]
+    next_cursor = encode_cursor(order, rows[-1][1], rows[-1][0].symbol) if len(found) > limit else None
+    return [r for r, _ in rows], next_cursor
@@ -0,0 +1,176 @@
+# fantasy_stocks/logic/playoff_odds.py
+from __future__ import annotations
+
+import statistics
+from collections.abc import Callable, Iterable
+from typing import NamedTuple, TypedDict
+
+import numpy as np
+
+PLAYOFF_TEAMS = 4  # seeds 1v4 and 2v3 in the semis, winners meet in the final
+
+
+class TeamLine(NamedTuple):
+    wins: float
+    losses: float
+    ties: float
+    points_for: float
+    points_against: float
+
+
+class ScoreDist(NamedTuple):
+    mean: float
+    stdev: float
+
+
+class TeamOdds(TypedDict):
+    team_id: int
+    p_top4: float
+    p_champion: float
+    expected_seed: float
+    mean_points: float
+    stdev_points: float
+
+
+# (win_pct, h2h_win_pct, point_diff, points_for, coin) -> tiebreak columns, most significant first, best
+# seed = largest. Called once per chunk with (trials x teams) arrays, so it must only pick/reorder its inputs.
+TiebreakKey = Callable[..., tuple]
+
+# Trials drawn per batch: bounds the (trials x remaining matches) score matrices to a few MB each.
+TRIAL_CHUNK = 8192
+
+
+def score_distributions(team_ids: Iterable[int], history: Iterable[tuple[int, float]]) -> dict[int, ScoreDist]:
+    """
+    Per-team weekly score distribution from (team_id, points) history.
+    Teams with fewer than two scores borrow the league-wide mean/stdev.
+    """
+    by_team: dict[int, list[float]] = {}
+    everything: list[float] = []
+    for tid, pts in history:
+        by_team.setdefault(tid, []).append(float(pts))
+        everything.append(float(pts))
+    league_mean = statistics.fmean(everything) if everything else 0.0
+    league_sd = statistics.pstdev(everything) if len(everything) > 1 else 0.0
+
+    out: dict[int, ScoreDist] = {}
+    for tid in team_ids:
+        pts = by_team.get(tid, [])
+        if len(pts) >= 2:
+            out[tid] = ScoreDist(statistics.fmean(pts), statistics.stdev(pts))
+        elif pts:
+            out[tid] = ScoreDist(pts[0], league_sd)
+        else:
+            out[tid] = ScoreDist(league_mean, league_sd)
+    return out
+
+
+def simulate_playoff_odds(
+    team_ids: list[int],
+    table: dict[int, TeamLine],
+    h2h: dict[int, TeamLine],
+    remaining: list[tuple[int, int]],
+    dists: dict[int, ScoreDist],
+    coins: dict[int, float],
+    key: TiebreakKey,
+    *,
+    trials: int,
+    seed: int | None = None,
+) -> list[TeamOdds]:
+    """
+    Monte Carlo over the remaining regular-season matches (home_id, away_id).
+
+    Each trial draws every remaining score from the teams' normal distributions,
+    seeds the league with the same tiebreak key as the real seeding (overall
+    win pct, league-wide head-to-head, point diff, points for, coin), then plays
+    the four-team bracket the same way (ties go to the higher seed).
+
+    Vectorized with NumPy, TRIAL_CHUNK trials at a time: one (trials x matches)
+    normal matrix per side, win/loss/tie and points tallies as products with the
+    (matches x teams) home/away incidence matrices, and the seeding of every
+    trial in one `np.lexsort` over the tiebreak columns.
+    """
+    n = len(team_ids)
+    if n < PLAYOFF_TEAMS:
+        raise ValueError(f"Need at least {PLAYOFF_TEAMS} teams for playoffs")
+    idx = {tid: i for i, tid in enumerate(team_ids)}
+    zero = TeamLine(0.0, 0.0, 0.0, 0.0, 0.0)
+
+    base = np.array([table.get(t, zero) for t in team_ids], dtype=float).reshape(n, 5)
+    base_h2h = np.array([h2h.get(t, zero) for t in team_ids], dtype=float).reshape(n, 5)
+    mu = np.array([dists[t].mean for t in team_ids], dtype=float)
+    sd = np.array([dists[t].stdev for t in team_ids], dtype=float)
+    coin = np.array([coins[t] for t in team_ids], dtype=float)
+
+    home = np.array([idx[h] for h, _ in remaining], dtype=np.intp)
+    away = np.array([idx[a] for _, a in remaining], dtype=np.intp)
+    at_home = np.zeros((len(remaining), n))
+    at_home[np.arange(len(remaining)), home] = 1.0
+    on_road = np.zeros((len(remaining), n))
+    on_road[np.arange(len(remaining)), away] = 1.0
+
+    rng = np.random.default_rng(seed)
+    seats = np.arange(1, n + 1)
+
+    def pct(w: np.ndarray, losses: np.ndarray, t: np.ndarray) -> np.ndarray:
+        gp = w + losses + t
+        return np.divide(w + 0.5 * t, gp, out=np.zeros_like(gp), where=gp > 0)
+
+    def play(hi: np.ndarray, lo: np.ndarray) -> np.ndarray:
+        """Higher seeds `hi` vs lower seeds `lo`, one game per trial; a tie goes to `hi`."""
+        hi_pts = rng.normal(mu[hi], sd[hi])
+        lo_pts = rng.normal(mu[lo], sd[lo])
+        return np.where(lo_pts > hi_pts, lo, hi)
+
+    seed_sum = np.zeros(n)
+    top = np.zeros(n, dtype=np.int64)
+    champs = np.zeros(n, dtype=np.int64)
+    for done in range(0, trials, TRIAL_CHUNK):
+        k = min(TRIAL_CHUNK, trials - done)
+        hp = rng.normal(mu[home], sd[home], size=(k, len(remaining)))
+        ap = rng.normal(mu[away], sd[away], size=(k, len(remaining)))
+        home_won = (hp > ap).astype(float)
+        away_won = (ap > hp).astype(float)
+        tied = 1.0 - home_won - away_won
+
+        # simulated results move the overall and the head-to-head record alike
+        dw = home_won @ at_home + away_won @ on_road
+        dl = away_won @ at_home + home_won @ on_road
+        dt = tied @ (at_home + on_road)
+        pf = base[:, 3] + hp @ at_home + ap @ on_road
+        pa = base[:, 4] + ap @ at_home + hp @ on_road
+
+        columns = key(
+            pct(base[:, 0] + dw, base[:, 1] + dl, base[:, 2] + dt),
+            pct(base_h2h[:, 0] + dw, base_h2h[:, 1] + dl, base_h2h[:, 2] + dt),
+            pf - pa,
+            pf,
+            np.broadcast_to(coin, (k, n)),
+        )
+        # lexsort: last key is the primary one, ascending -> negate for best seed first
+        order = np.lexsort([-c for c in reversed(columns)], axis=-1)
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, seats, axis=-1)
+        seed_sum += ranks.sum(axis=0)
+        top += np.bincount(order[:, :PLAYOFF_TEAMS].ravel(), minlength=n)
+
+        s1, s2, s3, s4 = order[:, 0], order[:, 1], order[:, 2], order[:, 3]
+        f1 = play(s1, s4)
+        f2 = play(s2, s3)
+        # final: the better-seeded finalist keeps the tie advantage (f1 is seed 1 or 4, f2 seed 2 or 3)
+        f1_better = f1 == s1
+        champs += np.bincount(play(np.where(f1_better, f1, f2), np.where(f1_better, f2, f1)), minlength=n)
+
+    out: list[TeamOdds] = [
+        {
+            "team_id": tid,
+            "p_top4": float(top[i]) / trials,
+            "p_champion": float(champs[i]) / trials,
+            "expected_seed": float(seed_sum[i]) / trials,
+            "mean_points": float(mu[i]),
+            "stdev_points": float(sd[i]),
+        }
+        for i, tid in enumerate(team_ids)
+    ]
+    out.sort(key=lambda r: (r["expected_seed"], r["team_id"]))
+    return out
@@ -1,10 +1,16 @@
 # fantasy_stocks/logic/scoring.py
 from __future__ import annotations
 
+from typing import TypedDict
+
+from sqlalchemy import bindparam, insert, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from .. import models
-from ..services import pricing
+from ..services import league_version, pricing
+from .elo import apply_elo
+from .standings import apply_match_results
 
 
 def _active_starter_symbols(db: Session, team_id: int, starters_limit: int | None = None) -> list[str]:
@@ -42,61 +48,260 @@ def compute_team_points_live(db: Session, league: models.League, team_id: int, i
     Sum per-day % changes for each starter over the given ISO week, then sum across starters.
     """
     symbols = _active_starter_symbols(db, team_id, starters_limit=league.starters)
-    return sum(pricing.get_week_return_pct(db, sym, iso_week) for sym in symbols)
+    returns = pricing.get_week_returns(db, symbols, iso_week)
+    return sum(returns[sym] for sym in symbols)
 
 
-def close_week(db: Session, league_id: int, iso_week: str) -> None:
+# ----------------------------
+# Batch scoring engine
+# ----------------------------
+
+
+class WeekScoring(TypedDict):
+    matches: list[models.Match]  # every match in the league/week, ordered by id
+    scored: list[models.Match]  # matches (re)scored by this call
+    points: dict[int, float]  # team_id -> points computed by this call
+
+
+def starters_by_team(db: Session, team_ids: set[int], starters_limit: int | None = None) -> dict[int, list[str]]:
     """
-    Calculate and persist weekly points for all matches in the given league/week,
-    honoring league.scoring_mode. Also updates Match winner & points, and writes TeamScore rows.
+    Active starter symbols for many teams in one query (same ordering as _active_starter_symbols).
+    Public so live scoreboards can track lineups without recomputing points.
     """
-    league = db.get(models.League, league_id)
-    if not league:
-        raise ValueError(f"League {league_id} not found")
+    out: dict[int, list[str]] = {tid: [] for tid in team_ids}
+    if not team_ids:
+        return out
+    rows = (
+        db.query(models.RosterSlot.team_id, models.RosterSlot.symbol)
+        .filter(models.RosterSlot.team_id.in_(team_ids), models.RosterSlot.is_active.is_(True))
+        .order_by(models.RosterSlot.team_id.asc(), models.RosterSlot.id.asc())
+        .all()
+    )
+    for team_id, symbol in rows:
+        out[team_id].append(symbol)
+    if starters_limit is not None:
+        out = {tid: syms[:starters_limit] for tid, syms in out.items()}
+    return out
+
+
+def _points_by_symbol(
+    db: Session, symbols: set[str], mode: models.ScoringMode, iso_week: str | None
+) -> dict[str, float]:
+    """
+    Per-symbol points for the week: projections come from one Security query,
+    LIVE returns come from one grouped Price query. Projections do not depend
+    on the week, so `iso_week` may be None for them.
+    """
+    if not symbols:
+        return {}
+    if mode == models.ScoringMode.LIVE:
+        if iso_week is None:
+            raise ValueError("LIVE scoring needs an iso_week")
+        return pricing.get_week_returns(db, symbols, iso_week)
+
+    rows = (
+        db.query(models.Security.symbol, models.Security.proj_points).filter(models.Security.symbol.in_(symbols)).all()
+    )
+    out = {sym: 0.0 for sym in symbols}
+    for sym, proj in rows:
+        out[sym] = float(proj or 0.0)
+    return out
+
+
+def week_points(
+    db: Session,
+    team_ids: set[int],
+    mode: models.ScoringMode,
+    iso_week: str | None,
+    *,
+    starters_limit: int | None = None,
+) -> dict[int, float]:
+    """
+    team_id -> points of its active starters for the week, computed in two queries
+    and without touching the session (used for scoring and for live scoreboards).
+    """
+    starters = starters_by_team(db, team_ids, starters_limit=starters_limit)
+    sym_points = _points_by_symbol(db, {s for syms in starters.values() for s in syms}, mode, iso_week)
+    return {tid: sum(sym_points.get(s, 0.0) for s in syms) for tid, syms in starters.items()}
+
+
+def score_week(
+    db: Session,
+    league: models.League,
+    iso_week: str,
+    *,
+    mode: models.ScoringMode | None = None,
+    starters_limit: int | None = None,
+    only_unscored: bool = False,
+) -> WeekScoring:
+    """
+    Set-based scoring for every match of a league/week.
+
+    Loads matches, active starters, per-symbol points and existing TeamScore rows
+    in a constant number of queries, computes all team totals in memory, then
+    applies Match, TeamScore and TeamStanding changes to the session in one batch.
+    Does NOT commit; callers own the transaction.
+
+    - mode: defaults to league.scoring_mode
+    - starters_limit: trim each team's active starters (None = all active)
+    - only_unscored: skip matches that already have both points set
+    """
+    mode = mode or league.scoring_mode
 
-    # Fetch all matches for this week
     matches: list[models.Match] = (
         db.query(models.Match)
         .filter(models.Match.league_id == league.id, models.Match.week == iso_week)
         .order_by(models.Match.id.asc())
         .all()
     )
+    targets = [m for m in matches if not (only_unscored and m.home_points is not None and m.away_points is not None)]
+    if not targets:
+        return {"matches": matches, "scored": [], "points": {}}
 
-    for m in matches:
-        if league.scoring_mode == models.ScoringMode.LIVE:
-            home_pts = compute_team_points_live(db, league, m.home_team_id, iso_week)
-            away_pts = compute_team_points_live(db, league, m.away_team_id, iso_week)
-        else:
-            home_pts = compute_team_points_projections(db, league, m.home_team_id)
-            away_pts = compute_team_points_projections(db, league, m.away_team_id)
-
-        # Persist TeamScore rows (upsert-ish: keep it simple; assume at most one per (league,team,period))
-        for team_id, pts in [(m.home_team_id, home_pts), (m.away_team_id, away_pts)]:
-            existing = (
-                db.query(models.TeamScore)
-                .filter(
-                    models.TeamScore.league_id == league.id,
-                    models.TeamScore.team_id == team_id,
-                    models.TeamScore.period == iso_week,
-                )
-                .first()
-            )
-            if existing:
-                if existing.points != pts:
-                    existing.points = pts
-                    db.add(existing)
-            else:
-                db.add(models.TeamScore(league_id=league.id, team_id=team_id, period=iso_week, points=pts))
-
-        # Update match outcome
-        m.home_points = home_pts
-        m.away_points = away_pts
-        if abs(home_pts - away_pts) < 1e-9:
+    team_ids = {m.home_team_id for m in targets} | {m.away_team_id for m in targets}
+    points = week_points(db, team_ids, mode, iso_week, starters_limit=starters_limit)
+
+    existing: dict[int, models.TeamScore] = {
+        ts.team_id: ts
+        for ts in db.query(models.TeamScore).filter(
+            models.TeamScore.league_id == league.id,
+            models.TeamScore.period == iso_week,
+            models.TeamScore.team_id.in_(team_ids),
+        )
+    }
+
+    previous = {m.id: (m.home_points, m.away_points) for m in targets}
+    new_scores: list[dict] = []
+    for tid in sorted(team_ids):
+        pts = points[tid]
+        ts = existing.get(tid)
+        if ts is None:
+            new_scores.append({"league_id": league.id, "team_id": tid, "period": iso_week, "points": pts})
+        elif ts.points != pts:
+            ts.points = pts
+
+    for m in targets:
+        hp = points[m.home_team_id]
+        ap = points[m.away_team_id]
+        m.home_points = hp
+        m.away_points = ap
+        if abs(hp - ap) < 1e-9:
             m.winner_team_id = None  # tie
         else:
-            m.winner_team_id = m.home_team_id if home_pts > away_pts else m.away_team_id
-        db.add(m)
+            m.winner_team_id = m.home_team_id if hp > ap else m.away_team_id
+
+    if new_scores:
+        # executemany without RETURNING: one statement regardless of team count
+        db.execute(insert(models.TeamScore), new_scores)
+    apply_match_results(db, league.id, targets, previous)
+    apply_elo(db, league.id, targets, previous)
+    league_version.touch(db, league.id)
+    return {"matches": matches, "scored": targets, "points": points}
+
+
+class WeekSummary(TypedDict):
+    week: str
+    matches_scored: int
+    total_points: float
+    top_team_id: int | None  # highest scorer among this call's matches of the week
 
+
+def simulate_season_fast(
+    db: Session,
+    league: models.League,
+    *,
+    starters_limit: int | None = None,
+    only_unscored: bool = False,
+) -> list[WeekSummary]:
+    """
+    Score every week of the league's schedule with projections in one pass.
+
+    Projection points only depend on the active lineup, not on the week, so each
+    team's total is computed once and applied to all target matches in bulk.
+    The whole season costs a fixed number of queries (matches, starters,
+    projections, existing TeamScores, standings) however many weeks there are.
+    Does NOT commit; callers own the (single) transaction.
+    """
+    matches: list[models.Match] = (
+        db.query(models.Match)
+        .filter(models.Match.league_id == league.id)
+        .order_by(models.Match.week.asc(), models.Match.id.asc())
+        .all()
+    )
+    targets = [m for m in matches if not (only_unscored and m.home_points is not None and m.away_points is not None)]
+    if not targets:
+        return []
+
+    team_ids = {m.home_team_id for m in targets} | {m.away_team_id for m in targets}
+    points = week_points(db, team_ids, models.ScoringMode.PROJECTIONS, None, starters_limit=starters_limit)
+
+    teams_by_week: dict[str, set[int]] = {}
+    for m in targets:
+        teams_by_week.setdefault(m.week, set()).update((m.home_team_id, m.away_team_id))
+    existing: dict[tuple[int, str], models.TeamScore] = {
+        (ts.team_id, ts.period): ts
+        for ts in db.query(models.TeamScore).filter(
+            models.TeamScore.league_id == league.id,
+            models.TeamScore.period.in_(list(teams_by_week)),
+            models.TeamScore.team_id.in_(team_ids),
+        )
+    }
+    new_scores: list[dict] = []
+    for week, tids in teams_by_week.items():
+        for tid in sorted(tids):
+            ts = existing.get((tid, week))
+            if ts is None:
+                new_scores.append({"league_id": league.id, "team_id": tid, "period": week, "points": points[tid]})
+            elif ts.points != points[tid]:
+                ts.points = points[tid]
+
+    previous = {m.id: (m.home_points, m.away_points) for m in targets}
+    summaries: dict[str, WeekSummary] = {}
+    match_rows: list[dict] = []
+    for m in targets:
+        hp, ap = points[m.home_team_id], points[m.away_team_id]
+        winner = None if abs(hp - ap) < 1e-9 else m.home_team_id if hp > ap else m.away_team_id
+        match_rows.append({"k_id": m.id, "k_hp": hp, "k_ap": ap, "k_winner": winner})
+        # written below in one executemany; keep the loaded objects in step without a flush
+        set_committed_value(m, "home_points", hp)
+        set_committed_value(m, "away_points", ap)
+        set_committed_value(m, "winner_team_id", winner)
+
+        summary = summaries.setdefault(
+            m.week, {"week": m.week, "matches_scored": 0, "total_points": 0.0, "top_team_id": None}
+        )
+        summary["matches_scored"] += 1
+        summary["total_points"] += hp + ap
+        for tid, pts in ((m.home_team_id, hp), (m.away_team_id, ap)):
+            top = summary["top_team_id"]
+            if top is None or pts > points[top]:
+                summary["top_team_id"] = tid
+
+    t = models.Match.__table__
+    db.execute(
+        update(t)
+        .where(t.c.id == bindparam("k_id"))
+        .values(home_points=bindparam("k_hp"), away_points=bindparam("k_ap"), winner_team_id=bindparam("k_winner")),
+        match_rows,
+    )
+    if new_scores:
+        db.execute(insert(models.TeamScore), new_scores)
+    apply_match_results(db, league.id, targets, previous)
+    apply_elo(db, league.id, targets, previous)
+    league_version.touch(db, league.id)
+    return list(summaries.values())
+
+
+def close_week(db: Session, league_id: int, iso_week: str) -> None:
+    """
+    Calculate and persist weekly points for all matches in the given league/week,
+    honoring league.scoring_mode. Also updates Match winner & points, and writes TeamScore rows.
+    """
+    league = db.get(models.League, league_id)
+    if not league:
+        raise ValueError(f"League {league_id} not found")
+
+    score_week(db, league, iso_week, starters_limit=league.starters)
     db.commit()
 
 
@@ -113,62 +318,19 @@ def close_week_with_proj_points(db: Session, league_id: int, iso_week: str) -> N
     if not league:
         raise ValueError(f"League {league_id} not found")
 
-    matches: list[models.Match] = (
-        db.query(models.Match)
-        .filter(models.Match.league_id == league.id, models.Match.week == iso_week)
-        .order_by(models.Match.id.asc())
-        .all()
-    )
-
-    for m in matches:
-        home_pts = compute_team_points_projections(db, league, m.home_team_id)
-        away_pts = compute_team_points_projections(db, league, m.away_team_id)
-
-        # team score rows
-        for team_id, pts in [(m.home_team_id, home_pts), (m.away_team_id, away_pts)]:
-            existing = (
-                db.query(models.TeamScore)
-                .filter(
-                    models.TeamScore.league_id == league.id,
-                    models.TeamScore.team_id == team_id,
-                    models.TeamScore.period == iso_week,
-                )
-                .first()
-            )
-            if existing:
-                if existing.points != pts:
-                    existing.points = pts
-                    db.add(existing)
-            else:
-                db.add(models.TeamScore(league_id=league.id, team_id=team_id, period=iso_week, points=pts))
-
-        m.home_points = home_pts
-        m.away_points = away_pts
-        if abs(home_pts - away_pts) < 1e-9:
-            m.winner_team_id = None
-        else:
-            m.winner_team_id = m.home_team_id if home_pts > away_pts else m.away_team_id
-        db.add(m)
-
+    score_week(db, league, iso_week, mode=models.ScoringMode.PROJECTIONS, starters_limit=league.starters)
     db.commit()
 
 
-def simulate_season_with_proj_points(db: Session, league_id: int) -> None:
+def simulate_season_with_proj_points(db: Session, league_id: int) -> list[WeekSummary]:
     """
-    Iterate all distinct weeks in the league's schedule and close each using projections.
-    (Compatibility shim for older code.)
+    Close every week in the league's schedule using projections, in one transaction.
+    (Compatibility shim for older code; see simulate_season_fast.)
     """
     league = db.get(models.League, league_id)
     if not league:
         raise ValueError(f"League {league_id} not found")
 
-    weeks: list[str] = [
-        w
-        for (w,) in db.query(models.Match.week)
-        .filter(models.Match.league_id == league.id)
-        .distinct()
-        .order_by(models.Match.week.asc())
-        .all()
-    ]
-    for wk in weeks:
-        close_week_with_proj_points(db, league_id, wk)
+    summaries = simulate_season_fast(db, league, starters_limit=league.starters)
+    db.commit()
+    return summaries
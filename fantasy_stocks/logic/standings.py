@@ -0,0 +1,152 @@
+# fantasy_stocks/logic/standings.py
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime
+from typing import TypedDict
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from .. import models
+
+_FIELDS = ("wins", "losses", "ties", "games_played", "points_for", "points_against")
+
+
+class StandingDelta(TypedDict):
+    wins: int
+    losses: int
+    ties: int
+    games_played: int
+    points_for: float
+    points_against: float
+
+
+def _zero() -> StandingDelta:
+    return StandingDelta(wins=0, losses=0, ties=0, games_played=0, points_for=0.0, points_against=0.0)
+
+
+def _add_result(acc: dict[int, StandingDelta], home: int, away: int, hp: float, ap: float, sign: int) -> None:
+    """Fold one scored match into per-team deltas (sign=-1 removes it)."""
+    h = acc.setdefault(home, _zero())
+    a = acc.setdefault(away, _zero())
+    h["games_played"] += sign
+    a["games_played"] += sign
+    h["points_for"] += sign * hp
+    h["points_against"] += sign * ap
+    a["points_for"] += sign * ap
+    a["points_against"] += sign * hp
+    if hp > ap:
+        h["wins"] += sign
+        a["losses"] += sign
+    elif ap > hp:
+        a["wins"] += sign
+        h["losses"] += sign
+    else:
+        h["ties"] += sign
+        a["ties"] += sign
+
+
+def rebuild_standings(db: Session, league_id: int) -> None:
+    """
+    Recompute every team's standing row for a league from its scored matches.
+    Used to backfill leagues scored before the aggregate existed. Does NOT commit.
+    """
+    db.flush()
+    acc: dict[int, StandingDelta] = {
+        tid: _zero() for (tid,) in db.query(models.Team.id).filter(models.Team.league_id == league_id)
+    }
+    played = db.query(
+        models.Match.home_team_id, models.Match.away_team_id, models.Match.home_points, models.Match.away_points
+    ).filter(
+        models.Match.league_id == league_id,
+        models.Match.home_points.isnot(None),
+        models.Match.away_points.isnot(None),
+    )
+    for home, away, hp, ap in played:
+        if home in acc and away in acc:
+            _add_result(acc, home, away, float(hp), float(ap), 1)
+
+    db.query(models.TeamStanding).filter(models.TeamStanding.league_id == league_id).delete(synchronize_session=False)
+    if acc:
+        now = datetime.utcnow()
+        db.execute(
+            insert(models.TeamStanding),
+            [{"league_id": league_id, "team_id": tid, "updated_at": now, **d} for tid, d in acc.items()],
+        )
+
+
+def apply_match_results(
+    db: Session,
+    league_id: int,
+    matches: Iterable[models.Match],
+    previous: dict[int, tuple[float | None, float | None]],
+) -> None:
+    """
+    Move the standing rows by the difference between each match's previous
+    points (from `previous`, keyed by match id) and its current points.
+    One read and at most one insert per call; falls back to a full rebuild
+    when a team has no row yet. Does NOT commit.
+    """
+    acc: dict[int, StandingDelta] = {}
+    for m in matches:
+        old_hp, old_ap = previous.get(m.id, (None, None))
+        if old_hp is not None and old_ap is not None:
+            _add_result(acc, m.home_team_id, m.away_team_id, float(old_hp), float(old_ap), -1)
+        if m.home_points is not None and m.away_points is not None:
+            _add_result(acc, m.home_team_id, m.away_team_id, float(m.home_points), float(m.away_points), 1)
+    if not acc:
+        return
+
+    rows = {
+        st.team_id: st
+        for st in db.query(models.TeamStanding).filter(
+            models.TeamStanding.league_id == league_id, models.TeamStanding.team_id.in_(acc)
+        )
+    }
+    if len(rows) < len(acc):
+        rebuild_standings(db, league_id)
+        return
+
+    now = datetime.utcnow()
+    for tid, delta in acc.items():
+        st = rows[tid]
+        if all(delta[f] == 0 for f in _FIELDS):
+            continue
+        for f in _FIELDS:
+            setattr(st, f, getattr(st, f) + delta[f])
+        st.updated_at = now
+
+
+def load_standings(db: Session, league_id: int) -> list[tuple[int, str, models.TeamStanding | None]]:
+    """
+    (team_id, team_name, standing) for every team of the league in one joined
+    read. Teams without a row while the league has scored matches trigger a
+    one-time rebuild (committed) and a re-read.
+    """
+
+    def _read():
+        return (
+            db.query(models.Team.id, models.Team.name, models.TeamStanding)
+            .outerjoin(models.TeamStanding, models.TeamStanding.team_id == models.Team.id)
+            .filter(models.Team.league_id == league_id)
+            .order_by(models.Team.id.asc())
+            .all()
+        )
+
+    rows = _read()
+    if any(st is None for _, _, st in rows):
+        has_scored = (
+            db.query(models.Match.id)
+            .filter(
+                models.Match.league_id == league_id,
+                models.Match.home_points.isnot(None),
+                models.Match.away_points.isnot(None),
+            )
+            .first()
+        )
+        if has_scored:
+            rebuild_standings(db, league_id)
+            db.commit()
+            rows = _read()
+    return [(tid, name, st) for tid, name, st in rows]
@@ -1,6 +1,8 @@
 # fantasy_stocks/logic/ticker_registry.py
 from __future__ import annotations
 
+from collections.abc import Iterable
+
 from sqlalchemy.orm import Session
 
 from .. import models
@@ -77,3 +79,19 @@ def resolve_bucket_db_first(db: Session, symbol: str) -> str | None:
     if b:
         return b
     return _TICKER_TO_BUCKET.get(sym)
+
+
+_BATCH = 500  # symbols per IN (...) lookup
+
+
+def resolve_buckets_db_first(db: Session, symbols: Iterable[str]) -> dict[str, str | None]:
+    """
+    Set-based `resolve_bucket_db_first`: one `securities` lookup per 500
+    symbols instead of one per symbol. Keys are the normalized symbols.
+    """
+    syms = sorted({s.strip().upper() for s in symbols if s and s.strip()})
+    rows: dict[str, models.Security] = {}
+    for i in range(0, len(syms), _BATCH):
+        chunk = syms[i : i + _BATCH]
+        rows.update((r.symbol, r) for r in db.query(models.Security).filter(models.Security.symbol.in_(chunk)))
+    return {s: _derive_bucket_from_row(rows.get(s)) or _TICKER_TO_BUCKET.get(s) for s in syms}
@@ -0,0 +1,222 @@
+# fantasy_stocks/logic/waivers.py
+from __future__ import annotations
+
+import time
+import uuid
+from datetime import datetime
+from typing import TypedDict
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..services import league_version
+from ..services.rostered import rostered
+from .auto_placement import PRIMARY, place_in_tally, tally_active
+from .ticker_registry import resolve_buckets_db_first
+
+
+class ClaimOutcome(TypedDict):
+    claim_id: int
+    team_id: int
+    symbol: str
+    drop_symbol: str | None
+    bid_amount: float
+    status: str  # "won" | "lost" | "invalid"
+    reason: str | None  # why a claim lost or was invalid
+    slot_id: int | None
+    bucket: str | None
+    activated: bool
+
+
+class WaiverRunReport(TypedDict):
+    league_id: int
+    claims: int
+    won: int
+    lost: int
+    invalid: int
+    waiver_order: list[int]  # team ids, first = highest priority
+    wall_ms: float
+    results: list[ClaimOutcome]  # in processing order
+
+
+def waiver_order(db: Session, league_id: int) -> list[int]:
+    """
+    Team ids by waiver priority: worst record first (fewest wins, then
+    fewest points for), team id as the final tie-break. Teams without a
+    standings row count as 0-0.
+    """
+    teams = [tid for (tid,) in db.query(models.Team.id).filter(models.Team.league_id == league_id)]
+    standings = {
+        row.team_id: (row.wins, row.points_for)
+        for row in db.query(models.TeamStanding).filter(models.TeamStanding.league_id == league_id)
+    }
+    return sorted(teams, key=lambda tid: (*standings.get(tid, (0, 0.0)), tid))
+
+
+def _claim_pending(db: Session, league_id: int) -> list[models.WaiverClaim]:
+    """
+    Take the league's pending claims for this run: one UPDATE flips them to
+    "processing" under a run token and commits, so a run that overlaps only
+    sees (and settles) the claims its own UPDATE matched.
+    """
+    W = models.WaiverClaim
+    token = f"run:{uuid.uuid4().hex}"
+    db.execute(
+        update(W)
+        .where(W.league_id == league_id, W.status == "pending")
+        .values(status="processing", run_token=token)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return db.query(W).filter(W.league_id == league_id, W.status == "processing", W.run_token == token).all()
+
+
+def _release(db: Session, claim_ids: list[int]) -> None:
+    """Put claims taken by a run that failed back in the queue."""
+    W = models.WaiverClaim
+    db.execute(
+        update(W)
+        .where(W.id.in_(claim_ids), W.status == "processing")
+        .values(status="pending", run_token=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def run_waivers(db: Session, league_id: int) -> WaiverRunReport:
+    """
+    Settle every pending claim of the league.
+
+    Claims are processed highest bid first, then by waiver order, then by
+    claim id, so the same queue always settles the same way. A claim loses
+    when its symbol is already rostered (or was won by an earlier claim this
+    run) or the roster is full without a drop; it is invalid when its drop
+    is not on the team's roster (or was already dropped this run). Symbols
+    dropped during the run stay unavailable until the next one.
+
+    Rosters and active counts for the whole league are read once and the
+    claimed symbols are bucketed with a single registry lookup; winners are
+    placed primary -> FLEX -> bench against the in-memory tally instead of
+    re-counting per claim. Everything is committed once at the end.
+
+    The queue is claimed up front (see `_claim_pending`), so overlapping runs
+    never settle the same claim twice; if settling fails the claims go back
+    to pending.
+    """
+    start = time.perf_counter()
+    pending = _claim_pending(db, league_id)
+    claim_ids = [c.id for c in pending]
+    try:
+        return _settle(db, league_id, pending, start)
+    except Exception:
+        db.rollback()
+        _release(db, claim_ids)
+        raise
+
+
+def _settle(db: Session, league_id: int, pending: list[models.WaiverClaim], start: float) -> WaiverRunReport:
+    league = db.get(models.League, league_id)
+    roster_size = league.roster_slots if league is not None else 14
+
+    order = waiver_order(db, league_id)
+    position = {tid: i for i, tid in enumerate(order)}
+
+    held: dict[int, dict[str, models.RosterSlot]] = {tid: {} for tid in order}
+    slots = (
+        db.query(models.RosterSlot)
+        .join(models.Team, models.Team.id == models.RosterSlot.team_id)
+        .filter(models.Team.league_id == league_id)
+    )
+    for slot in slots:
+        held[slot.team_id][slot.symbol] = slot
+    taken = {sym for roster in held.values() for sym in roster}
+    tallies = {tid: tally_active(roster.values()) for tid, roster in held.items()}
+    buckets = resolve_buckets_db_first(db, [c.symbol for c in pending if not c.bucket_hint])
+
+    pending.sort(key=lambda c: (-(c.bid_amount or 0.0), position.get(c.team_id, len(order)), c.id))
+    won_by: dict[str, int] = {}
+    added: dict[int, list[str]] = {}
+    dropped: dict[int, list[str]] = {}
+    placed: list[tuple[models.WaiverClaim, models.RosterSlot]] = []
+    results: list[ClaimOutcome] = []
+    now = datetime.utcnow()
+
+    for claim in pending:
+        roster = held.get(claim.team_id)
+        bucket = claim.bucket_hint or buckets.get(claim.symbol)
+        slot, activated = None, False
+        if roster is None:
+            status, reason = "invalid", "team_not_in_league"
+        elif claim.symbol in won_by:
+            status, reason = "lost", "claimed_by_higher_priority"
+        elif claim.symbol in taken:
+            status, reason = "lost", "already_rostered"
+        elif claim.drop_symbol and claim.drop_symbol not in roster:
+            status, reason = "invalid", "drop_not_on_roster"
+        elif not claim.drop_symbol and len(roster) >= roster_size:
+            status, reason = "lost", "roster_full"
+        else:
+            status, reason = "won", None
+            counts, total = tallies[claim.team_id]
+            if claim.drop_symbol:
+                gone = roster.pop(claim.drop_symbol)
+                if gone.is_active:
+                    b = (gone.bucket or "").upper()
+                    if b in PRIMARY:
+                        counts[b] -= 1
+                    if b in PRIMARY or b == "FLEX":
+                        total -= 1
+                db.delete(gone)
+                dropped.setdefault(claim.team_id, []).append(claim.drop_symbol)
+            activated, total = place_in_tally(counts, total, bucket) if bucket else (False, total)
+            tallies[claim.team_id] = (counts, total)
+            slot = models.RosterSlot(team_id=claim.team_id, symbol=claim.symbol, bucket=bucket, is_active=activated)
+            db.add(slot)
+            roster[claim.symbol] = slot
+            taken.add(claim.symbol)
+            won_by[claim.symbol] = claim.id
+            added.setdefault(claim.team_id, []).append(claim.symbol)
+            placed.append((claim, slot))
+
+        claim.status, claim.reason, claim.processed_at = status, reason, now
+        results.append(
+            {
+                "claim_id": claim.id,
+                "team_id": claim.team_id,
+                "symbol": claim.symbol,
+                "drop_symbol": claim.drop_symbol,
+                "bid_amount": claim.bid_amount or 0.0,
+                "status": status,
+                "reason": reason,
+                "slot_id": None,
+                "bucket": bucket if slot is not None else None,
+                "activated": activated,
+            }
+        )
+
+    db.flush()  # assigns the new slot ids
+    slot_ids = {}
+    for claim, slot in placed:
+        claim.slot_id = slot_ids[claim.id] = slot.id
+    for out in results:
+        out["slot_id"] = slot_ids.get(out["claim_id"])
+
+    if pending:
+        league_version.touch(db, league_id)
+        for tid in set(added) | set(dropped):
+            rostered.record(db, league_id, tid, added=added.get(tid, ()), dropped=dropped.get(tid, ()))
+    db.commit()
+
+    won = len(placed)
+    invalid = sum(1 for r in results if r["status"] == "invalid")
+    return {
+        "league_id": league_id,
+        "claims": len(results),
+        "won": won,
+        "lost": len(results) - won - invalid,
+        "invalid": invalid,
+        "waiver_order": order,
+        "wall_ms": round((time.perf_counter() - start) * 1000.0, 3),
+        "results": results,
+    }
@@ -0,0 +1,147 @@
+# fantasy_stocks/logic/week_close.py
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypedDict
+
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.orm import Session
+
+from .. import models
+from .scoring import score_week
+
+logger = logging.getLogger("fantasy_stocks")
+
+SessionFactory = Callable[[], Session]
+
+
+class LeagueCloseResult(TypedDict):
+    league_id: int
+    status: str  # "ok" | "not_found" | "failed"
+    matches_scored: int
+    attempts: int
+    elapsed_ms: float
+    error: str | None
+
+
+class WeekCloseReport(TypedDict):
+    week: str
+    workers: int
+    leagues: int
+    ok: int
+    not_found: int  # requested leagues that do not exist; skipped, not errors
+    failed: int  # leagues whose scoring raised
+    matches_scored: int
+    elapsed_s: float
+    leagues_per_second: float
+    results: list[LeagueCloseResult]
+
+
+def _is_transient(exc: BaseException) -> bool:
+    # "database is locked", dropped connections, ... are worth another try; bugs are not
+    return isinstance(exc, OperationalError) or (isinstance(exc, DBAPIError) and exc.connection_invalidated)
+
+
+def leagues_with_matches(db: Session, week: str) -> list[int]:
+    rows = db.query(models.Match.league_id).filter(models.Match.week == week).distinct().all()
+    return sorted(lid for (lid,) in rows)
+
+
+def _close_one(db: Session, league_id: int, week: str, max_attempts: int, retry_backoff: float) -> LeagueCloseResult:
+    start = time.perf_counter()
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            league = db.get(models.League, league_id)
+            if league is None:
+                status, scored, error = "not_found", 0, None
+            else:
+                # Same idempotent path as /standings/{id}/close_week: only unscored matches are touched.
+                result = score_week(db, league, week, mode=models.ScoringMode.PROJECTIONS, only_unscored=True)
+                db.commit()
+                status, scored, error = "ok", len(result["scored"]), None
+            break
+        except Exception as exc:
+            db.rollback()
+            if attempts < max_attempts and _is_transient(exc):
+                time.sleep(retry_backoff * 2 ** (attempts - 1))
+                continue
+            logger.exception("close_week failed for league %s week %s", league_id, week)
+            status, scored, error = "failed", 0, f"{type(exc).__name__}: {exc}"
+            break
+    return {
+        "league_id": league_id,
+        "status": status,
+        "matches_scored": scored,
+        "attempts": attempts,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000.0, 2),
+        "error": error,
+    }
+
+
+def close_week_for_leagues(
+    session_factory: SessionFactory,
+    week: str,
+    league_ids: Iterable[int] | None = None,
+    *,
+    workers: int = 4,
+    max_attempts: int = 3,
+    retry_backoff: float = 0.05,
+) -> WeekCloseReport:
+    """
+    Close `week` for many leagues on a bounded thread pool.
+
+    - league_ids: leagues to close (None = every league with matches in the week)
+    - each worker thread opens one session from `session_factory` and reuses it
+      for all of its leagues; each league is its own transaction
+    - transient DB errors are retried up to `max_attempts` with exponential backoff;
+      other failures are recorded per league and do not stop the run
+    """
+    if league_ids is None:
+        with session_factory() as db:
+            targets = leagues_with_matches(db, week)
+    else:
+        targets = list(dict.fromkeys(league_ids))  # dedupe, keep order
+    workers = max(1, min(workers, len(targets) or 1))
+
+    local = threading.local()
+    sessions: list[Session] = []
+    sessions_lock = threading.Lock()
+
+    def _worker_session() -> Session:
+        db = getattr(local, "db", None)
+        if db is None:
+            db = local.db = session_factory()
+            with sessions_lock:
+                sessions.append(db)
+        return db
+
+    def _run(league_id: int) -> LeagueCloseResult:
+        return _close_one(_worker_session(), league_id, week, max_attempts, retry_backoff)
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="close-week") as pool:
+            results = list(pool.map(_run, targets))
+    finally:
+        for db in sessions:
+            db.close()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "week": week,
+        "workers": workers,
+        "leagues": len(results),
+        "ok": sum(r["status"] == "ok" for r in results),
+        "not_found": sum(r["status"] == "not_found" for r in results),
+        "failed": sum(r["status"] == "failed" for r in results),
+        "matches_scored": sum(r["matches_scored"] for r in results),
+        "elapsed_s": round(elapsed, 4),
+        "leagues_per_second": round(len(results) / elapsed, 2) if elapsed > 0 else 0.0,
+        "results": results,
+    }
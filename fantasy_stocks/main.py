@@ -14,6 +14,8 @@ from fantasy_stocks import models  # noqa: F401  (import registers models with B
 # --- DB bootstrapping: create tables at startup ---
 from fantasy_stocks.db import Base, engine
 
+from .logic.player_query import install_indexes
+
 # Routers
 from .routers import (
     analytics,
@@ -21,9 +23,12 @@ from .routers import (
     boxscore,
     draft,
     free_agency,
+    jobs,
     league,
     lineup,
+    live,
     players,
+    playoff_odds,
     playoffs,
     prices,
     records,
@@ -34,6 +39,8 @@ from .routers import (
     standings_snapshot,
     teams,
 )
+from .services.jobs import job_queue
+from .services.search_index import search_index
 
 # ---------- App ----------
 app = FastAPI(title="Fantasy Stocks MVP", version="0.1.0")
@@ -43,6 +50,9 @@ app = FastAPI(title="Fantasy Stocks MVP", version="0.1.0")
 @app.on_event("startup")
 def _create_tables() -> None:
     Base.metadata.create_all(bind=engine)
+    search_index.install(engine)
+    install_indexes(engine)
+    job_queue.fail_interrupted(engine)
 
 
 # ---------- Minimal structured logging ----------
@@ -103,7 +113,10 @@ _include_router_flex(app, standings_snapshot)  # /standings-snapshot
 _include_router_flex(app, boxscore)  # /boxscore
 _include_router_flex(app, prices)  # /prices
 _include_router_flex(app, playoffs)  # /playoffs
+_include_router_flex(app, playoff_odds)  # /standings/{id}/playoff_odds
 _include_router_flex(app, season)  # /season
 _include_router_flex(app, awards)  # /awards
 _include_router_flex(app, records)  # /records
 _include_router_flex(app, analytics)  # /analytics
+_include_router_flex(app, live)  # /live
+_include_router_flex(app, jobs)  # /jobs
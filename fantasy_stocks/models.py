@@ -9,8 +9,10 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
+    Text,
     UniqueConstraint,
 )
 from sqlalchemy import (
@@ -101,6 +103,35 @@ class DraftPick(Base):
     team = relationship("Team", back_populates="picks")
 
 
+class WaiverClaim(Base):
+    """
+    A free-agent claim queued for the league's next waiver run. The run
+    settles every pending claim at once and stamps status/reason/slot_id.
+    """
+
+    __tablename__ = "waiver_claims"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    league_id: Mapped[int] = mapped_column(Integer, ForeignKey("leagues.id", ondelete="CASCADE"), nullable=False)
+    team_id: Mapped[int] = mapped_column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), index=True)
+
+    symbol: Mapped[str] = mapped_column(String(20), nullable=False)
+    bucket_hint: Mapped[str | None] = mapped_column(String(32), nullable=True)  # used when no ticker was given
+    drop_symbol: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    bid_amount: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+    # pending -> processing (taken by a run) -> won|lost|invalid
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="pending")
+    reason: Mapped[str | None] = mapped_column(String(64), nullable=True)  # why a claim lost or was invalid
+    run_token: Mapped[str | None] = mapped_column(String(64), nullable=True)  # the run that took the claim
+    slot_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    processed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (Index("ix_waiver_claims_league_status", "league_id", "status"),)
+
+
 class Match(Base):
     __tablename__ = "matches"
 
@@ -121,6 +152,72 @@ class Match(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
 
+class TeamStanding(Base):
+    """
+    Running season record per team, maintained in the same transaction that
+    scores (or re-scores) a match so standings reads never rescan matches.
+    """
+
+    __tablename__ = "team_standings"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    league_id: Mapped[int] = mapped_column(Integer, ForeignKey("leagues.id", ondelete="CASCADE"), index=True)
+    team_id: Mapped[int] = mapped_column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
+
+    wins: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    losses: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    ties: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    games_played: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    points_for: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    points_against: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (UniqueConstraint("team_id", name="uq_team_standing_team"),)
+
+
+class TeamElo(Base):
+    """
+    Current Elo rating per team (default K), moved forward in the same
+    transaction that scores new matches; `last_match_id` is the newest match
+    folded in, so out-of-order scoring can be detected and replayed.
+    """
+
+    __tablename__ = "team_elo"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    league_id: Mapped[int] = mapped_column(Integer, ForeignKey("leagues.id", ondelete="CASCADE"), index=True)
+    team_id: Mapped[int] = mapped_column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
+
+    rating: Mapped[float] = mapped_column(Float, nullable=False, default=1500.0)
+    games: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_match_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (UniqueConstraint("team_id", name="uq_team_elo_team"),)
+
+
+class EloHistory(Base):
+    """
+    One row per team per scored match: the rating before and after that game.
+    Rewritten wholesale when a league's Elo is rebuilt.
+    """
+
+    __tablename__ = "elo_history"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    league_id: Mapped[int] = mapped_column(Integer, ForeignKey("leagues.id", ondelete="CASCADE"), index=True)
+    team_id: Mapped[int] = mapped_column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), index=True)
+    match_id: Mapped[int] = mapped_column(Integer, ForeignKey("matches.id", ondelete="CASCADE"), nullable=False)
+    week: Mapped[str] = mapped_column(String(10), nullable=False)
+
+    rating_before: Mapped[float] = mapped_column(Float, nullable=False)
+    rating_after: Mapped[float] = mapped_column(Float, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 class TeamScore(Base):
     """
     Persistent per-week scoring snapshot for a team in a league.
@@ -159,6 +256,13 @@ class Security(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
 
+# Keyset paging of catalog listings: one (sort key, symbol) index per sort, in its default direction
+# (scanned backwards for the flipped order, whose symbol tie-break flips too).
+Index("ix_securities_market_cap_symbol", Security.market_cap.desc(), Security.symbol)
+Index("ix_securities_adp_symbol", Security.adp, Security.symbol)
+Index("ix_securities_proj_points_symbol", Security.proj_points.desc(), Security.symbol)
+
+
 # --- NEW: Daily Prices for LIVE scoring ---
 class Price(Base):
     __tablename__ = "prices"
@@ -172,3 +276,71 @@ class Price(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
     __table_args__ = (UniqueConstraint("symbol", "date", name="uq_price_symbol_date"),)
+
+
+# --- Weekly returns, materialized from prices at ingest time ---
+class WeeklyReturn(Base):
+    """
+    One cell per (symbol, iso_week): first open / last close inside the week and
+    the resulting % return. Maintained by the price ingest endpoints so LIVE
+    scoring is a point lookup instead of a Price range scan.
+    """
+
+    __tablename__ = "weekly_returns"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    symbol: Mapped[str] = mapped_column(String(20), nullable=False)
+    iso_week: Mapped[str] = mapped_column(String(10), nullable=False)  # "2025-W39"
+
+    first_date: Mapped[datetime] = mapped_column(Date, nullable=False)
+    first_open: Mapped[float | None] = mapped_column(Float, nullable=True)
+    last_date: Mapped[datetime] = mapped_column(Date, nullable=False)
+    last_close: Mapped[float | None] = mapped_column(Float, nullable=True)
+    return_pct: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (UniqueConstraint("iso_week", "symbol", name="uq_weekly_return_week_symbol"),)
+
+
+# --- Data versions shared by all workers (league data, rosters, player catalog) ---
+class DataVersion(Base):
+    """
+    Monotonic counter per key ("league:<id>", "roster:<id>", "catalog"),
+    advanced inside the transaction that changes the data. Workers compare
+    it against what their in-process caches were built from.
+    """
+
+    __tablename__ = "data_versions"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+# --- Idempotency responses shared by all workers (DB idempotency backend) ---
+class IdempotencyRecord(Base):
+    __tablename__ = "idempotency_keys"
+
+    key_hash: Mapped[str] = mapped_column(String(64), primary_key=True)  # sha256 of the full cache key
+    response: Mapped[str] = mapped_column(Text, nullable=False)  # JSON-serialized endpoint result
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True, nullable=False)
+
+
+# --- Background jobs for long-running commissioner operations ---
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)  # uuid4 hex
+    kind: Mapped[str] = mapped_column(String(64), nullable=False)  # e.g. "close_season"
+    league_id: Mapped[int | None] = mapped_column(Integer, index=True, nullable=True)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="queued")  # queued|running|succeeded|failed
+    progress: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)  # 0..1
+    message: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    idempotency_key: Mapped[str | None] = mapped_column(String(64), unique=True, nullable=True)  # sha256
+    result: Mapped[str | None] = mapped_column(Text, nullable=True)  # JSON-serialized job result
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
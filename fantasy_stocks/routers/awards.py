@@ -8,22 +8,18 @@ from sqlalchemy.orm import Session
 
 from .. import models
 from ..db import get_db
+from ..utils.team_names import TeamNames, serialize_match
 
 router = APIRouter(prefix="/awards", tags=["awards"])
 
 
-# ---------- Helpers (null-safe floats, names, latest period) ----------
+# ---------- Helpers (null-safe floats, latest period) ----------
 
 
 def _to_float(x: float | None) -> float:
     return 0.0 if x is None else float(x)
 
 
-def _team_name(db: Session, team_id: int) -> str:
-    t = db.get(models.Team, team_id)
-    return t.name if t else f"Team {team_id}"
-
-
 def _latest_scored_period(db: Session, league_id: int) -> str | None:
     row = (
         db.query(models.TeamScore.period)
@@ -34,20 +30,6 @@ def _latest_scored_period(db: Session, league_id: int) -> str | None:
     return row[0] if row else None
 
 
-def _serialize_match(db: Session, m: models.Match) -> dict[str, Any]:
-    return {
-        "id": m.id,
-        "week": m.week,
-        "home_team_id": m.home_team_id,
-        "home_team_name": _team_name(db, m.home_team_id),
-        "home_points": None if m.home_points is None else float(m.home_points),
-        "away_team_id": m.away_team_id,
-        "away_team_name": _team_name(db, m.away_team_id),
-        "away_points": None if m.away_points is None else float(m.away_points),
-        "winner_team_id": m.winner_team_id,
-    }
-
-
 def _matches_for_week(db: Session, league_id: int, period: str) -> list[models.Match]:
     return (
         db.query(models.Match)
@@ -109,6 +91,8 @@ def weekly_awards(league_id: int, period: str | None = None, db: Session = Depen
                 "highest_scoring_game": None,
             }
 
+    names = TeamNames(db, league_id)
+
     # Top scorer (from TeamScore for that week)
     rows = (
         db.query(models.TeamScore)
@@ -120,7 +104,7 @@ def weekly_awards(league_id: int, period: str | None = None, db: Session = Depen
         best = max(rows, key=lambda r: _to_float(r.points))
         top = {
             "team_id": best.team_id,
-            "team_name": _team_name(db, best.team_id),
+            "team_name": names(best.team_id),
             "points": _to_float(best.points),
         }
 
@@ -138,8 +122,8 @@ def weekly_awards(league_id: int, period: str | None = None, db: Session = Depen
     if wins:
         nm, _ = min(wins, key=lambda t: t[1])
         bm, _ = max(wins, key=lambda t: t[1])
-        narrow = _serialize_match(db, nm)
-        blow = _serialize_match(db, bm)
+        narrow = serialize_match(names, nm)
+        blow = serialize_match(names, bm)
 
     # Highest-scoring game by total points
     high = None
@@ -149,7 +133,7 @@ def weekly_awards(league_id: int, period: str | None = None, db: Session = Depen
             return _to_float(m_.home_points) + _to_float(m_.away_points)
 
         hm = max(matches, key=total)
-        high = _serialize_match(db, hm)
+        high = serialize_match(names, hm)
 
     return {
         "ok": True,
@@ -165,15 +149,15 @@ def weekly_awards(league_id: int, period: str | None = None, db: Session = Depen
 # ---------- Season Awards ----------
 
 
-def _aggregate_season_stats(db: Session, league_id: int) -> dict[int, dict[str, float]]:
+def _aggregate_season_stats(matches: list[models.Match], names: TeamNames) -> dict[int, dict[str, float]]:
     """
     Aggregate PF/PA, wins/losses/ties, games_played per team from scored matches.
     Returns { team_id: {pf, pa, w, l, t, gp, win_pct, point_diff} }
     """
     stats: dict[int, dict[str, float]] = {}
     # Initialize for all teams (so teams with 0 games still appear, with 0s)
-    for t in db.query(models.Team).filter(models.Team.league_id == league_id).all():
-        stats[t.id] = {
+    for tid in names.team_ids:
+        stats[tid] = {
             "pf": 0.0,
             "pa": 0.0,
             "w": 0.0,
@@ -184,7 +168,7 @@ def _aggregate_season_stats(db: Session, league_id: int) -> dict[int, dict[str,
             "point_diff": 0.0,
         }
 
-    for m in _all_scored_matches(db, league_id):
+    for m in matches:
         hp = _to_float(m.home_points)
         ap = _to_float(m.away_points)
         a = stats[m.home_team_id]
@@ -214,7 +198,7 @@ def _aggregate_season_stats(db: Session, league_id: int) -> dict[int, dict[str,
     return stats
 
 
-def _team_week_high(db: Session, league_id: int) -> dict[str, Any] | None:
+def _team_week_high(db: Session, league_id: int, names: TeamNames) -> dict[str, Any] | None:
     """Best single-week TeamScore."""
     rows = _all_team_scores(db, league_id)
     if not rows:
@@ -222,14 +206,13 @@ def _team_week_high(db: Session, league_id: int) -> dict[str, Any] | None:
     best = max(rows, key=lambda r: _to_float(r.points))
     return {
         "team_id": best.team_id,
-        "team_name": _team_name(db, best.team_id),
+        "team_name": names(best.team_id),
         "period": best.period,
         "points": _to_float(best.points),
     }
 
 
-def _game_total_high(db: Session, league_id: int) -> dict[str, Any] | None:
-    matches = _all_scored_matches(db, league_id)
+def _game_total_high(matches: list[models.Match], names: TeamNames) -> dict[str, Any] | None:
     if not matches:
         return None
 
@@ -237,13 +220,12 @@ def _game_total_high(db: Session, league_id: int) -> dict[str, Any] | None:
         return _to_float(m.home_points) + _to_float(m.away_points)
 
     m = max(matches, key=total)
-    out = _serialize_match(db, m)
+    out = serialize_match(names, m)
     out["total_points"] = total(m)
     return out
 
 
-def _blowout_high(db: Session, league_id: int) -> dict[str, Any] | None:
-    matches = _all_scored_matches(db, league_id)
+def _blowout_high(matches: list[models.Match], names: TeamNames) -> dict[str, Any] | None:
     if not matches:
         return None
 
@@ -251,7 +233,7 @@ def _blowout_high(db: Session, league_id: int) -> dict[str, Any] | None:
         return abs(_to_float(m.home_points) - _to_float(m.away_points))
 
     m = max(matches, key=margin)
-    out = _serialize_match(db, m)
+    out = serialize_match(names, m)
     out["margin"] = margin(m)
     return out
 
@@ -276,7 +258,9 @@ def season_awards(league_id: int, db: Session = Depends(get_db)) -> dict[str, An
     if not league:
         raise HTTPException(status_code=404, detail="League not found")
 
-    stats = _aggregate_season_stats(db, league_id)
+    names = TeamNames(db, league_id)
+    matches = _all_scored_matches(db, league_id)
+    stats = _aggregate_season_stats(matches, names)
     if not stats:
         return {
             "ok": True,
@@ -293,7 +277,7 @@ def season_awards(league_id: int, db: Session = Depends(get_db)) -> dict[str, An
     winningest_tid = max(stats.keys(), key=lambda tid: (stats[tid]["win_pct"], stats[tid]["point_diff"]))
     winningest = {
         "team_id": winningest_tid,
-        "team_name": _team_name(db, winningest_tid),
+        "team_name": names(winningest_tid),
         "win_pct": stats[winningest_tid]["win_pct"],
         "point_diff": stats[winningest_tid]["point_diff"],
     }
@@ -302,7 +286,7 @@ def season_awards(league_id: int, db: Session = Depends(get_db)) -> dict[str, An
     mvp_tid = max(stats.keys(), key=lambda tid: stats[tid]["pf"])
     mvp = {
         "team_id": mvp_tid,
-        "team_name": _team_name(db, mvp_tid),
+        "team_name": names(mvp_tid),
         "points_for": stats[mvp_tid]["pf"],
     }
 
@@ -313,13 +297,13 @@ def season_awards(league_id: int, db: Session = Depends(get_db)) -> dict[str, An
         bd_tid = min(eligible, key=lambda tid: stats[tid]["pa"])
         bestd = {
             "team_id": bd_tid,
-            "team_name": _team_name(db, bd_tid),
+            "team_name": names(bd_tid),
             "points_against": stats[bd_tid]["pa"],
         }
 
-    highest_week = _team_week_high(db, league_id)
-    high_game = _game_total_high(db, league_id)
-    blowout = _blowout_high(db, league_id)
+    highest_week = _team_week_high(db, league_id, names)
+    high_game = _game_total_high(matches, names)
+    blowout = _blowout_high(matches, names)
 
     return {
         "ok": True,
@@ -10,6 +10,8 @@ from .. import models
 from ..db import get_db
 from ..logic.auto_placement import auto_place_new_slot
 from ..logic.ticker_registry import resolve_bucket_db_first
+from ..services import league_version
+from ..services.rostered import rostered
 
 router = APIRouter(prefix="/draft", tags=["draft"])
 
@@ -79,6 +81,8 @@ def make_pick(body: PickBody, db: Session = Depends(get_db)):
         is_active=False,
     )
     db.add(slot)
+    league_version.touch(db, league_id)
+    rostered.record(db, league_id, team.id, added=[symbol])
 
     try:
         db.commit()
@@ -141,6 +145,9 @@ def set_slot_bucket(slot_id: int, body: SetBucketBody, db: Session = Depends(get
         changed = True
 
     if changed:
+        team = db.get(models.Team, slot.team_id)
+        if team is not None:
+            league_version.touch(db, team.league_id)
         db.commit()
         db.refresh(slot)
 
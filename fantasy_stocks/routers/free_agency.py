@@ -3,15 +3,19 @@ from __future__ import annotations
 
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
-from pydantic import BaseModel, Field
-from sqlalchemy import or_, select  # <- use select
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
+from pydantic import BaseModel, ConfigDict, Field
 from sqlalchemy.orm import Session
 
 from .. import models
 from ..db import get_db
 from ..logic.auto_placement import auto_place_new_slot
+from ..logic.player_query import page_players, resolve_order
 from ..logic.ticker_registry import resolve_bucket_db_first
+from ..logic.waivers import run_waivers
+from ..services import league_version
+from ..services.rostered import rostered
+from ..services.search_index import search_index
 
 router = APIRouter(prefix="/free-agency", tags=["free_agency"])
 
@@ -33,6 +37,25 @@ class ClaimRequest(BaseModel):
     bid_amount: float | None = None
 
 
+class WaiverClaimRequest(ClaimRequest):
+    drop_symbol: str | None = None  # roster symbol released if the claim wins
+
+
+class WaiverClaimOut(BaseModel):
+    id: int
+    league_id: int
+    team_id: int
+    symbol: str
+    bucket_hint: str | None = None
+    drop_symbol: str | None = None
+    bid_amount: float
+    status: str
+    reason: str | None = None
+    slot_id: int | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class DropRequest(BaseModel):
     league_id: int
     team_id: int
@@ -50,51 +73,38 @@ class AddRequest(BaseModel):
 
 @router.get("/{league_id}/players", response_model=list[FreeAgentPlayer])
 def list_free_agents(
+    response: Response,
     league_id: int = Path(..., ge=1),
     q: str | None = Query(None, description="Search by name/symbol"),
     bucket: str | None = Query(None, description="Filter by primary bucket (e.g., ETF)"),
     sort: str | None = Query(None, description="symbol|market_cap|adp|proj_points"),
     order: str | None = Query(None, description="asc|desc"),
     limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
     db: Session = Depends(get_db),
 ):
-    rostered_symbols_sq = (
-        select(models.RosterSlot.symbol)
-        .join(models.Team, models.Team.id == models.RosterSlot.team_id)
-        .where(models.Team.league_id == league_id)
-        .scalar_subquery()
-    )
-    query = db.query(models.Security).filter(~models.Security.symbol.in_(rostered_symbols_sq))
-
-    if q:
-        qq = f"%{q.strip()}%"
-        query = query.filter(or_(models.Security.symbol.ilike(qq), models.Security.name.ilike(qq)))
+    """
+    Unrostered securities for a league, with the same filters, sorting and
+    keyset paging (X-Next-Cursor header / `cursor`) as /players/search.
+    """
+    query = db.query(models.Security)
+    taken = rostered.symbols(db, league_id)
+    if taken:
+        query = query.filter(models.Security.symbol.not_in(taken))
+
+    rank = None
+    if q and q.strip():
+        where, rank = search_index.match(db, q)
+        query = query.filter(where)
     if bucket:
         query = query.filter(models.Security.primary_bucket == bucket.strip().upper())
 
-    sort_map = {
-        "symbol": models.Security.symbol.asc(),
-        "market_cap": models.Security.market_cap.desc(),
-        "adp": models.Security.adp.asc(),
-        "proj_points": models.Security.proj_points.desc(),
-    }
-    if sort:
-        key = sort.strip().lower()
-        clause = sort_map.get(key)
-        if clause is not None:
-            if order and order.strip().lower() == "asc":
-                if key in ("market_cap", "proj_points"):
-                    clause = clause.reverse()
-            elif order and order.strip().lower() == "desc":
-                if key in ("symbol", "adp"):
-                    clause = clause.reverse()
-            query = query.order_by(clause, models.Security.symbol.asc())
-        else:
-            query = query.order_by(models.Security.symbol.asc())
-    else:
-        query = query.order_by(models.Security.symbol.asc())
-
-    rows = query.limit(limit).all()
+    try:
+        rows, next_cursor = page_players(query, resolve_order(sort, order, rank), cursor, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
 
     out: list[FreeAgentPlayer] = []
     pid = 1
@@ -140,6 +150,8 @@ def claim_player(
 
     slot = models.RosterSlot(team_id=team.id, symbol=symbol, bucket=resolved or None, is_active=False)
     db.add(slot)
+    league_version.touch(db, league_id)
+    rostered.record(db, league_id, team.id, added=[symbol])
     db.commit()
     db.refresh(slot)
 
@@ -180,6 +192,8 @@ def add_player_immediate(
 
     slot = models.RosterSlot(team_id=team.id, symbol=symbol, bucket=resolved or None, is_active=False)
     db.add(slot)
+    league_version.touch(db, league_id)
+    rostered.record(db, league_id, team.id, added=[symbol])
     db.commit()
     db.refresh(slot)
 
@@ -223,6 +237,8 @@ def drop_player(
         raise HTTPException(status_code=404, detail="Roster slot not found for that symbol")
 
     db.delete(slot)
+    league_version.touch(db, league_id)
+    rostered.record(db, league_id, team.id, dropped=[slot.symbol])
     db.commit()
 
     return {
@@ -230,3 +246,63 @@ def drop_player(
         "message": "Player dropped to free agency.",
         "symbol": body.symbol.strip().upper(),
     }
+
+
+@router.post("/{league_id}/waivers", response_model=WaiverClaimOut)
+def queue_waiver_claim(
+    league_id: int,
+    body: WaiverClaimRequest,
+    db: Session = Depends(get_db),
+):
+    """Queue a claim for the next waiver run (POST /{league_id}/waivers/run) instead of adding immediately."""
+    if body.league_id != league_id:
+        raise HTTPException(status_code=400, detail="league_id mismatch in path vs body")
+
+    team = db.get(models.Team, body.team_id)
+    if not team or team.league_id != league_id:
+        raise HTTPException(status_code=404, detail="Team not found in this league")
+    if body.bid_amount is not None and body.bid_amount < 0:
+        raise HTTPException(status_code=400, detail="bid_amount must be >= 0")
+
+    if body.ticker:
+        symbol, hint = body.ticker.strip().upper(), None
+    else:
+        symbol = f"PID{body.player_id}"
+        hint = (body.primary_bucket or "").strip().upper() or None
+
+    claim = models.WaiverClaim(
+        league_id=league_id,
+        team_id=team.id,
+        symbol=symbol,
+        bucket_hint=hint,
+        drop_symbol=(body.drop_symbol or "").strip().upper() or None,
+        bid_amount=body.bid_amount or 0.0,
+    )
+    db.add(claim)
+    db.commit()
+    db.refresh(claim)
+    return claim
+
+
+@router.get("/{league_id}/waivers", response_model=list[WaiverClaimOut])
+def list_waiver_claims(
+    league_id: int = Path(..., ge=1),
+    status: str | None = Query("pending", description="pending|processing|won|lost|invalid; empty for all"),
+    db: Session = Depends(get_db),
+):
+    query = db.query(models.WaiverClaim).filter(models.WaiverClaim.league_id == league_id)
+    if status:
+        query = query.filter(models.WaiverClaim.status == status.strip().lower())
+    return query.order_by(models.WaiverClaim.id).all()
+
+
+@router.post("/{league_id}/waivers/run")
+def run_waiver_claims(league_id: int = Path(..., ge=1), db: Session = Depends(get_db)) -> dict[str, Any]:
+    """
+    Settle all pending claims of the league in one transaction: highest bid,
+    then waiver order (worst record first), then claim id. Reports each
+    claim's outcome and the run's wall time.
+    """
+    if db.get(models.League, league_id) is None:
+        raise HTTPException(status_code=404, detail="League not found")
+    return run_waivers(db, league_id)
@@ -0,0 +1,19 @@
+# fantasy_stocks/routers/jobs.py
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from ..db import get_db
+from ..services.jobs import job_out, job_queue
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}")
+def get_job(job_id: str, db: Session = Depends(get_db)):
+    """Status, progress and (once finished) result or error of a background job."""
+    job = job_queue.get(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_out(job)
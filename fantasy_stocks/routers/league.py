@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 
 from .. import models, schemas
 from ..db import get_db
+from ..services import league_version
 
 route = APIRouter(prefix="/leagues", tags=["leagues"])
 
@@ -121,6 +122,7 @@ def join_league(league_id: int, body: schemas.JoinLeague, db: Session = Depends(
         owner=(body.owner.strip() if body.owner else None),
     )
     db.add(team)
+    league_version.touch(db, league.id)
     db.commit()
     db.refresh(team)
     return schemas.TeamOut.model_validate(team)
@@ -159,6 +161,7 @@ def update_settings(league_id: int, body: LeagueSettingsUpdate, db: Session = De
         league.bucket_requirements = rules.starters
         changed = True
     if changed:
+        league_version.touch(db, league.id)
         db.commit()
         db.refresh(league)
 
@@ -180,6 +183,7 @@ def update_mode(league_id: int, body: ModeUpdate, db: Session = Depends(get_db))
     # Convert schema enum to models enum explicitly to keep typing tools happy
     league.scoring_mode = models.ScoringMode(body.scoring_mode.value)
     db.add(league)
+    league_version.touch(db, league.id)
     db.commit()
     db.refresh(league)
     return schemas.LeagueOut.model_validate(league)
@@ -16,6 +16,7 @@ from ..logic.lineup_rules import (
     PRIMARY,
     validate_starter_buckets,
 )
+from ..services import league_version
 
 router = APIRouter(prefix="/lineup", tags=["lineup"])
 
@@ -162,6 +163,7 @@ def set_lineup(body: SetLineupBody, db: Session = Depends(get_db)):
             changed = True
 
     if changed:
+        league_version.touch(db, team.league_id)
         db.commit()
 
     return {
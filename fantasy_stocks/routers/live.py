@@ -0,0 +1,121 @@
+# fantasy_stocks/routers/live.py
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from .. import models
+from ..db import get_db
+from ..services.live_scores import live_scores
+from ..services.periods import iso_week_bounds
+from ..services.scoreboard import ScoreboardEvent, scoreboard_hub
+from ..services.time_rules import is_lineup_locked
+from ..utils.team_names import TeamNames
+
+router = APIRouter(prefix="/live", tags=["live"])
+
+SCOREBOARD_KEEPALIVE_SECONDS = float(os.getenv("SCOREBOARD_KEEPALIVE_SECONDS", "15"))
+
+
+def _sse(event: ScoreboardEvent) -> str:
+    data = json.dumps({"version": event["version"], "matchups": event["matchups"]}, separators=(",", ":"))
+    return f"event: {event['event']}\nid: {event['version']}\ndata: {data}\n\n"
+
+
+@router.get("/{league_id}/{week}/stream")
+async def stream_scoreboard(
+    league_id: int = Path(..., ge=1),
+    week: str = Path(..., description="ISO week label, e.g., 2025-W39"),
+    max_events: int | None = Query(None, ge=1, description="Close the stream after this many events"),
+    db: Session = Depends(get_db),
+):
+    """
+    Server-Sent Events feed of matchup scores for a league/week.
+
+    The first event is a `snapshot` of every matchup; each later `delta` carries
+    only the matchups whose score changed. Updates are computed once per league
+    change (score change or price tick) and shared by every subscriber. A client
+    that falls more than SCOREBOARD_QUEUE_SIZE events behind has its backlog
+    replaced by a single fresh snapshot.
+    """
+    try:
+        iso_week_bounds(week)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    league = await run_in_threadpool(db.get, models.League, league_id)
+    if league is None:
+        raise HTTPException(status_code=404, detail="League not found")
+    engine = db.get_bind()
+
+    async def _events():
+        sub = await scoreboard_hub.subscribe(engine, league_id, week)
+        try:
+            sent = 0
+            while max_events is None or sent < max_events:
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), SCOREBOARD_KEEPALIVE_SECONDS)
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse(event)
+                sent += 1
+        finally:
+            scoreboard_hub.unsubscribe(sub)
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{league_id}/{week}")
+def live_team_totals(
+    league_id: int = Path(..., ge=1),
+    week: str = Path(..., description="ISO week label, e.g., 2025-W39"),
+    db: Session = Depends(get_db),
+):
+    """
+    Running LIVE totals for every team in a league/week (week-to-date % return of
+    each active starter, summed per team). Totals are kept incrementally as price
+    rows are ingested, so a read costs a couple of small queries during market hours.
+    """
+    try:
+        iso_week_bounds(week)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    league = db.get(models.League, league_id)
+    if league is None:
+        raise HTTPException(status_code=404, detail="League not found")
+
+    names = TeamNames(db, league_id)
+    lw = live_scores.get(db, league, week, names.team_ids)
+    totals = dict(lw.totals)
+    returns = dict(lw.returns)
+    return {
+        "league_id": league_id,
+        "week": week,
+        "locked": is_lineup_locked(),
+        "price_updates": lw.price_updates,
+        "updated_at": lw.updated_at,
+        "teams": [
+            {
+                "team_id": tid,
+                "team_name": names(tid),
+                "points": totals.get(tid, 0.0),
+                "starters": [{"symbol": s, "return_pct": returns.get(s, 0.0)} for s in lw.starters[tid]],
+            }
+            for tid in sorted(lw.starters)
+        ],
+    }
+
+
+@router.get("/stats")
+def live_stats():
+    return {"scoreboard": scoreboard_hub.stats(), "live_scores": live_scores.stats()}
@@ -3,14 +3,18 @@ from __future__ import annotations
 
 import csv
 import io
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, Field
-from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
 from .. import models
 from ..db import get_db
+from ..logic.player_query import page_players, resolve_order
+from ..services.catalog import SORT_KEYS, catalog
+from ..services.rostered import rostered
+from ..services.search_index import search_index
 
 router = APIRouter(prefix="/players", tags=["players"])
 
@@ -39,6 +43,15 @@ class SecurityOut(BaseModel):
     proj_points: float | None = None
 
 
+class CatalogStats(BaseModel):
+    rows: int
+    tokens: int
+    build_ms: float
+    bytes: int
+    built_at: datetime
+    rebuilds: int
+
+
 class IngestCSVBody(BaseModel):
     """
     CSV text with header. Columns supported (case-insensitive):
@@ -95,7 +108,10 @@ def seed_securities(items: list[SecurityIn], db: Session = Depends(get_db)):
         row.adp = it.adp
         row.proj_points = it.proj_points
         upserted.append(sym)
+    search_index.sync(db, upserted)
+    catalog.touch(db)
     db.commit()
+    catalog.rebuild(db)
     return {"ok": True, "upserted": upserted}
 
 
@@ -157,7 +173,10 @@ def ingest_csv(body: IngestCSVBody, db: Session = Depends(get_db)):
 
         upserted.append(sym)
 
+    search_index.sync(db, upserted)
+    catalog.touch(db)
     db.commit()
+    catalog.rebuild(db)
     return {"ok": True, "upserted": upserted, "skipped": skipped}
 
 
@@ -168,12 +187,16 @@ def reset_players_table(db: Session = Depends(get_db)):
     Safe in test DB since we recreate schema each run.
     """
     db.query(models.Security).delete()
+    search_index.clear(db)
+    catalog.touch(db)
     db.commit()
+    catalog.rebuild(db)
     return {"ok": True, "deleted": True}
 
 
 @router.get("/search", response_model=list[SecurityOut])
 def search_players(
+    response: Response,
     q: str | None = Query(None, description="Search by name or symbol"),
     bucket: str | None = Query(None, description="Filter by primary bucket"),
     is_etf: bool | None = Query(None),
@@ -185,17 +208,23 @@ def search_players(
     sort: str | None = Query(None, description="symbol|market_cap|adp|proj_points"),
     order: str | None = Query(None, description="asc|desc"),
     limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
     db: Session = Depends(get_db),
 ):
     """
     Search the securities catalog with filters. If available_in_league is provided,
     exclude symbols currently rostered by any team in that league.
+
+    Keyset-paged: when more rows follow, the X-Next-Cursor response header
+    carries the (sort value, symbol) of the last row; pass it back as `cursor`
+    with the same filters and sort for the next page.
     """
     query = db.query(models.Security)
 
-    if q:
-        qq = f"%{q.strip()}%"
-        query = query.filter(or_(models.Security.symbol.ilike(qq), models.Security.name.ilike(qq)))
+    rank = None
+    if q and q.strip():
+        where, rank = search_index.match(db, q)
+        query = query.filter(where)
 
     if bucket:
         query = query.filter(models.Security.primary_bucket == bucket.strip().upper())
@@ -213,39 +242,16 @@ def search_players(
         query = query.filter(models.Security.sector == sector.strip())
 
     if available_in_league:
-        rostered_symbols_sq = (
-            select(models.RosterSlot.symbol)
-            .join(models.Team, models.Team.id == models.RosterSlot.team_id)
-            .where(models.Team.league_id == available_in_league)
-            .scalar_subquery()
-        )
-        query = query.filter(~models.Security.symbol.in_(rostered_symbols_sq))
-
-    # Sorting
-    sort_map = {
-        "symbol": models.Security.symbol.asc(),
-        "market_cap": models.Security.market_cap.desc(),  # default: larger first
-        "adp": models.Security.adp.asc(),  # default: lower first
-        "proj_points": models.Security.proj_points.desc(),  # default: higher first
-    }
-    if sort:
-        key = sort.strip().lower()
-        clause = sort_map.get(key)
-        if clause is not None:
-            # Apply order override if provided
-            if order and order.strip().lower() == "asc":
-                if key in ("market_cap", "proj_points"):
-                    clause = clause.reverse()  # make asc
-            elif order and order.strip().lower() == "desc":
-                if key in ("symbol", "adp"):
-                    clause = clause.reverse()  # make desc
-            query = query.order_by(clause, models.Security.symbol.asc())
-        else:
-            query = query.order_by(models.Security.symbol.asc())
-    else:
-        query = query.order_by(models.Security.symbol.asc())
+        taken = rostered.symbols(db, available_in_league)
+        if taken:
+            query = query.filter(models.Security.symbol.not_in(taken))
 
-    rows = query.limit(limit).all()
+    try:
+        rows, next_cursor = page_players(query, resolve_order(sort, order, rank), cursor, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
 
     return [
         SecurityOut(
@@ -260,3 +266,28 @@ def search_players(
         )
         for r in rows
     ]
+
+
+@router.get("/autocomplete", response_model=list[SecurityOut])
+def autocomplete_players(
+    q: str = Query("", max_length=50, description="Symbol or name prefix"),
+    sort: str = Query("adp", description="symbol|market_cap|adp|proj_points; orders equally good matches"),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    """
+    Type-ahead over the in-memory catalog snapshot: symbols starting with `q`
+    first (exact match on top), then names with words starting with each word
+    of `q`. No database round trip once the snapshot is built.
+    """
+    key = sort.strip().lower()
+    if key not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {'|'.join(SORT_KEYS)}")
+    snap = catalog.get(db)
+    return [snap.row(i) for i in snap.complete(q, limit=limit, sort=key)]
+
+
+@router.get("/catalog/stats", response_model=CatalogStats)
+def catalog_stats(db: Session = Depends(get_db)):
+    """Size, approximate memory footprint and last build time of the catalog snapshot."""
+    return catalog.stats(db)
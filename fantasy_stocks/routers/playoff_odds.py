@@ -0,0 +1,84 @@
+# fantasy_stocks/routers/playoff_odds.py
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..db import get_db
+from ..logic.playoff_odds import PLAYOFF_TEAMS, TeamLine, score_distributions, simulate_playoff_odds
+from ..logic.standings import load_standings
+from ..utils.response_cache import etag_cached
+from .playoffs import _tiebreak_key
+from .standings import _deterministic_coin, _h2h_stats_among
+
+# Separate module (like standings_snapshot) because playoffs already imports from standings
+route = APIRouter(prefix="/standings", tags=["standings"])
+
+
+@route.get("/{league_id}/playoff_odds", operation_id="standings_playoff_odds")
+@etag_cached("standings_playoff_odds", cache_if=lambda kwargs: kwargs["seed"] is not None)
+def playoff_odds(
+    league_id: int,
+    request: Request,
+    trials: int = Query(2000, ge=1, le=100_000, description="Number of simulated seasons"),
+    seed: int | None = Query(None, description="RNG seed for reproducible odds"),
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    """
+    Monte Carlo playoff odds: simulate the unscored regular-season matches `trials`
+    times from each team's TeamScore history, seed every trial with the same
+    tiebreakers as /playoffs, and play out the top-4 bracket.
+    Returns per team: P(top-4 seed), P(champion) and expected final seed.
+    Only seeded runs are served from the response cache; unseeded ones are redrawn.
+    """
+    league = db.get(models.League, league_id)
+    if not league:
+        raise HTTPException(status_code=404, detail="League not found")
+
+    rows = load_standings(db, league_id)
+    if len(rows) < PLAYOFF_TEAMS:
+        raise HTTPException(status_code=400, detail=f"Need at least {PLAYOFF_TEAMS} teams for playoffs")
+    team_ids = [tid for tid, _, _ in rows]
+    names = {tid: name for tid, name, _ in rows}
+    table = {
+        tid: TeamLine(st.wins, st.losses, st.ties, st.points_for, st.points_against)
+        for tid, _, st in rows
+        if st is not None
+    }
+    h2h = {
+        tid: TeamLine(s["wins"], s["losses"], s["ties"], s["pf"], s["pa"])
+        for tid, s in _h2h_stats_among(db, league_id, set(team_ids)).items()
+    }
+
+    remaining = [
+        (h, a)
+        for h, a, week in db.query(models.Match.home_team_id, models.Match.away_team_id, models.Match.week)
+        .filter(
+            models.Match.league_id == league_id,
+            (models.Match.home_points.is_(None)) | (models.Match.away_points.is_(None)),
+        )
+        .order_by(models.Match.id.asc())
+        if "-PO-" not in week
+    ]
+    history = db.query(models.TeamScore.team_id, models.TeamScore.points).filter(
+        models.TeamScore.league_id == league_id
+    )
+    dists = score_distributions(team_ids, history)
+    coins = {tid: _deterministic_coin(league_id, tid) for tid in team_ids}
+
+    start = time.perf_counter()
+    odds = simulate_playoff_odds(team_ids, table, h2h, remaining, dists, coins, _tiebreak_key, trials=trials, seed=seed)
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+    return {
+        "league_id": league_id,
+        "trials": trials,
+        "seed": seed,
+        "remaining_matches": len(remaining),
+        "elapsed_ms": round(elapsed_ms, 2),
+        "teams": [{**o, "team_name": names.get(o["team_id"], f"Team {o['team_id']}")} for o in odds],
+    }
@@ -21,6 +21,13 @@ from .standings import (
 route = APIRouter(prefix="/playoffs", tags=["playoffs"])
 
 
+def _tiebreak_key(
+    win_pct: float, h2h_win_pct: float, point_diff: float, points_for: float, coin: float
+) -> tuple[float, float, float, float, float]:
+    """Sort key (descending = better seed) shared by seeding and the playoff-odds simulation."""
+    return (win_pct, h2h_win_pct, point_diff, points_for, coin)
+
+
 def _seed_order_by_tiebreakers(db: Session, league_id: int) -> list[int]:
     """
     Produce a full seeding order using the same rules as /standings/{league_id}/tiebreakers:
@@ -46,7 +53,7 @@ def _seed_order_by_tiebreakers(db: Session, league_id: int) -> list[int]:
         g = hs["wins"] + hs["losses"] + hs["ties"]
         h2h_win_pct = (hs["wins"] + 0.5 * hs["ties"]) / g if g > 0 else 0.0
         coin = _deterministic_coin(league_id, row.team_id)
-        return (win_pct, h2h_win_pct, diff, pf, coin)
+        return _tiebreak_key(win_pct, h2h_win_pct, diff, pf, coin)
 
     ordered = sorted(base, key=key_for, reverse=True)
     return [r.team_id for r in ordered]
@@ -1,72 +1,199 @@
 # fantasy_stocks/routers/prices.py
 import csv
+import gzip
 import io
+import os
+import zlib
+from collections.abc import Iterator
 from datetime import date
+from typing import BinaryIO
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from sqlalchemy import bindparam, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from ..db import get_db
-from ..models import Price
-from ..schemas import PriceIn, PriceUpsertResult
+from ..models import Price, RosterSlot, Team
+from ..schemas import PriceCacheStats, PriceIn, PriceUpsertResult
+from ..services import league_version
+from ..services.live_scores import live_scores
+from ..services.periods import iso_week_label
+from ..services.price_cache import price_cache
+from ..services.pricing import refresh_weekly_returns
 
 router = APIRouter(prefix="/prices", tags=["prices"])
 
 
-def _upsert_prices(db: Session, rows: list[PriceIn]) -> tuple[int, int]:
+# Rows per INSERT ... ON CONFLICT round-trip (also the pre-select batch size).
+PRICE_UPSERT_CHUNK_SIZE = int(os.getenv("PRICE_UPSERT_CHUNK_SIZE", "1000"))
+
+
+def _dialect_insert(db: Session):
+    """Dialect-specific INSERT that supports ON CONFLICT, or None if unavailable."""
+    name = db.get_bind().dialect.name
+    if name == "sqlite":
+        return sqlite_insert
+    if name == "postgresql":
+        return pg_insert
+    return None
+
+
+def _upsert_price_chunk(db: Session, rows: list[PriceIn], touched: dict[tuple[str, str], date]) -> tuple[int, int]:
+    """
+    Upsert one chunk with a single pre-select and a single write statement.
+
+    The pre-select of existing (symbol, date) keys gives exact inserted/updated
+    counts and lets unchanged rows be skipped; the write itself is
+    INSERT ... ON CONFLICT (symbol, date) DO UPDATE against uq_price_symbol_date.
+    Rows are applied in order, so duplicates inside a chunk behave like
+    sequential upserts. Weekly-return cells of written rows go into `touched`.
+    """
+    keys = {(r.symbol.upper(), r.date) for r in rows}
+    state: dict[tuple[str, date], tuple[float | None, float | None]] = {
+        (sym, d): (o, c)
+        for sym, d, o, c in db.execute(
+            select(Price.symbol, Price.date, Price.open, Price.close).where(tuple_(Price.symbol, Price.date).in_(keys))
+        )
+    }
+    preexisting = set(state)
+
     inserted, updated = 0, 0
+    dirty: set[tuple[str, date]] = set()
     for r in rows:
-        symbol = r.symbol.upper()
-        d: date = r.date
-        open_ = r.open
-        close_ = r.close
-
-        existing = db.query(Price).filter(Price.symbol == symbol, Price.date == d).one_or_none()
-        if existing:
-            changed = False
-            if open_ is not None and existing.open != open_:
-                existing.open = open_
-                changed = True
-            if close_ is not None and existing.close != close_:
-                existing.close = close_
-                changed = True
-            if changed:
-                updated += 1
-        else:
-            db.add(Price(symbol=symbol, date=d, open=open_, close=close_))
+        key = (r.symbol.upper(), r.date)
+        if key not in state:
+            state[key] = (r.open, r.close)
             inserted += 1
+            dirty.add(key)
+            continue
+        old_open, old_close = state[key]
+        new_open = r.open if r.open is not None else old_open
+        new_close = r.close if r.close is not None else old_close
+        if (new_open, new_close) != (old_open, old_close):
+            state[key] = (new_open, new_close)
+            updated += 1
+            dirty.add(key)
+
+    if not dirty:
+        return inserted, updated
+
+    payload = [{"symbol": sym, "date": d, "open": state[(sym, d)][0], "close": state[(sym, d)][1]} for sym, d in dirty]
+    dialect_insert = _dialect_insert(db)
+    if dialect_insert is not None:
+        stmt = dialect_insert(Price)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Price.symbol, Price.date],
+            set_={"open": stmt.excluded.open, "close": stmt.excluded.close},
+        )
+        db.execute(stmt, payload)
+    else:
+        # No ON CONFLICT support: the pre-select already split inserts from updates.
+        fresh = [p for p in payload if (p["symbol"], p["date"]) not in preexisting]
+        changed = [
+            {"k_symbol": p["symbol"], "k_date": p["date"], "k_open": p["open"], "k_close": p["close"]}
+            for p in payload
+            if (p["symbol"], p["date"]) in preexisting
+        ]
+        if fresh:
+            db.execute(insert(Price), fresh)
+        if changed:
+            t = Price.__table__
+            db.execute(
+                update(t)
+                .where(t.c.symbol == bindparam("k_symbol"), t.c.date == bindparam("k_date"))
+                .values(open=bindparam("k_open"), close=bindparam("k_close")),
+                changed,
+            )
+
+    for sym, d in dirty:
+        touched[(sym, iso_week_label(d))] = d
+    return inserted, updated
+
+
+def _leagues_rostering(db: Session, symbols: set[str]) -> list[int]:
+    rows = (
+        db.query(Team.league_id)
+        .join(RosterSlot, RosterSlot.team_id == Team.id)
+        .filter(RosterSlot.symbol.in_(symbols))
+        .distinct()
+    )
+    return [league_id for (league_id,) in rows]
+
+
+def _commit_price_upsert(db: Session, touched: dict[tuple[str, str], date]) -> None:
+    """
+    Refresh the weekly-return cells written by the upsert and commit. Then drop
+    the cached series, feed the new returns to the live-score accumulators and
+    advance the version of every league rostering a written symbol in a second,
+    tiny commit (in that order, so change listeners already see the new prices).
+    """
+    symbols = {sym for sym, _ in touched}
+    league_ids: list[int] = []
+    returns: dict[tuple[str, str], float] = {}
+    if touched:
+        refresh_weekly_returns(db, ((sym, d) for (sym, _), d in touched.items()), returns)
+        league_ids = _leagues_rostering(db, symbols)
     db.commit()
+    if touched:
+        price_cache.invalidate(symbols)
+        live_scores.apply_returns(returns)
+        for league_id in league_ids:
+            league_version.touch(db, league_id)
+        db.commit()
+
+
+def _upsert_prices(db: Session, rows: list[PriceIn], chunk_size: int = PRICE_UPSERT_CHUNK_SIZE) -> tuple[int, int]:
+    """
+    Chunked bulk upsert of price rows; one transaction for the whole payload.
+    Returns exact (inserted, updated) counts; unchanged rows count as neither.
+    """
+    inserted, updated = 0, 0
+    touched: dict[tuple[str, str], date] = {}  # (symbol, iso_week) -> any written date in that week
+    for start in range(0, len(rows), max(1, chunk_size)):
+        ins, upd = _upsert_price_chunk(db, rows[start : start + chunk_size], touched)
+        inserted += ins
+        updated += upd
+    _commit_price_upsert(db, touched)
     return inserted, updated
 
 
 @router.post("/bulk", response_model=PriceUpsertResult)
-def bulk_prices(rows: list[PriceIn], db: Session = Depends(get_db)):
+def bulk_prices(
+    rows: list[PriceIn],
+    chunk_size: int = Query(PRICE_UPSERT_CHUNK_SIZE, ge=1, le=10_000, description="Rows per upsert statement"),
+    db: Session = Depends(get_db),
+):
     # FastAPI/Pydantic will already have validated each item as PriceIn (date is a real date)
-    ins, upd = _upsert_prices(db, rows)
+    ins, upd = _upsert_prices(db, rows, chunk_size=chunk_size)
     return {"inserted": ins, "updated": upd}
 
 
-@router.post("/csv", response_model=PriceUpsertResult)
-async def upload_prices_csv(file: UploadFile = File(...), db: Session = Depends(get_db)):
-    filename: str | None = getattr(file, "filename", None)
-    if not filename or not filename.lower().endswith(".csv"):
-        raise HTTPException(400, "Please upload a .csv file")
-
-    content = await file.read()
+def _csv_float(s: str, line_no: int) -> float | None:
+    if s == "":
+        return None
     try:
-        text = content.decode("utf-8")
-    except Exception as err:
-        raise HTTPException(400, "CSV must be UTF-8 encoded") from err
+        return float(s)
+    except ValueError:
+        raise HTTPException(400, f"Row {line_no}: invalid number '{s}'")
+
 
-    reader = csv.DictReader(io.StringIO(text))
+def _iter_csv_prices(text: io.TextIOBase) -> Iterator[PriceIn]:
+    """
+    Parse price rows lazily from a text stream, validating line by line.
+    Raises HTTPException(400) naming the offending row, like the buffered parser did.
+    """
+    reader = csv.DictReader(text)
 
-    # Verify required headers
-    header_set = {(h or "").strip().lower() for h in (reader.fieldnames or [])}
+    # Verify required headers (case/whitespace-insensitive)
+    fieldnames = [(h or "").strip().lower() for h in (reader.fieldnames or [])]
     required = {"symbol", "date"}  # open/close optional
-    if not required.issubset(header_set):
+    if not required.issubset(set(fieldnames)):
         raise HTTPException(400, f"CSV must include headers: {sorted(required)}")
+    reader.fieldnames = fieldnames
 
-    parsed_rows: list[PriceIn] = []
     line_no = 1  # account for header row
     for row in reader:
         line_no += 1
@@ -84,19 +211,70 @@ async def upload_prices_csv(file: UploadFile = File(...), db: Session = Depends(
         except ValueError:
             raise HTTPException(400, f"Row {line_no}: invalid date '{date_raw}' (expected YYYY-MM-DD)")
 
-        def to_float(s: str, ln=line_no) -> float | None:
-            if s == "":
-                return None
-            try:
-                return float(s)
-            except ValueError:
-                raise HTTPException(400, f"Row {ln}: invalid number '{s}'")
+        # Build a PriceIn with a REAL date (keeps type-checkers happy)
+        yield PriceIn(
+            symbol=symbol_raw, date=d, open=_csv_float(open_raw, line_no), close=_csv_float(close_raw, line_no)
+        )
 
-        open_val = to_float(open_raw)
-        close_val = to_float(close_raw)
 
-        # Build a PriceIn with a REAL date (keeps type-checkers happy)
-        parsed_rows.append(PriceIn(symbol=symbol_raw, date=d, open=open_val, close=close_val))
+def _ingest_csv_stream(db: Session, raw: BinaryIO, gzipped: bool, chunk_size: int) -> tuple[int, int]:
+    """
+    Stream a (optionally gzip-compressed) CSV upload into the prices table.
+    Bytes are decompressed/decoded incrementally and rows are upserted in
+    `chunk_size` batches, so memory stays bounded by the batch, not the file.
+    All batches share one transaction: any bad row rolls back the whole upload.
+    """
+    binary: BinaryIO = gzip.GzipFile(fileobj=raw, mode="rb") if gzipped else raw
+    text = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+    inserted, updated = 0, 0
+    touched: dict[tuple[str, str], date] = {}
+    batch: list[PriceIn] = []
+    try:
+        for row in _iter_csv_prices(text):
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                ins, upd = _upsert_price_chunk(db, batch, touched)
+                inserted, updated = inserted + ins, updated + upd
+                batch = []
+        if batch:
+            ins, upd = _upsert_price_chunk(db, batch, touched)
+            inserted, updated = inserted + ins, updated + upd
+    except HTTPException:
+        db.rollback()
+        raise
+    except UnicodeDecodeError as err:
+        db.rollback()
+        raise HTTPException(400, "CSV must be UTF-8 encoded") from err
+    except (OSError, EOFError, zlib.error) as err:
+        db.rollback()
+        raise HTTPException(400, "Invalid gzip data") from err
+    finally:
+        text.detach()  # leave closing the upload to Starlette
+
+    _commit_price_upsert(db, touched)
+    return inserted, updated
+
 
-    ins, upd = _upsert_prices(db, parsed_rows)
+@router.post("/csv", response_model=PriceUpsertResult)
+async def upload_prices_csv(
+    file: UploadFile = File(...),
+    chunk_size: int = Query(PRICE_UPSERT_CHUNK_SIZE, ge=1, le=10_000, description="Rows per upsert statement"),
+    db: Session = Depends(get_db),
+):
+    """
+    Upsert prices from a CSV upload (`.csv`, or gzip-compressed `.csv.gz`).
+    The file is parsed as a stream and written in `chunk_size` batches.
+    """
+    filename = (getattr(file, "filename", None) or "").lower()
+    gzipped = filename.endswith(".csv.gz")
+    if not (filename.endswith(".csv") or gzipped):
+        raise HTTPException(400, "Please upload a .csv or .csv.gz file")
+
+    ins, upd = await run_in_threadpool(_ingest_csv_stream, db, file.file, gzipped, chunk_size)
     return {"inserted": ins, "updated": upd}
+
+
+@router.get("/cache/stats", response_model=PriceCacheStats)
+def price_cache_stats():
+    """Hit/miss/eviction counters and footprint of the in-process price cache."""
+    return price_cache.stats()
@@ -3,38 +3,21 @@ from __future__ import annotations
 
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
 from .. import models
 from ..db import get_db
+from ..utils.response_cache import etag_cached
+from ..utils.team_names import TeamNames, serialize_match
 
 router = APIRouter(prefix="/records", tags=["records"])
 
 
-def _team_name(db: Session, team_id: int) -> str:
-    t = db.get(models.Team, team_id)
-    return t.name if t else f"Team {team_id}"
-
-
 def _to_float(x: float | None) -> float:
     return 0.0 if x is None else float(x)
 
 
-def _serialize_match(db: Session, m: models.Match) -> dict[str, Any]:
-    return {
-        "id": m.id,
-        "week": m.week,
-        "home_team_id": m.home_team_id,
-        "home_team_name": _team_name(db, m.home_team_id),
-        "home_points": None if m.home_points is None else float(m.home_points),
-        "away_team_id": m.away_team_id,
-        "away_team_name": _team_name(db, m.away_team_id),
-        "away_points": None if m.away_points is None else float(m.away_points),
-        "winner_team_id": m.winner_team_id,
-    }
-
-
 def _all_scored_matches(db: Session, league_id: int) -> list[models.Match]:
     return (
         db.query(models.Match)
@@ -57,21 +40,20 @@ def _all_team_scores(db: Session, league_id: int) -> list[models.TeamScore]:
     )
 
 
-def _team_week_high(db: Session, league_id: int) -> dict[str, Any] | None:
+def _team_week_high(db: Session, league_id: int, names: TeamNames) -> dict[str, Any] | None:
     rows = _all_team_scores(db, league_id)
     if not rows:
         return None
     best = max(rows, key=lambda r: _to_float(r.points))
     return {
         "team_id": best.team_id,
-        "team_name": _team_name(db, best.team_id),
+        "team_name": names(best.team_id),
         "period": best.period,
         "points": _to_float(best.points),
     }
 
 
-def _game_total_high(db: Session, league_id: int) -> dict[str, Any] | None:
-    matches = _all_scored_matches(db, league_id)
+def _game_total_high(matches: list[models.Match], names: TeamNames) -> dict[str, Any] | None:
     if not matches:
         return None
 
@@ -79,13 +61,12 @@ def _game_total_high(db: Session, league_id: int) -> dict[str, Any] | None:
         return _to_float(m.home_points) + _to_float(m.away_points)
 
     m = max(matches, key=total)
-    out = _serialize_match(db, m)
+    out = serialize_match(names, m)
     out["total_points"] = total(m)
     return out
 
 
-def _blowout_high(db: Session, league_id: int) -> dict[str, Any] | None:
-    matches = _all_scored_matches(db, league_id)
+def _blowout_high(matches: list[models.Match], names: TeamNames) -> dict[str, Any] | None:
     if not matches:
         return None
 
@@ -93,13 +74,12 @@ def _blowout_high(db: Session, league_id: int) -> dict[str, Any] | None:
         return abs(_to_float(m.home_points) - _to_float(m.away_points))
 
     m = max(matches, key=margin)
-    out = _serialize_match(db, m)
+    out = serialize_match(names, m)
     out["margin"] = margin(m)
     return out
 
 
-def _narrowest_win(db: Session, league_id: int) -> dict[str, Any] | None:
-    matches = _all_scored_matches(db, league_id)
+def _narrowest_win(matches: list[models.Match], names: TeamNames) -> dict[str, Any] | None:
     wins: list[tuple[models.Match, float]] = []
     for m in matches:
         hp = _to_float(m.home_points)
@@ -109,25 +89,21 @@ def _narrowest_win(db: Session, league_id: int) -> dict[str, Any] | None:
     if not wins:
         return None
     m, mg = min(wins, key=lambda t: t[1])
-    out = _serialize_match(db, m)
+    out = serialize_match(names, m)
     out["margin"] = mg
     return out
 
 
-def _streaks(db: Session, league_id: int) -> dict[str, Any]:
+def _streaks(matches: list[models.Match], names: TeamNames) -> dict[str, Any]:
     """
     Compute longest win streak and longest unbeaten (W/T) streak for each team.
     Also return current streaks.
     """
-    matches = _all_scored_matches(db, league_id)
     if not matches:
         return {"longest_win_streak": None, "longest_unbeaten_streak": None, "current": []}
 
     # Build per-team result timelines in chronological order.
-    timelines: dict[int, list[str]] = {}
-    teams = db.query(models.Team).filter(models.Team.league_id == league_id).all()
-    for t in teams:
-        timelines[t.id] = []
+    timelines: dict[int, list[str]] = {tid: [] for tid in names.team_ids}
 
     for m in matches:
         hp = _to_float(m.home_points)
@@ -177,17 +153,13 @@ def _streaks(db: Session, league_id: int) -> dict[str, Any]:
             lw_best = (tid, lw)
         if lu > lu_best[1]:
             lu_best = (tid, lu)
-        current.append({"team_id": tid, "team_name": _team_name(db, tid), "streak": current_run(seq)})
+        current.append({"team_id": tid, "team_name": names(tid), "streak": current_run(seq)})
 
     longest_win = (
-        None
-        if lw_best[0] is None
-        else {"team_id": lw_best[0], "team_name": _team_name(db, lw_best[0]), "length": lw_best[1]}
+        None if lw_best[0] is None else {"team_id": lw_best[0], "team_name": names(lw_best[0]), "length": lw_best[1]}
     )
     longest_unbeaten = (
-        None
-        if lu_best[0] is None
-        else {"team_id": lu_best[0], "team_name": _team_name(db, lu_best[0]), "length": lu_best[1]}
+        None if lu_best[0] is None else {"team_id": lu_best[0], "team_name": names(lu_best[0]), "length": lu_best[1]}
     )
 
     return {
@@ -198,7 +170,8 @@ def _streaks(db: Session, league_id: int) -> dict[str, Any]:
 
 
 @router.get("/{league_id}/all")
-def records_all(league_id: int, db: Session = Depends(get_db)) -> dict[str, Any]:
+@etag_cached("records_all")
+def records_all(league_id: int, request: Request, db: Session = Depends(get_db)) -> dict[str, Any]:
     """
     Aggregate records for a league:
       - team_week_high: best single-week team score
@@ -212,11 +185,13 @@ def records_all(league_id: int, db: Session = Depends(get_db)) -> dict[str, Any]
     if not league:
         raise HTTPException(status_code=404, detail="League not found")
 
-    team_week_high = _team_week_high(db, league_id)
-    game_total_high = _game_total_high(db, league_id)
-    blowout_high = _blowout_high(db, league_id)
-    narrowest = _narrowest_win(db, league_id)
-    streaks = _streaks(db, league_id)
+    names = TeamNames(db, league_id)
+    matches = _all_scored_matches(db, league_id)
+    team_week_high = _team_week_high(db, league_id, names)
+    game_total_high = _game_total_high(matches, names)
+    blowout_high = _blowout_high(matches, names)
+    narrowest = _narrowest_win(matches, names)
+    streaks = _streaks(matches, names)
 
     return {
         "ok": True,
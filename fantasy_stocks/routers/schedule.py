@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from .. import models
 from ..db import get_db
+from ..services import league_version
 from ..services.periods import current_week_label
 
 # NOTE: This keeps your original prefix & tag so existing tests keep passing.
@@ -68,6 +69,7 @@ def generate_week(league_id: int, db: Session = Depends(get_db)) -> dict[str, An
         db.add(m)
         created += 1
 
+    league_version.touch(db, league_id)
     db.commit()
     return {"ok": True, "week": week, "matches_created": created}
 
@@ -136,6 +138,8 @@ def generate_season(league_id: int, weeks: int = 0, db: Session = Depends(get_db
         # Rotate (keep first fixed)
         arr = [arr[0]] + [arr[-1]] + arr[1:-1]
 
+    if created_matches:
+        league_version.touch(db, league_id)
     db.commit()
     return {
         "ok": True,
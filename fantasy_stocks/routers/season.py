@@ -3,13 +3,15 @@ from __future__ import annotations
 
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 
 from .. import models
 from ..db import get_db
+from ..services.jobs import JobFn, ProgressFn, job_out, job_queue
 from ..services.periods import current_week_label
+from ..utils.team_names import TeamNames, serialize_match
 from .playoffs import _seed_order_by_tiebreakers  # seeds teams using your tiebreakers
 
 # Reuse helpers from existing routers
@@ -282,25 +284,6 @@ def season_state(league_id: int, db: Session = Depends(get_db)) -> dict[str, Any
     return {"ok": True, "league_id": league_id, "state": _compute_state(db, league_id)}
 
 
-def _team_name(db: Session, team_id: int) -> str:
-    t = db.get(models.Team, team_id)
-    return t.name if t else f"Team {team_id}"
-
-
-def _serialize_match(db: Session, m: models.Match) -> dict[str, Any]:
-    return {
-        "id": m.id,
-        "week": m.week,
-        "home_team_id": m.home_team_id,
-        "home_team_name": _team_name(db, m.home_team_id),
-        "away_team_id": m.away_team_id,
-        "away_team_name": _team_name(db, m.away_team_id),
-        "home_points": None if m.home_points is None else float(m.home_points),
-        "away_points": None if m.away_points is None else float(m.away_points),
-        "winner_team_id": m.winner_team_id,
-    }
-
-
 @router.get("/{league_id}/bracket")
 def season_bracket(league_id: int, db: Session = Depends(get_db)) -> dict[str, Any]:
     """
@@ -319,6 +302,7 @@ def season_bracket(league_id: int, db: Session = Depends(get_db)) -> dict[str, A
 
     state = _compute_state(db, league_id)
     seeds: list[int] = _seed_order_by_tiebreakers(db, league_id)
+    names = TeamNames(db, league_id)
 
     # Semis
     sf_weeks = _find_weeks_like_suffix(db, league_id, "-PO-SF")
@@ -326,7 +310,7 @@ def season_bracket(league_id: int, db: Session = Depends(get_db)) -> dict[str, A
     semifinals: list[dict[str, Any]] = []
     if semifinals_week:
         for m in _get_matches_for_week(db, league_id, semifinals_week):
-            semifinals.append(_serialize_match(db, m))
+            semifinals.append(serialize_match(names, m))
 
     # Bronze
     br_weeks = _find_weeks_like_suffix(db, league_id, "-PO-3P")
@@ -335,12 +319,12 @@ def season_bracket(league_id: int, db: Session = Depends(get_db)) -> dict[str, A
     if bronze_week:
         ms = _get_matches_for_week(db, league_id, bronze_week)
         if ms:
-            bronze = _serialize_match(db, ms[0])
+            bronze = serialize_match(names, ms[0])
 
     # Finals
     f_state = _finals_state(db, league_id)
     finals_week = f_state["week"] if f_state else None
-    finals = _serialize_match(db, f_state["match"]) if f_state else None
+    finals = serialize_match(names, f_state["match"]) if f_state else None
 
     # Champion (if decided)
     champion_meta = _champion_from_finals_state(f_state, league_id, db) if f_state else None
@@ -366,8 +350,7 @@ def season_bracket(league_id: int, db: Session = Depends(get_db)) -> dict[str, A
     }
 
 
-@router.post("/{league_id}/advance")
-def advance_season(league_id: int, db: Session = Depends(get_db)) -> dict[str, Any]:
+def _advance(db: Session, league: models.League) -> dict[str, Any]:
     """
     One-click commissioner flow:
       1) If there are unscored weeks (regular or playoff), score the earliest one.
@@ -380,9 +363,7 @@ def advance_season(league_id: int, db: Session = Depends(get_db)) -> dict[str, A
 
     Every response includes "state": "regular" | "semis" | "finals" | "complete".
     """
-    league = db.get(models.League, league_id)
-    if not league:
-        raise HTTPException(status_code=404, detail="League not found")
+    league_id = league.id
 
     # No matches at all?
     total_matches = db.query(models.Match).filter(models.Match.league_id == league_id).count()
@@ -468,3 +449,46 @@ def advance_season(league_id: int, db: Session = Depends(get_db)) -> dict[str, A
     resp = {"ok": True, "action": "season_complete", **(champ or {})}
     resp["state"] = _compute_state(db, league_id)
     return resp
+
+
+def _advance_job(league_id: int) -> JobFn:
+    def run(db: Session, progress: ProgressFn) -> dict[str, Any]:
+        league = db.get(models.League, league_id)
+        if league is None:
+            raise ValueError(f"League {league_id} not found")
+        result = _advance(db, league)
+        progress(1, 1, result["action"])
+        return result
+
+    return run
+
+
+@router.post("/{league_id}/advance")
+def advance_season(
+    league_id: int,
+    request: Request,
+    response: Response,
+    run_async: bool = Query(False, alias="async", description="Queue as a background job and return its id"),
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    """
+    Advance the season by one step (see `_advance`).
+    With `?async=true` the step runs as a background job (202 + job id; poll `/jobs/{id}`);
+    an Idempotency-Key header makes repeat submissions return the same job.
+    """
+    league = db.get(models.League, league_id)
+    if not league:
+        raise HTTPException(status_code=404, detail="League not found")
+
+    if run_async:
+        job = job_queue.submit(
+            db,
+            "advance_season",
+            _advance_job(league_id),
+            league_id=league_id,
+            idempotency_key=request.headers.get("Idempotency-Key"),
+        )
+        response.status_code = 202
+        return job_out(job)
+
+    return _advance(db, league)
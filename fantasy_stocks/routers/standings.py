@@ -2,112 +2,90 @@
 from __future__ import annotations
 
 import hashlib
-from collections import defaultdict
-from typing import TypedDict
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 
 from .. import models, schemas
 from ..db import get_db
-from ..services.periods import current_week_label
+from ..logic.analytics import LeagueAnalytics
+from ..logic.elo import ELO_K, ELO_START, load_elo
+from ..logic.scoring import score_week
+from ..logic.standings import load_standings
+from ..logic.week_close import close_week_for_leagues
+from ..services.jobs import JobFn, ProgressFn, job_out, job_queue
+from ..services.periods import current_week_label, iso_week_bounds
 from ..utils.idempotency import with_idempotency
 from ..utils.num import to_float
+from ..utils.response_cache import etag_cached
 
 route = APIRouter(prefix="/standings", tags=["standings"])
 
 
-def _sum_active_proj_points(db: Session, team_id: int) -> float:
-    """
-    Sum PROJECTIONS for all active roster slots on a team.
-    Missing Security or None proj_points => treat as 0.
-    """
-    slots = (
-        db.query(models.RosterSlot)
-        .filter(models.RosterSlot.team_id == team_id, models.RosterSlot.is_active.is_(True))
-        .all()
-    )
-    total = 0.0
-    if not slots:
-        return total
-    symbols = [s.symbol for s in slots]
-    # fetch all securities once
-    sec_map: dict[str, models.Security] = {
-        s.symbol: s for s in db.query(models.Security).filter(models.Security.symbol.in_(symbols)).all()
-    }
-    for s in slots:
-        sec = sec_map.get(s.symbol)
-        # ÃƒÂ°Ã…Â¸Ã¢â‚¬ËœÃ¢â‚¬Â¡ use to_float to safely handle None / missing
-        total += to_float(getattr(sec, "proj_points", None))
-    return total
-
-
 def _score_league_for_period(db: Session, league: models.League, period: str) -> list[schemas.ScoreOut]:
     """
     Score all matches for a league in a given ISO week `period` using PROJECTIONS stub:
     points = sum of proj_points for active starters.
     Persists Match.home_points/away_points, winner, and TeamScore snapshots.
+    Already-scored matches are skipped.
     """
-    matches = (
-        db.query(models.Match)
-        .filter(
-            models.Match.league_id == league.id,
-            models.Match.week == period,
-        )
-        .all()
-    )
+    result = score_week(db, league, period, mode=models.ScoringMode.PROJECTIONS, only_unscored=True)
+    scored = result["scored"]
+    if not scored:
+        return []
+
+    team_ids = {m.home_team_id for m in scored} | {m.away_team_id for m in scored}
+    name_by_id = {
+        tid: name for tid, name in db.query(models.Team.id, models.Team.name).filter(models.Team.id.in_(team_ids))
+    }
 
     out: list[schemas.ScoreOut] = []
-    if not matches:
-        return out
-
-    for m in matches:
-        # already scored? skip
-        if m.home_points is not None and m.away_points is not None:
-            continue
-
-        home_pts = _sum_active_proj_points(db, m.home_team_id)
-        away_pts = _sum_active_proj_points(db, m.away_team_id)
-
-        m.home_points = home_pts
-        m.away_points = away_pts
-        if home_pts > away_pts:
-            m.winner_team_id = m.home_team_id
-        elif away_pts > home_pts:
-            m.winner_team_id = m.away_team_id
-        else:
-            m.winner_team_id = None  # tie
-
-        # upsert TeamScore rows
-        for tid, pts in ((m.home_team_id, home_pts), (m.away_team_id, away_pts)):
-            ts = (
-                db.query(models.TeamScore)
-                .filter(
-                    models.TeamScore.league_id == league.id,
-                    models.TeamScore.team_id == tid,
-                    models.TeamScore.period == period,
+    for m in scored:
+        for tid, pts in ((m.home_team_id, m.home_points), (m.away_team_id, m.away_points)):
+            out.append(
+                schemas.ScoreOut(
+                    team_id=tid,
+                    team_name=name_by_id.get(tid, f"Team {tid}"),
+                    period=period,
+                    points=to_float(pts),
                 )
-                .first()
             )
-            if ts:
-                ts.points = pts
-            else:
-                ts = models.TeamScore(league_id=league.id, team_id=tid, period=period, points=pts)
-                db.add(ts)
-
-        # accumulate response with safe team-name fallback
-        home_team = db.get(models.Team, m.home_team_id)
-        away_team = db.get(models.Team, m.away_team_id)
-        home_name = home_team.name if home_team else f"Team {m.home_team_id}"
-        away_name = away_team.name if away_team else f"Team {m.away_team_id}"
-
-        out.append(schemas.ScoreOut(team_id=m.home_team_id, team_name=home_name, period=period, points=home_pts))
-        out.append(schemas.ScoreOut(team_id=m.away_team_id, team_name=away_name, period=period, points=away_pts))
 
     db.commit()
     return out
 
 
+@route.post("/close_week", operation_id="standings_close_week_all")
+@with_idempotency("close_week_all_v1")
+async def close_week_all(
+    body: schemas.CloseWeekAllIn,
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    """
+    Admin: close one ISO week for every league that has matches in it (or for
+    `league_ids`) on a bounded worker pool, one DB session per worker.
+    Returns per-league outcomes plus throughput (leagues per second).
+    Requires an Idempotency-Key header to avoid double-scoring on retries.
+    """
+    week = body.week or current_week_label()
+    try:
+        iso_week_bounds(week)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+    return await run_in_threadpool(
+        close_week_for_leagues,
+        factory,
+        week,
+        body.league_ids,
+        workers=body.workers,
+        max_attempts=body.max_attempts,
+    )
+
+
 @route.post("/{league_id}/close_week", operation_id="standings_close_week")
 @with_idempotency("close_week_v1")  # ÃƒÂ°Ã…Â¸Ã¢â‚¬ËœÃ‹â€  idempotency decorator
 async def close_week(
@@ -138,32 +116,18 @@ async def close_week(
     return {"ok": True, "week": week, "matches_scored": matches_scored, "totals": totals}
 
 
-@route.post("/{league_id}/close_season", operation_id="standings_close_season")
-@with_idempotency("close_season_v1")  # ÃƒÂ°Ã…Â¸Ã¢â‚¬ËœÃ‹â€  idempotency decorator
-async def close_season(
-    league_id: int,
-    request: Request,
-    db: Session = Depends(get_db),
-):
-    """
-    Score every week that has matches for this league, using current projections stub.
-    Safe to call multiple times; only unscored matches are scored.
-    Requires an Idempotency-Key header to avoid double-scoring on retries.
-    """
-    league = db.get(models.League, league_id)
-    if not league:
-        raise HTTPException(status_code=404, detail="League not found")
-
+def _close_season(db: Session, league: models.League, progress: ProgressFn | None = None) -> dict:
+    """Score every week that has matches; `progress` is told after each week."""
     # distinct weeks that have matches
-    weeks = db.query(models.Match.week).filter(models.Match.league_id == league_id).distinct().all()
+    weeks = db.query(models.Match.week).filter(models.Match.league_id == league.id).distinct().all()
     weeks = [w[0] for w in weeks]
     total_matches_scored = 0
 
-    for wk in weeks:
+    for i, wk in enumerate(weeks, start=1):
         before = (
             db.query(models.Match)
             .filter(
-                models.Match.league_id == league_id,
+                models.Match.league_id == league.id,
                 models.Match.week == wk,
                 models.Match.home_points.isnot(None),
                 models.Match.away_points.isnot(None),
@@ -174,7 +138,7 @@ async def close_season(
         after = (
             db.query(models.Match)
             .filter(
-                models.Match.league_id == league_id,
+                models.Match.league_id == league.id,
                 models.Match.week == wk,
                 models.Match.home_points.isnot(None),
                 models.Match.away_points.isnot(None),
@@ -182,102 +146,100 @@ async def close_season(
             .count()
         )
         total_matches_scored += max(0, (after - before))
+        if progress is not None:
+            progress(i, len(weeks), f"scored {wk}")
 
     return {"ok": True, "weeks": weeks, "matches_scored": total_matches_scored}
 
 
-# TypedDict to make Pylance happy about the mixed types in the accumulator
-class _StatRow(TypedDict):
-    team_id: int
-    team_name: str
-    wins: int
-    losses: int
-    ties: int
-    games_played: int
-    points_for: float
-    points_against: float
+def _close_season_job(league_id: int) -> JobFn:
+    def run(db: Session, progress: ProgressFn) -> dict:
+        league = db.get(models.League, league_id)
+        if league is None:
+            raise ValueError(f"League {league_id} not found")
+        return _close_season(db, league, progress)
 
+    return run
 
-def _aggregate_table_rows(db: Session, league_id: int) -> list[schemas.TableRow]:
+
+def _store_close_season(result: dict, kwargs: dict) -> dict:
+    # a queued run caches only its job id; replays report the job as it is now
+    return {"job_id": result["id"]} if kwargs["run_async"] else result
+
+
+def _replay_close_season(cached: dict, kwargs: dict) -> dict:
+    if "job_id" not in cached:
+        return cached
+    job = job_queue.get(kwargs["db"], cached["job_id"])
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    kwargs["response"].status_code = 202
+    return job_out(job)
+
+
+@route.post("/{league_id}/close_season", operation_id="standings_close_season")
+@with_idempotency("close_season_v1", store=_store_close_season, replay=_replay_close_season)
+async def close_season(
+    league_id: int,
+    request: Request,
+    response: Response,
+    run_async: bool = Query(False, alias="async", description="Queue as a background job and return its id"),
+    db: Session = Depends(get_db),
+):
+    """
+    Score every week that has matches for this league, using current projections stub.
+    Safe to call multiple times; only unscored matches are scored.
+    Requires an Idempotency-Key header to avoid double-scoring on retries.
+    With `?async=true` the work runs as a background job: the response is 202 with
+    the job id; poll `/jobs/{id}` for progress and the result.
+    """
     league = db.get(models.League, league_id)
     if not league:
         raise HTTPException(status_code=404, detail="League not found")
 
-    teams = db.query(models.Team).filter(models.Team.league_id == league.id).all()
-    if not teams:
-        return []
-
-    stat: dict[int, _StatRow] = {
-        t.id: _StatRow(
-            team_id=t.id,
-            team_name=t.name,
-            wins=0,
-            losses=0,
-            ties=0,
-            games_played=0,
-            points_for=0.0,
-            points_against=0.0,
+    if run_async:
+        job = job_queue.submit(
+            db,
+            "close_season",
+            _close_season_job(league_id),
+            league_id=league_id,
+            idempotency_key=request.headers.get("Idempotency-Key"),
         )
-        for t in teams
-    }
+        response.status_code = 202
+        return job_out(job)
+
+    return _close_season(db, league)
 
-    played = (
-        db.query(models.Match)
-        .filter(
-            models.Match.league_id == league.id,
-            models.Match.home_points.isnot(None),
-            models.Match.away_points.isnot(None),
-        )
-        .all()
-    )
-    for m in played:
-        hp = to_float(m.home_points)
-        ap = to_float(m.away_points)
-
-        h = stat.get(m.home_team_id)
-        a = stat.get(m.away_team_id)
-        if h is None or a is None:
-            continue
-
-        h["games_played"] += 1
-        a["games_played"] += 1
-        h["points_for"] += hp
-        h["points_against"] += ap
-        a["points_for"] += ap
-        a["points_against"] += hp
-
-        if hp > ap:
-            h["wins"] += 1
-            a["losses"] += 1
-        elif ap > hp:
-            a["wins"] += 1
-            h["losses"] += 1
-        else:
-            h["ties"] += 1
-            a["ties"] += 1
+
+def _aggregate_table_rows(db: Session, league_id: int) -> list[schemas.TableRow]:
+    """
+    Aggregate table from the materialized TeamStanding rows (one joined read,
+    O(teams)); sorted by win_pct, then point diff.
+    """
+    league = db.get(models.League, league_id)
+    if not league:
+        raise HTTPException(status_code=404, detail="League not found")
 
     table: list[schemas.TableRow] = []
-    for t in teams:
-        row = stat[t.id]
-        gp = int(row["games_played"])
-        pf = to_float(row["points_for"])
-        pa = to_float(row["points_against"])
-        diff = pf - pa
-        wins = int(row["wins"])
-        ties = int(row["ties"])
+    for tid, name, st in load_standings(db, league.id):
+        gp = int(st.games_played) if st else 0
+        wins = int(st.wins) if st else 0
+        ties = int(st.ties) if st else 0
+        pf = to_float(st.points_for) if st else 0.0
+        pa = to_float(st.points_against) if st else 0.0
         win_pct = (wins + 0.5 * ties) / gp if gp > 0 else 0.0
 
         table.append(
             schemas.TableRow(
-                team_id=t.id,
-                team_name=t.name,
+                team_id=tid,
+                team_name=name,
                 wins=wins,
-                losses=int(row["losses"]),
+                losses=int(st.losses) if st else 0,
                 ties=ties,
                 games_played=gp,
                 points_for=pf,
                 points_against=pa,
-                point_diff=diff,
+                point_diff=pf - pa,
                 win_pct=win_pct,
             )
         )
@@ -337,7 +299,8 @@ def get_standings(league_id: int, persist: bool = False, db: Session = Depends(g
 
 
 @route.get("/{league_id}/table", operation_id="standings_table")
-def standings_table(league_id: int, db: Session = Depends(get_db)):
+@etag_cached("standings_table")
+def standings_table(league_id: int, request: Request, db: Session = Depends(get_db)):
     """
     Return a PLAIN LIST of aggregate table rows (not wrapped), i.e.:
     [
@@ -384,42 +347,6 @@ def standings_history(league_id: int, db: Session = Depends(get_db)):
     return history
 
 
-# --- Power Rankings helpers (Pythagorean expectation) ----------------------------
-
-
-def _pf_pa_by_team(db: Session, league_id: int) -> dict[int, dict[str, float]]:
-    out: dict[int, dict[str, float]] = {}
-    matches = (
-        db.query(models.Match)
-        .filter(
-            models.Match.league_id == league_id,
-            models.Match.home_points.isnot(None),
-            models.Match.away_points.isnot(None),
-        )
-        .all()
-    )
-    for m in matches:
-        hp = to_float(m.home_points)
-        ap = to_float(m.away_points)
-        out.setdefault(m.home_team_id, {"pf": 0.0, "pa": 0.0})
-        out.setdefault(m.away_team_id, {"pf": 0.0, "pa": 0.0})
-        out[m.home_team_id]["pf"] += hp
-        out[m.home_team_id]["pa"] += ap
-        out[m.away_team_id]["pf"] += ap
-        out[m.away_team_id]["pa"] += hp
-    return out
-
-
-def _pythag_expectation(pf: float, pa: float, exponent: float = 2.0) -> float:
-    """
-    Classic Pythagorean expectation: pf^x / (pf^x + pa^x).
-    Handles zero gracefully.
-    """
-    if pf <= 0 and pa <= 0:
-        return 0.5
-    return (pf**exponent) / ((pf**exponent) + (pa**exponent))
-
-
 # --- Tiebreakers v1 --------------------------------------------------------------
 
 
@@ -540,112 +467,12 @@ def tiebreakers(
     return out
 
 
-# --- Power Rankings+: SOS, streaks, last-5 --------------------------------------
-
-
-def _scored_matches(db: Session, league_id: int) -> list[models.Match]:
-    return (
-        db.query(models.Match)
-        .filter(
-            models.Match.league_id == league_id,
-            models.Match.home_points.isnot(None),
-            models.Match.away_points.isnot(None),
-        )
-        .order_by(models.Match.id.asc())
-        .all()
-    )
-
-
-def _pf_pa_per_team(db: Session, league_id: int) -> dict[int, dict[str, float]]:
-    # PF/PA across all scored matches (overall totals and games played)
-    out: dict[int, dict[str, float]] = defaultdict(lambda: {"pf": 0.0, "pa": 0.0, "gp": 0})
-    for m in _scored_matches(db, league_id):
-        hp = float(m.home_points or 0.0)
-        ap = float(m.away_points or 0.0)
-        out[m.home_team_id]["pf"] += hp
-        out[m.home_team_id]["pa"] += ap
-        out[m.home_team_id]["gp"] += 1
-        out[m.away_team_id]["pf"] += ap
-        out[m.away_team_id]["pa"] += hp
-        out[m.away_team_id]["gp"] += 1
-    return out
-
-
-def _sos_by_team(db: Session, league_id: int) -> dict[int, float]:
-    """
-    SOS = average of opponents' PF-per-game (season-wide), across games played so far.
-    (Deterministic and schema-free.)
-    """
-    pfpa = _pf_pa_per_team(db, league_id)
-    matches = _scored_matches(db, league_id)
-    # Precompute PF/game for every team
-    opp_pfpg: dict[int, float] = {}
-    for tid, rec in pfpa.items():
-        gp = rec["gp"] or 1
-        opp_pfpg[tid] = rec["pf"] / gp
-
-    sos: dict[int, float] = defaultdict(float)
-    counts: dict[int, int] = defaultdict(int)
-    for m in matches:
-        a, b = m.home_team_id, m.away_team_id
-        sos[a] += opp_pfpg.get(b, 0.0)
-        counts[a] += 1
-        sos[b] += opp_pfpg.get(a, 0.0)
-        counts[b] += 1
-    for tid in list(sos.keys()):
-        c = counts.get(tid, 0)
-        sos[tid] = sos[tid] / c if c > 0 else 0.0
-    return sos
-
-
-def _results_timeline(db: Session, league_id: int) -> dict[int, list[str]]:
-    out: dict[int, list[str]] = defaultdict(list)
-    for m in _scored_matches(db, league_id):
-        hp = to_float(m.home_points)
-        ap = to_float(m.away_points)
-        if hp > ap:
-            out[m.home_team_id].append("W")
-            out[m.away_team_id].append("L")
-        elif ap > hp:
-            out[m.home_team_id].append("L")
-            out[m.away_team_id].append("W")
-        else:
-            out[m.home_team_id].append("T")
-            out[m.away_team_id].append("T")
-    return out
-
-
-def _streak_from(results: list[str]) -> str:
-    """
-    Compute current streak string like 'W3','L2','T1'. Empty => ''.
-    """
-    if not results:
-        return ""
-    last = results[-1]
-    n = 0
-    for r in reversed(results):
-        if r == last:
-            n += 1
-        else:
-            break
-    return f"{last}{n}"
-
-
-def _last5_from(results: list[str]) -> str:
-    """
-    Return 'W-L-T' counts for the last 5 (or fewer) results, e.g., '3-1-1'.
-    """
-    if not results:
-        return "0-0-0"
-    chunk = results[-5:]
-    w = sum(1 for r in chunk if r == "W")
-    losses = sum(1 for r in chunk if r == "L")
-    t = sum(1 for r in chunk if r == "T")
-    return f"{w}-{losses}-{t}"
+# --- Power Rankings+: Pythagorean, SOS, streaks, last-5 ---------------------------
 
 
 @route.get("/{league_id}/power_rankings", operation_id="standings_power_rankings")
-def power_rankings(league_id: int, db: Session = Depends(get_db)):
+@etag_cached("standings_power_rankings")
+def power_rankings(league_id: int, request: Request, db: Session = Depends(get_db)):
     """
     Power Rankings using Pythagorean expectation, augmented with:
       - sos: average opponents' PF per game they have scored so far
@@ -659,31 +486,20 @@ def power_rankings(league_id: int, db: Session = Depends(get_db)):
     if not league:
         raise HTTPException(status_code=404, detail="League not found")
 
-    teams = db.query(models.Team).filter(models.Team.league_id == league_id).all()
-    name_by_id = {t.id: t.name for t in teams}
-
-    pfpa_full = _pf_pa_by_team(db, league_id)
-    sos_map = _sos_by_team(db, league_id)
-    timelines = _results_timeline(db, league_id)
+    la = LeagueAnalytics(db, league_id)
 
     rows = []
-    for tid, tname in name_by_id.items():
-        pf = float(pfpa_full.get(tid, {}).get("pf", 0.0))
-        pa = float(pfpa_full.get(tid, {}).get("pa", 0.0))
-        pr = _pythag_expectation(pf, pa, exponent=2.0)
-        streak = _streak_from(timelines.get(tid, []))
-        last5 = _last5_from(timelines.get(tid, []))
-        sos = float(sos_map.get(tid, 0.0))
+    for tid, tname in la.name_by_id.items():
         rows.append(
             {
                 "team_id": tid,
                 "team_name": tname,
-                "pf": pf,
-                "pa": pa,
-                "pr": pr,
-                "sos": sos,
-                "streak": streak,
-                "last5": last5,
+                "pf": la.pf.get(tid, 0.0),
+                "pa": la.pa.get(tid, 0.0),
+                "pr": la.pythag(tid),
+                "sos": la.sos(tid),
+                "streak": la.streak(tid),
+                "last5": la.last5(tid),
             }
         )
 
@@ -695,7 +511,8 @@ def power_rankings(league_id: int, db: Session = Depends(get_db)):
 
 
 @route.get("/{league_id}/insights", operation_id="standings_insights")
-def standings_insights(league_id: int, db: Session = Depends(get_db)):
+@etag_cached("standings_insights")
+def standings_insights(league_id: int, request: Request, db: Session = Depends(get_db)):
     """
     Read-only league insights that combine multiple analytics:
       - pr: Power Rankings rows + rank (desc by pr)
@@ -724,49 +541,36 @@ def standings_insights(league_id: int, db: Session = Depends(get_db)):
     if not league:
         raise HTTPException(status_code=404, detail="League not found")
 
-    # --- Base team map
-    teams = db.query(models.Team).filter(models.Team.league_id == league_id).all()
-    name_by_id = {t.id: t.name for t in teams}
+    la = LeagueAnalytics(db, league_id)
+    name_by_id = la.name_by_id
 
     # --- Power Rankings rows + PR rank
-    pfpa_full = _pf_pa_by_team(db, league_id)
     pr_rows = []
     for tid, tname in name_by_id.items():
-        pf = float(pfpa_full.get(tid, {}).get("pf", 0.0))
-        pa = float(pfpa_full.get(tid, {}).get("pa", 0.0))
-        pr = _pythag_expectation(pf, pa, exponent=2.0)
-        pr_rows.append({"team_id": tid, "team_name": tname, "pf": pf, "pa": pa, "pr": pr})
+        pr_rows.append(
+            {
+                "team_id": tid,
+                "team_name": tname,
+                "pf": la.pf.get(tid, 0.0),
+                "pa": la.pa.get(tid, 0.0),
+                "pr": la.pythag(tid),
+            }
+        )
     pr_rows.sort(key=lambda r: r["pr"], reverse=True)
     for i, r in enumerate(pr_rows, start=1):
         r["rank_pr"] = i
 
     # --- SOS + rank
-    sos_map = _sos_by_team(db, league_id)
-    sos_rows = [
-        {
-            "team_id": tid,
-            "team_name": name_by_id.get(tid, f"Team {tid}"),
-            "sos": float(sos_map.get(tid, 0.0)),
-        }
-        for tid in name_by_id.keys()
-    ]
+    sos_rows = [{"team_id": tid, "team_name": tname, "sos": la.sos(tid)} for tid, tname in name_by_id.items()]
     sos_rows.sort(key=lambda r: r["sos"], reverse=True)
     for i, r in enumerate(sos_rows, start=1):
         r["rank_sos"] = i
 
     # --- Streaks + last-5
-    timelines = _results_timeline(db, league_id)
-    streak_rows = []
-    for tid, tname in name_by_id.items():
-        res = timelines.get(tid, [])
-        streak_rows.append(
-            {
-                "team_id": tid,
-                "team_name": tname,
-                "streak": _streak_from(res),
-                "last5": _last5_from(res),
-            }
-        )
+    streak_rows = [
+        {"team_id": tid, "team_name": tname, "streak": la.streak(tid), "last5": la.last5(tid)}
+        for tid, tname in name_by_id.items()
+    ]
 
     # --- Highs: best / worst TeamScore weeks
     tscores = db.query(models.TeamScore).filter(models.TeamScore.league_id == league_id).all()
@@ -790,7 +594,7 @@ def standings_insights(league_id: int, db: Session = Depends(get_db)):
         }
 
     # --- Highs: biggest blowout from scored matches
-    matches = _scored_matches(db, league_id)
+    matches = la.matches
     blow = None
     if matches:
 
@@ -836,71 +640,75 @@ def standings_insights(league_id: int, db: Session = Depends(get_db)):
 
 
 @route.get("/{league_id}/elo", operation_id="standings_elo")
-def elo_rankings(league_id: int, k: float = 32.0, db: Session = Depends(get_db)):
+def elo_rankings(league_id: int, k: float = ELO_K, db: Session = Depends(get_db)):
     """
-    Compute Elo ratings from scored matches only (no persistence).
-    - Start everyone at 1500.
-    - Iterate scored matches in chronological order.
-    - Update both teams after each game using classic Elo.
+    Elo ratings from scored matches (everyone starts at 1500, classic Elo per game).
+    - Default K: a read of the persisted team_elo and team_standings rows, which
+      scoring keeps up to date.
+    - Any other K: replayed over the scored matches in chronological order.
     Returns: [{team_id, team_name, elo, wins, losses, ties, gp}], sorted by elo desc.
     """
     league = db.get(models.League, league_id)
     if not league:
         raise HTTPException(status_code=404, detail="League not found")
 
-    teams = db.query(models.Team).filter(models.Team.league_id == league_id).all()
-    name_by_id = {t.id: t.name for t in teams}
-
-    # Start ratings & simple records
-    rating: dict[int, float] = {tid: 1500.0 for tid in name_by_id.keys()}
-    rec: dict[int, dict[str, int]] = {tid: {"wins": 0, "losses": 0, "ties": 0, "gp": 0} for tid in name_by_id.keys()}
-
-    def expected(ra: float, rb: float) -> float:
-        return 1.0 / (1.0 + 10.0 ** ((rb - ra) / 400.0))
-
-    matches = _scored_matches(db, league_id)  # defined above in this file
-    for m in matches:
-        a, b = m.home_team_id, m.away_team_id
-        hp = float(m.home_points or 0.0)
-        ap = float(m.away_points or 0.0)
-
-        # Outcome as scores 1/0/0.5
-        if hp > ap:
-            Sa, Sb = 1.0, 0.0
-            rec[a]["wins"] += 1
-            rec[b]["losses"] += 1
-        elif ap > hp:
-            Sa, Sb = 0.0, 1.0
-            rec[b]["wins"] += 1
-            rec[a]["losses"] += 1
-        else:
-            Sa, Sb = 0.5, 0.5
-            rec[a]["ties"] += 1
-            rec[b]["ties"] += 1
-
-        rec[a]["gp"] += 1
-        rec[b]["gp"] += 1
-
-        Ea = expected(rating[a], rating[b])
-        Eb = expected(rating[b], rating[a])
-
-        rating[a] = rating[a] + k * (Sa - Ea)
-        rating[b] = rating[b] + k * (Sb - Eb)
-
     rows = []
-    for tid, name in name_by_id.items():
-        r = rec[tid]
-        rows.append(
-            {
-                "team_id": tid,
-                "team_name": name,
-                "elo": rating[tid],
-                "wins": r["wins"],
-                "losses": r["losses"],
-                "ties": r["ties"],
-                "gp": r["gp"],
-            }
-        )
+    if k == ELO_K:
+        records = {tid: st for tid, _, st in load_standings(db, league_id)}
+        for tid, name, elo in load_elo(db, league_id):
+            st = records.get(tid)
+            rows.append(
+                {
+                    "team_id": tid,
+                    "team_name": name,
+                    "elo": elo.rating if elo else ELO_START,
+                    "wins": st.wins if st else 0,
+                    "losses": st.losses if st else 0,
+                    "ties": st.ties if st else 0,
+                    "gp": st.games_played if st else 0,
+                }
+            )
+    else:
+        la = LeagueAnalytics(db, league_id, elo_k=k)
+        for tid, name in la.name_by_id.items():
+            r = la.record(tid)
+            rows.append(
+                {
+                    "team_id": tid,
+                    "team_name": name,
+                    "elo": la.elo[tid],
+                    "wins": r["wins"],
+                    "losses": r["losses"],
+                    "ties": r["ties"],
+                    "gp": r["gp"],
+                }
+            )
 
     rows.sort(key=lambda x: x["elo"], reverse=True)
     return rows
+
+
+@route.get("/{league_id}/elo/history", operation_id="standings_elo_history")
+def elo_history(league_id: int, team_id: int | None = None, db: Session = Depends(get_db)):
+    """
+    Persisted rating history (default K): one entry per team per scored match,
+    oldest first. Optional `team_id` narrows it to one team.
+    """
+    league = db.get(models.League, league_id)
+    if not league:
+        raise HTTPException(status_code=404, detail="League not found")
+
+    load_elo(db, league_id)  # backfills leagues scored before ratings were persisted
+    q = db.query(models.EloHistory).filter(models.EloHistory.league_id == league_id)
+    if team_id is not None:
+        q = q.filter(models.EloHistory.team_id == team_id)
+    return [
+        {
+            "team_id": h.team_id,
+            "match_id": h.match_id,
+            "week": h.week,
+            "rating_before": h.rating_before,
+            "rating_after": h.rating_after,
+        }
+        for h in q.order_by(models.EloHistory.match_id.asc(), models.EloHistory.team_id.asc())
+    ]
@@ -10,6 +10,8 @@ from sqlalchemy.orm import Session
 
 from .. import models
 from ..db import get_db
+from ..services import league_version
+from ..services.rostered import rostered
 
 # NOTE: no prefix so we can define both /teams/* and /leagues/{league_id}/teams
 router = APIRouter(tags=["teams"])
@@ -109,6 +111,7 @@ def create_team_for_league(league_id: int, body: TeamCreate, db: Session = Depen
 
     team = models.Team(league_id=league_id, name=body.name)
     db.add(team)
+    league_version.touch(db, league_id)
     db.commit()
     db.refresh(team)
     return team
@@ -137,6 +140,7 @@ def create_team(body: TeamCreateFlat, db: Session = Depends(get_db)):
 
     team = models.Team(league_id=body.league_id, name=body.name)
     db.add(team)
+    league_version.touch(db, body.league_id)
     db.commit()
     db.refresh(team)
     return team
@@ -196,6 +200,8 @@ def upsert_active_slot(team_id: int, body: RosterActivateRequest, db: Session =
 
     bucket = _normalize_bucket(body.bucket)
     symbol = body.symbol.strip().upper()
+    league_version.touch(db, team.league_id)
+    rostered.invalidate(db, team.league_id)
 
     existing = (
         db.query(models.RosterSlot)
@@ -237,6 +243,8 @@ def remove_active_slot(team_id: int, symbol: str, db: Session = Depends(get_db))
     if not row:
         raise HTTPException(status_code=404, detail="Active slot (symbol) not found")
     db.delete(row)
+    league_version.touch(db, team.league_id)
+    rostered.invalidate(db, team.league_id)
     db.commit()
     return
 
@@ -257,6 +265,8 @@ def clear_active_slots(team_id: int, bucket: Optional[str] = Query(default=None)
         q = q.filter(models.RosterSlot.bucket == b)
 
     removed = q.delete(synchronize_session=False)
+    league_version.touch(db, team.league_id)
+    rostered.invalidate(db, team.league_id)
     db.commit()
     return {"removed": removed, "bucket": bucket}
 
@@ -344,6 +354,7 @@ def debug_seed_active(team_id: int, body: DebugSeedRequest, db: Session = Depend
             models.RosterSlot.team_id == team.id,
             models.RosterSlot.is_active == True,  # noqa: E712
         ).delete(synchronize_session=False)
+        rostered.invalidate(db, team.league_id)
         db.commit()
 
     for bucket, n in (body.counts or {}).items():
@@ -353,6 +364,8 @@ def debug_seed_active(team_id: int, body: DebugSeedRequest, db: Session = Depend
             sym = f"DBG_{b[:3]}_{uuid.uuid4().hex[:6].upper()}"
             row = models.RosterSlot(team_id=team.id, symbol=sym, is_active=True, bucket=b)
             db.add(row)
+    league_version.touch(db, team.league_id)
+    rostered.invalidate(db, team.league_id)
     db.commit()
 
     # summarize now
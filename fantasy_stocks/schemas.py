@@ -4,7 +4,7 @@ from __future__ import annotations
 from datetime import date
 from enum import Enum
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # -----------------------
@@ -161,6 +161,13 @@ class TableRow(BaseModel):
     win_pct: float
 
 
+class CloseWeekAllIn(BaseModel):
+    week: str | None = None  # defaults to the current ISO week
+    league_ids: list[int] | None = None  # None = every league with matches that week
+    workers: int = Field(4, ge=1, le=32)
+    max_attempts: int = Field(3, ge=1, le=10)
+
+
 # -----------------------
 # Prices (live-data scaffolding)
 # -----------------------
@@ -176,6 +183,15 @@ class PriceUpsertResult(BaseModel):
     updated: int
 
 
+class PriceCacheStats(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    max_bytes: int
+
+
 # -----------------------
 # (Optional) Users (kept minimal to satisfy imports)
 # -----------------------
@@ -0,0 +1,273 @@
+# fantasy_stocks/services/catalog.py
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from .. import models
+from . import data_version
+
+__all__ = ["DESC_BY_DEFAULT", "SORT_KEYS", "Catalog", "CatalogSnapshot", "catalog", "name_tokens"]
+
+SORT_KEYS = ("symbol", "market_cap", "adp", "proj_points")
+# Default direction per sort key, same as /players/search.
+DESC_BY_DEFAULT = frozenset({"market_cap", "proj_points"})
+
+_NAN = float("nan")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def name_tokens(text: str | None) -> list[str]:
+    """Lower-cased alphanumeric words of a name."""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def _opt(x: float) -> float | None:
+    return None if math.isnan(x) else x
+
+
+def _view_key(col: array, descending: bool):
+    """Sort key over row ids: present values first, in the given direction."""
+    sign = -1.0 if descending else 1.0
+
+    def key(i: int) -> tuple[bool, float]:
+        v = col[i]
+        return (True, 0.0) if math.isnan(v) else (False, sign * v)
+
+    return key
+
+
+def _size_of(values: Iterable[Any]) -> int:
+    return sum(sys.getsizeof(v) for v in values)
+
+
+class CatalogSnapshot:
+    """
+    Immutable in-memory copy of the securities catalog.
+
+    Columns are parallel per-row lists/arrays (row = position in symbol order;
+    missing numbers are NaN). Prefix lookups run over two sorted string arrays:
+    the symbols themselves, and every distinct lower-cased name word with an
+    array of the rows that contain it. A bisect finds the first key with the
+    prefix and the matches are the contiguous run after it, which answers the
+    same question as a prefix trie with a handful of flat containers instead
+    of one object per trie node. `views` holds the rows pre-sorted for each
+    sort key in its default direction (missing values last, then symbol).
+    """
+
+    __slots__ = (
+        "adp",
+        "build_ms",
+        "built_at",
+        "buckets",
+        "generation",
+        "is_etf",
+        "market_cap",
+        "names",
+        "nbytes",
+        "positions",
+        "postings",
+        "proj_points",
+        "row_by_symbol",
+        "sectors",
+        "symbols",
+        "tokens",
+        "views",
+    )
+
+    def __init__(self, rows: Iterable[tuple], generation: int = 0) -> None:
+        started = time.perf_counter()
+        self.generation = generation  # shared catalog version the rows were read at
+        self.symbols: list[str] = []
+        self.names: list[str | None] = []
+        self.is_etf: list[bool | None] = []
+        self.sectors: list[str | None] = []
+        self.buckets: list[str | None] = []
+        self.market_cap = array("d")
+        self.adp = array("d")
+        self.proj_points = array("d")
+        for symbol, name, is_etf, sector, bucket, market_cap, adp, proj_points in sorted(rows, key=lambda r: r[0]):
+            self.symbols.append(symbol)
+            self.names.append(name)
+            self.is_etf.append(is_etf)
+            self.sectors.append(sector)
+            self.buckets.append(bucket)
+            self.market_cap.append(_NAN if market_cap is None else float(market_cap))
+            self.adp.append(_NAN if adp is None else float(adp))
+            self.proj_points.append(_NAN if proj_points is None else float(proj_points))
+        self.row_by_symbol = {s: i for i, s in enumerate(self.symbols)}
+
+        by_token: dict[str, array] = {}
+        for i, name in enumerate(self.names):
+            for tok in dict.fromkeys(name_tokens(name)):
+                by_token.setdefault(tok, array("i")).append(i)
+        self.tokens: list[str] = sorted(by_token)
+        self.postings: list[array] = [by_token[t] for t in self.tokens]
+
+        n = len(self.symbols)
+        self.views: dict[str, array] = {"symbol": array("i", range(n))}
+        for key in SORT_KEYS[1:]:
+            # rows are already in symbol order and sorted() is stable
+            self.views[key] = array("i", sorted(range(n), key=_view_key(getattr(self, key), key in DESC_BY_DEFAULT)))
+        self.positions: dict[str, array] = {}
+        for key, view in self.views.items():
+            pos = array("i", bytes(4 * n))
+            for p, i in enumerate(view):
+                pos[i] = p
+            self.positions[key] = pos
+
+        self.built_at = datetime.utcnow()
+        self.build_ms = (time.perf_counter() - started) * 1000.0
+        self.nbytes = self._footprint()
+
+    def _footprint(self) -> int:
+        """Approximate bytes held: containers, their strings and the array buffers."""
+        arrays = [self.market_cap, self.adp, self.proj_points, *self.postings, *self.views.values()]
+        arrays.extend(self.positions.values())
+        lists = (self.symbols, self.names, self.is_etf, self.sectors, self.buckets, self.tokens, self.postings)
+        total = sum(a.itemsize * len(a) + 64 for a in arrays)
+        total += sum(sys.getsizeof(c) for c in lists) + sys.getsizeof(self.row_by_symbol)
+        total += _size_of(s for s in self.symbols) + _size_of(s for s in self.tokens)
+        total += _size_of(s for col in (self.names, self.sectors, self.buckets) for s in col if s is not None)
+        return total
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def row(self, i: int) -> dict[str, Any]:
+        return {
+            "symbol": self.symbols[i],
+            "name": self.names[i],
+            "is_etf": self.is_etf[i],
+            "market_cap": _opt(self.market_cap[i]),
+            "sector": self.sectors[i],
+            "primary_bucket": self.buckets[i],
+            "adp": _opt(self.adp[i]),
+            "proj_points": _opt(self.proj_points[i]),
+        }
+
+    def _symbol_prefix(self, prefix: str) -> Iterable[int]:
+        symbols = self.symbols
+        i = bisect_left(symbols, prefix)
+        while i < len(symbols) and symbols[i].startswith(prefix):
+            yield i
+            i += 1
+
+    def _token_prefix(self, prefix: str) -> set[int]:
+        tokens = self.tokens
+        out: set[int] = set()
+        i = bisect_left(tokens, prefix)
+        while i < len(tokens) and tokens[i].startswith(prefix):
+            out.update(self.postings[i])
+            i += 1
+        return out
+
+    def complete(self, q: str, *, limit: int = 10, sort: str = "adp") -> list[int]:
+        """
+        Rows whose symbol starts with `q` or whose name has words starting with
+        every word of `q`. Ranked exact symbol, symbol prefix, name prefix,
+        other name words; ties follow the `sort` view.
+        """
+        pos = self.positions[sort]
+        qn = q.strip().lower()
+        if not qn:
+            return list(self.views[sort][:limit])
+
+        ranks: dict[int, int] = {}
+        if " " not in qn:
+            qs = qn.upper()
+            for i in self._symbol_prefix(qs):
+                ranks[i] = 0 if self.symbols[i] == qs else 1
+        words = name_tokens(qn)
+        if words:
+            hits = self._token_prefix(words[0])
+            for w in words[1:]:
+                hits &= self._token_prefix(w)
+            for i in hits:
+                if i not in ranks:
+                    name = self.names[i] or ""
+                    ranks[i] = 2 if name.lower().startswith(qn) else 3
+        return heapq.nsmallest(limit, ranks, key=lambda i: (ranks[i], pos[i]))
+
+
+def _engine_of(db: Session) -> Engine:
+    bind = db.get_bind()
+    return bind.engine if isinstance(bind, Connection) else bind
+
+
+CATALOG_VERSION_KEY = "catalog"
+
+
+class Catalog:
+    """
+    Process-level holder of one CatalogSnapshot per database engine.
+
+    Readers take the current snapshot reference and never see a partial
+    build: `rebuild` loads the catalog in one query, builds a fresh snapshot
+    outside the lock and swaps it in (an older, slower build never replaces a
+    newer one). Writers of `securities` call `touch` inside their transaction,
+    which advances the shared catalog version (a `data_versions` row), and may
+    `rebuild` after they commit. `get` compares its snapshot with the shared
+    version (one primary-key read), so a worker rebuilds after an ingest
+    handled by any other worker.
+    """
+
+    def __init__(self) -> None:
+        self._snapshots: dict[Engine, CatalogSnapshot] = {}
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+
+    def touch(self, db: Session) -> None:
+        """Mark the catalog as changed by the session's current transaction."""
+        data_version.advance(db, CATALOG_VERSION_KEY)
+
+    def get(self, db: Session) -> CatalogSnapshot:
+        version = data_version.read(db, CATALOG_VERSION_KEY)
+        with self._lock:
+            snap = self._snapshots.get(_engine_of(db))
+        return snap if snap is not None and snap.generation == version else self.rebuild(db, version)
+
+    def rebuild(self, db: Session, version: int | None = None) -> CatalogSnapshot:
+        if version is None:
+            version = data_version.read(db, CATALOG_VERSION_KEY)  # before the rows: they are at least this new
+        S = models.Security
+        rows = db.query(
+            S.symbol, S.name, S.is_etf, S.sector, S.primary_bucket, S.market_cap, S.adp, S.proj_points
+        ).all()
+        snap = CatalogSnapshot(rows, version)
+
+        engine = _engine_of(db)
+        with self._lock:
+            current = self._snapshots.get(engine)
+            if current is None or current.generation < version:
+                self._snapshots[engine] = snap
+                self.rebuilds += 1
+            else:
+                snap = current
+        return snap
+
+    def stats(self, db: Session) -> dict[str, Any]:
+        snap = self.get(db)
+        return {
+            "rows": len(snap),
+            "tokens": len(snap.tokens),
+            "build_ms": round(snap.build_ms, 3),
+            "bytes": snap.nbytes,
+            "built_at": snap.built_at,
+            "rebuilds": self.rebuilds,
+        }
+
+
+catalog = Catalog()
@@ -0,0 +1,38 @@
+# fantasy_stocks/services/data_version.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .. import models
+
+__all__ = ["advance", "read"]
+
+_T = models.DataVersion.__table__
+
+
+def read(db: Session, key: str) -> int:
+    """Shared version of `key` as committed by any worker; 0 until its first change."""
+    return db.execute(select(_T.c.version).where(_T.c.key == key)).scalar() or 0
+
+
+def advance(db: Session, key: str) -> int:
+    """
+    Increment `key` inside the session's current transaction and return the
+    new value. Other workers see it once that transaction commits.
+    """
+    now = datetime.utcnow()
+    name = db.get_bind().dialect.name
+    dialect_insert = sqlite_insert if name == "sqlite" else pg_insert if name == "postgresql" else None
+    if dialect_insert is not None:
+        stmt = dialect_insert(_T).values(key=key, version=1, updated_at=now)
+        db.execute(
+            stmt.on_conflict_do_update(index_elements=[_T.c.key], set_={"version": _T.c.version + 1, "updated_at": now})
+        )
+    elif not db.execute(update(_T).where(_T.c.key == key).values(version=_T.c.version + 1, updated_at=now)).rowcount:
+        db.execute(_T.insert().values(key=key, version=1, updated_at=now))
+    return read(db, key)
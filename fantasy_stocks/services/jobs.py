@@ -0,0 +1,187 @@
+# fantasy_stocks/services/jobs.py
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, TypedDict
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from .. import models
+
+logger = logging.getLogger("fantasy_stocks")
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+
+# progress(done, total, message): record how far a job has got; commits the job's session
+ProgressFn = Callable[[int, int, str | None], None]
+# fn(db, progress) -> JSON-serializable result; runs on a worker thread with its own session
+JobFn = Callable[[Session, ProgressFn], Any]
+
+
+class JobOut(TypedDict):
+    id: str
+    kind: str
+    league_id: int | None
+    status: str
+    progress: float
+    message: str | None
+    result: Any
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+
+def job_out(job: models.Job) -> JobOut:
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "league_id": job.league_id,
+        "status": job.status,
+        "progress": job.progress,
+        "message": job.message,
+        "result": None if job.result is None else json.loads(job.result),
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def _key_hash(kind: str, league_id: int | None, idempotency_key: str) -> str:
+    return hashlib.sha256(f"{kind}::{league_id}::{idempotency_key}".encode()).hexdigest()
+
+
+class JobQueue:
+    """
+    In-process job runner backed by the `jobs` table.
+
+    `submit` persists a queued Job and hands it to a bounded thread pool; the
+    worker opens its own session on the submitting request's engine, marks the
+    job running, reports progress and stores the JSON result (or the error).
+    Jobs submitted with an Idempotency-Key are memoized: the same (kind, league,
+    key) returns the existing job instead of starting another one.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS) -> None:
+        self.workers = workers
+        self._pool: ThreadPoolExecutor | None = None
+        self._futures: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="jobs")
+            return self._pool
+
+    def submit(
+        self,
+        db: Session,
+        kind: str,
+        fn: JobFn,
+        *,
+        league_id: int | None = None,
+        idempotency_key: str | None = None,
+    ) -> models.Job:
+        key_hash = _key_hash(kind, league_id, idempotency_key) if idempotency_key else None
+        if key_hash is not None:
+            existing = db.query(models.Job).filter(models.Job.idempotency_key == key_hash).first()
+            if existing is not None:
+                return existing
+
+        job = models.Job(id=uuid.uuid4().hex, kind=kind, league_id=league_id, status="queued", progress=0.0)
+        job.idempotency_key = key_hash
+        db.add(job)
+        try:
+            db.commit()
+        except IntegrityError:  # same key submitted concurrently; the other request won
+            db.rollback()
+            return db.query(models.Job).filter(models.Job.idempotency_key == key_hash).one()
+
+        future = self._executor().submit(self._run, job.id, db.get_bind(), fn)
+        with self._lock:
+            self._futures[job.id] = future
+        future.add_done_callback(lambda _f, job_id=job.id: self._forget(job_id))
+        return job
+
+    def get(self, db: Session, job_id: str) -> models.Job | None:
+        """The job's current row; refreshed, since workers commit on their own sessions."""
+        job = db.get(models.Job, job_id)
+        if job is not None:
+            db.refresh(job)
+        return job
+
+    def fail_interrupted(self, engine: Engine) -> int:
+        """
+        Mark jobs still queued or running as failed. Jobs only run inside the
+        process that submitted them, so at startup those rows belong to a
+        process that is gone and would otherwise stay pending forever.
+        """
+        with engine.begin() as conn:
+            return conn.execute(
+                update(models.Job)
+                .where(models.Job.status.in_(("queued", "running")))
+                .values(status="failed", error="interrupted: the server restarted", finished_at=datetime.utcnow())
+            ).rowcount
+
+    def _forget(self, job_id: str) -> None:
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+    def wait(self, job_id: str, timeout: float | None = None) -> None:
+        """Block until a job submitted by this process has finished (no-op if it already has)."""
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout=timeout)
+
+    def _run(self, job_id: str, engine: Engine, fn: JobFn) -> None:
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        with factory() as db:
+            job = db.get(models.Job, job_id)
+            if job is None:
+                return
+            job.status = "running"
+            job.started_at = datetime.utcnow()
+            db.commit()
+
+            def progress(done: int, total: int, message: str | None = None) -> None:
+                job.progress = min(1.0, done / total) if total else 1.0
+                job.message = message
+                db.commit()
+
+            try:
+                result = fn(db, progress)
+            except Exception as exc:
+                logger.exception("job %s (%s) failed", job_id, job.kind)
+                db.rollback()
+                job.status = "failed"
+                job.error = f"{type(exc).__name__}: {exc}"
+            else:
+                job.status = "succeeded"
+                job.progress = 1.0
+                job.result = json.dumps(jsonable_encoder(result), separators=(",", ":"))
+            job.finished_at = datetime.utcnow()
+            db.commit()
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+job_queue = JobQueue()
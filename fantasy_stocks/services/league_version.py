@@ -0,0 +1,110 @@
+# fantasy_stocks/services/league_version.py
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from . import data_version
+
+__all__ = ["Subscription", "current", "subscribe", "touch"]
+
+logger = logging.getLogger("fantasy_stocks")
+
+_SESSION_KEY = "league_version_touched"
+_COMMITTED_KEY = "league_version_committed"
+
+# (league_id, new_version); called on the committing thread, must not block.
+Listener = Callable[[int, int], None]
+
+_listeners: dict[int | None, list[Listener]] = {}  # None = every league
+_lock = threading.Lock()
+
+
+class Subscription:
+    """Handle returned by `subscribe`; `close()` (or leaving the `with` block) unsubscribes."""
+
+    def __init__(self, league_id: int | None, listener: Listener) -> None:
+        self.league_id = league_id
+        self.listener = listener
+
+    def close(self) -> None:
+        with _lock:
+            listeners = _listeners.get(self.league_id, [])
+            if self.listener in listeners:
+                listeners.remove(self.listener)
+            if not listeners:
+                _listeners.pop(self.league_id, None)
+
+    def __enter__(self) -> Subscription:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _key(league_id: int) -> str:
+    return f"league:{league_id}"
+
+
+def current(db: Session, league_id: int) -> int:
+    """
+    Data version of a league, shared by every worker (a `data_versions` row);
+    0 until its first change. One primary-key read.
+    """
+    return data_version.read(db, _key(league_id))
+
+
+def subscribe(league_id: int | None, listener: Listener) -> Subscription:
+    """
+    Call `listener(league_id, version)` after every commit in THIS process
+    that changed `league_id` (None: any league). Commits made by other
+    workers are not delivered; readers that must see them compare `current`.
+    """
+    with _lock:
+        _listeners.setdefault(league_id, []).append(listener)
+    return Subscription(league_id, listener)
+
+
+def _notify(league_id: int, version: int) -> None:
+    with _lock:
+        listeners = [*_listeners.get(league_id, ()), *_listeners.get(None, ())]
+    for listener in listeners:
+        try:
+            listener(league_id, version)
+        except Exception:
+            logger.exception("league_version listener failed for league %s", league_id)
+
+
+def touch(db: Session, league_id: int) -> None:
+    """
+    Mark a league as changed by the session's current transaction. Its
+    shared version is advanced inside that transaction, just before it
+    commits, so the new version and the new data become visible to other
+    workers together; a rollback discards both.
+    """
+    db.info.setdefault(_SESSION_KEY, set()).add(league_id)
+
+
+@event.listens_for(Session, "before_commit")
+def _advance_touched(session: Session) -> None:
+    touched = session.info.pop(_SESSION_KEY, None)
+    if touched:
+        committed = session.info.setdefault(_COMMITTED_KEY, {})
+        for league_id in sorted(touched):  # fixed order: concurrent writers lock rows alike
+            committed[league_id] = data_version.advance(session, _key(league_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_committed(session: Session) -> None:
+    for league_id, version in session.info.pop(_COMMITTED_KEY, {}).items():
+        _notify(league_id, version)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_touched(session: Session) -> None:
+    session.info.pop(_SESSION_KEY, None)
+    session.info.pop(_COMMITTED_KEY, None)
@@ -0,0 +1,178 @@
+# fantasy_stocks/services/live_scores.py
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..logic.scoring import starters_by_team
+from . import league_version, pricing
+
+LIVE_SCORES_MAX_WEEKS = int(os.getenv("LIVE_SCORES_MAX_WEEKS", "256"))
+
+
+class LiveWeek:
+    """
+    Running LIVE totals for one league/week: each starter symbol's week-to-date
+    return and each team's sum over its starters. New prices only touch the
+    teams holding the repriced symbols.
+    """
+
+    __slots__ = (
+        "league_id",
+        "week",
+        "version",
+        "starters",
+        "returns",
+        "holders",
+        "totals",
+        "price_updates",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        league_id: int,
+        week: str,
+        starters: dict[int, list[str]],
+        returns: dict[str, float],
+        version: int = 0,
+    ) -> None:
+        self.league_id = league_id
+        self.week = week
+        self.version = version  # shared league version the starters and returns reflect
+        self.starters = starters
+        self.returns = returns
+        self.holders: dict[str, set[int]] = {}
+        for tid, syms in starters.items():
+            for sym in syms:
+                self.holders.setdefault(sym, set()).add(tid)
+        self.totals = {tid: sum(returns.get(s, 0.0) for s in syms) for tid, syms in starters.items()}
+        self.price_updates = 0
+        self.updated_at = datetime.utcnow()
+
+    def apply(self, symbol: str, return_pct: float) -> bool:
+        """Set one symbol's new week return; returns False when no starter holds it or nothing changed."""
+        tids = self.holders.get(symbol)
+        if not tids or self.returns.get(symbol) == return_pct:
+            return False
+        self.returns[symbol] = return_pct
+        for tid in tids:
+            # re-summing a handful of starters keeps totals exact (no float drift from +/- deltas)
+            self.totals[tid] = sum(self.returns.get(s, 0.0) for s in self.starters[tid])
+        self.price_updates += 1
+        self.updated_at = datetime.utcnow()
+        return True
+
+
+class LiveScores:
+    """
+    Process-wide LRU of LiveWeek accumulators keyed by (league, week).
+
+    The price ingest path calls `apply_returns` with the weekly-return cells it
+    just rewrote, so intraday totals move without re-reading the week's prices.
+    Reads re-check the league's active starters (one query) and only fetch
+    returns for symbols the accumulator has not seen yet.
+
+    Each accumulator is tagged with the shared league version (one primary-key
+    read per call). A price ingest advances that version for every league
+    rostering a repriced symbol, so when another worker ingested, the version
+    no longer matches and the week is rebuilt from the stored returns. Commits
+    made by this process carry the tag forward instead, since `apply_returns`
+    has already folded their prices in.
+    """
+
+    def __init__(self, max_weeks: int = LIVE_SCORES_MAX_WEEKS) -> None:
+        self.max_weeks = max_weeks
+        self._weeks: OrderedDict[tuple[int, str], LiveWeek] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0  # bumped by apply_returns; guards builds racing an ingest
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, db: Session, league: models.League, week: str, team_ids: list[int]) -> LiveWeek:
+        # version first: the starters and returns read after it are at least that new
+        version = league_version.current(db, league.id)
+        starters = starters_by_team(db, set(team_ids), starters_limit=league.starters)
+        key = (league.id, week)
+        with self._lock:
+            current = self._weeks.get(key)
+            generation = self._generation
+            if current is not None and current.version == version and current.starters == starters:
+                self._weeks.move_to_end(key)
+                self.hits += 1
+                return current
+
+        # A lineup change at the same version reuses the returns already tracked;
+        # a newer version (another worker's ingest) re-reads them all.
+        wanted = {s for syms in starters.values() for s in syms}
+        if current is not None and current.version == version:
+            known = {s: r for s, r in current.returns.items() if s in wanted}
+        else:
+            known = {}
+        fresh = pricing.get_week_returns(db, wanted - known.keys(), week)
+        built = LiveWeek(league.id, week, starters, {**known, **fresh}, version)
+
+        with self._lock:
+            self.builds += 1
+            stored = self._weeks.get(key)
+            if self._generation == generation and (stored is None or stored.version <= version):
+                self._weeks[key] = built
+                self._weeks.move_to_end(key)
+                while len(self._weeks) > self.max_weeks:
+                    self._weeks.popitem(last=False)
+            # else: prices landed while we were reading; serve this result, rebuild next time
+        return built
+
+    def apply_returns(self, returns: dict[tuple[str, str], float]) -> int:
+        """Apply freshly written (symbol, iso_week) -> return_pct cells; returns how many accumulators changed."""
+        if not returns:
+            return 0
+        by_week: dict[str, dict[str, float]] = {}
+        for (sym, week), pct in returns.items():
+            by_week.setdefault(week, {})[sym] = pct
+
+        changed = 0
+        with self._lock:
+            self._generation += 1
+            for (_, week), lw in self._weeks.items():
+                cells = by_week.get(week)
+                if not cells:
+                    continue
+                hit = False
+                for sym in cells.keys() & lw.holders.keys():
+                    hit = lw.apply(sym, cells[sym]) or hit
+                changed += hit
+        return changed
+
+    def _carry_forward(self, league_id: int, version: int) -> None:
+        """
+        League listener: this process committed `version`. Accumulators one
+        version behind already hold its changes (prices via `apply_returns`,
+        lineups are re-checked on read) and take the new tag; any other gap
+        means another worker wrote in between, so those weeks are dropped.
+        """
+        with self._lock:
+            for key in [k for k in self._weeks if k[0] == league_id]:
+                lw = self._weeks[key]
+                if lw.version == version - 1:
+                    lw.version = version
+                elif lw.version < version:
+                    del self._weeks[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._weeks.clear()
+            self._generation += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"weeks": len(self._weeks), "hits": self.hits, "builds": self.builds}
+
+
+live_scores = LiveScores()
+league_version.subscribe(None, live_scores._carry_forward)
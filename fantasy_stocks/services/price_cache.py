@@ -0,0 +1,185 @@
+# fantasy_stocks/services/price_cache.py
+from __future__ import annotations
+
+import math
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Iterable
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .. import models
+
+__all__ = ["PRICE_CACHE_MAX_BYTES", "PriceCache", "PriceSeries", "price_cache"]
+
+# Upper bound on the array payload held in memory (all symbols together).
+PRICE_CACHE_MAX_BYTES = int(os.getenv("PRICE_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+_NAN = float("nan")
+# Bookkeeping charged per entry so symbols without prices still count toward the bound.
+_ENTRY_OVERHEAD = 64
+
+
+def _opt(x: float) -> float | None:
+    return None if math.isnan(x) else x
+
+
+class PriceSeries:
+    """
+    Daily bars of one symbol as parallel arrays sorted by date.
+    Dates are proleptic ordinals; a missing open/close is stored as NaN.
+    """
+
+    __slots__ = ("closes", "dates", "opens")
+
+    def __init__(self) -> None:
+        self.dates = array("l")
+        self.opens = array("d")
+        self.closes = array("d")
+
+    def append(self, d: date, open_: float | None, close_: float | None) -> None:
+        self.dates.append(d.toordinal())
+        self.opens.append(_NAN if open_ is None else float(open_))
+        self.closes.append(_NAN if close_ is None else float(close_))
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def nbytes(self) -> int:
+        return _ENTRY_OVERHEAD + sum(a.itemsize * len(a) for a in (self.dates, self.opens, self.closes))
+
+    def week_ends(self, start_d: date, end_d: date) -> tuple[date, float | None, date, float | None] | None:
+        """
+        (first_date, first_open, last_date, last_close) inside [start_d, end_d], or None.
+        Same fallbacks as the SQL path: open falls back to close and vice versa.
+        """
+        i = bisect_left(self.dates, start_d.toordinal())
+        j = bisect_right(self.dates, end_d.toordinal()) - 1
+        if i > j:
+            return None
+        first_open = _opt(self.opens[i])
+        if first_open is None:
+            first_open = _opt(self.closes[i])
+        last_close = _opt(self.closes[j])
+        if last_close is None:
+            last_close = _opt(self.opens[j])
+        return date.fromordinal(self.dates[i]), first_open, date.fromordinal(self.dates[j]), last_close
+
+
+# (symbol, first ordinal, last ordinal): the bars of one symbol inside one date window
+_Key = tuple[str, int, int]
+
+
+class PriceCache:
+    """
+    Process-level LRU of PriceSeries keyed by (symbol, date window), bounded
+    by array bytes. Only the requested window is ever loaded, never a
+    symbol's whole history.
+
+    Misses are loaded in one query per call. The ingest endpoints call
+    `invalidate` after commit; a load that raced with an invalidation is
+    returned to its caller but not stored.
+    """
+
+    def __init__(self, max_bytes: int = PRICE_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[_Key, PriceSeries] = OrderedDict()
+        self._bytes = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, wanted: set[str], start_d: date, end_d: date) -> dict[str, PriceSeries]:
+        out: dict[str, PriceSeries] = {}
+        lo, hi = start_d.toordinal(), end_d.toordinal()
+        for sym in wanted:
+            series = self._entries.get((sym, lo, hi))
+            if series is not None:
+                self._entries.move_to_end((sym, lo, hi))
+                out[sym] = series
+        self.hits += len(out)
+        return out
+
+    def peek_many(self, symbols: Iterable[str], start_d: date, end_d: date) -> dict[str, PriceSeries]:
+        """Resident series of the window only; never touches the database."""
+        with self._lock:
+            return self._lookup(set(symbols), start_d, end_d)
+
+    def get_many(self, db: Session, symbols: Iterable[str], start_d: date, end_d: date) -> dict[str, PriceSeries]:
+        """Bars in [start_d, end_d] for every requested symbol (empty series if it has none)."""
+        wanted = set(symbols)
+        with self._lock:
+            out = self._lookup(wanted, start_d, end_d)
+            self.misses += len(wanted) - len(out)
+            generation = self._generation
+
+        missing = wanted - out.keys()
+        if not missing:
+            return out
+
+        loaded = {sym: PriceSeries() for sym in missing}
+        P = models.Price
+        rows = db.execute(
+            select(P.symbol, P.date, P.open, P.close)
+            .where(P.symbol.in_(missing), P.date >= start_d, P.date <= end_d)
+            .order_by(P.symbol, P.date)
+        )
+        for sym, d, open_, close_ in rows:
+            loaded[sym].append(d, open_, close_)
+        out.update(loaded)
+
+        with self._lock:
+            if generation == self._generation:
+                lo, hi = start_d.toordinal(), end_d.toordinal()
+                for sym, series in loaded.items():
+                    self._store((sym, lo, hi), series)
+        return out
+
+    def _store(self, key: _Key, series: PriceSeries) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.nbytes
+        if series.nbytes > self.max_bytes:
+            return
+        self._entries[key] = series
+        self._bytes += series.nbytes
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def invalidate(self, symbols: Iterable[str]) -> None:
+        """Drop every cached window of `symbols`."""
+        gone = set(symbols)
+        with self._lock:
+            self._generation += 1
+            for key in [k for k in self._entries if k[0] in gone]:
+                self._bytes -= self._entries.pop(key).nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+price_cache = PriceCache()
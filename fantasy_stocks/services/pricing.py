@@ -1,45 +1,149 @@
 # fantasy_stocks/services/pricing.py
 from __future__ import annotations
 
+from collections.abc import Iterable
+from datetime import date, datetime
+from typing import NamedTuple
+
+from sqlalchemy import func, or_, select
 from sqlalchemy.orm import Session
 
 from .. import models
-from .periods import iso_week_bounds  # fixed: import directly
+from .periods import iso_week_bounds, iso_week_label  # fixed: import directly
+from .price_cache import PriceSeries, price_cache
 
-__all__ = ["get_week_return_pct", "weekly_change"]
+__all__ = ["get_week_return_pct", "get_week_returns", "refresh_weekly_returns", "weekly_change"]
 
 
-def get_week_return_pct(db: Session, symbol: str, iso_week: str) -> float:
+class _WeekEnds(NamedTuple):
+    first_date: date
+    first_open: float | None
+    last_date: date
+    last_close: float | None
+
+
+def _return_pct(first_open: float | None, last_close: float | None) -> float:
+    if first_open is None or first_open == 0 or last_close is None:
+        return 0.0
+    return float((last_close - first_open) / first_open * 100.0)
+
+
+def _week_ends_from_prices(db: Session, symbols: set[str], iso_week: str) -> dict[str, _WeekEnds]:
     """
-    Compute % return for `symbol` across the given ISO week:
-      ((last_close - first_open) / first_open) * 100
+    First open / last close per symbol inside the week, from raw Price rows.
+    One grouped query: MIN/MAX(date) per symbol, then only those (at most two)
+    rows are joined back. Symbols without prices in the week are absent.
     """
-    start_d, end_d = iso_week_bounds(iso_week)
+    if not symbols:
+        return {}
 
-    rows: list[models.Price] = (
-        db.query(models.Price)
-        .filter(
-            models.Price.symbol == symbol,
-            models.Price.date >= start_d,
-            models.Price.date <= end_d,
-        )
-        .order_by(models.Price.date.asc())
-        .all()
+    start_d, end_d = iso_week_bounds(iso_week)
+    P = models.Price
+    bounds = (
+        select(P.symbol.label("symbol"), func.min(P.date).label("d0"), func.max(P.date).label("d1"))
+        .where(P.symbol.in_(symbols), P.date >= start_d, P.date <= end_d)
+        .group_by(P.symbol)
+        .subquery()
     )
+    rows = db.execute(
+        select(P.symbol, P.date, P.open, P.close, bounds.c.d0, bounds.c.d1).join(
+            bounds, (P.symbol == bounds.c.symbol) & or_(P.date == bounds.c.d0, P.date == bounds.c.d1)
+        )
+    ).all()
 
-    if not rows:
-        return 0.0
+    first: dict[str, float | None] = {}
+    last: dict[str, float | None] = {}
+    dates: dict[str, tuple[date, date]] = {}
+    for sym, d, open_, close_, d0, d1 in rows:
+        dates[sym] = (d0, d1)
+        if d == d0:
+            first[sym] = open_ if open_ is not None else close_
+        if d == d1:
+            last[sym] = close_ if close_ is not None else open_
 
-    first = rows[0]
-    last = rows[-1]
+    return {sym: _WeekEnds(d0, first.get(sym), d1, last.get(sym)) for sym, (d0, d1) in dates.items()}
 
-    first_open = first.open if first.open is not None else first.close
-    last_close = last.close if last.close is not None else last.open
 
-    if first_open is None or first_open == 0 or last_close is None:
+def refresh_weekly_returns(
+    db: Session,
+    cells: Iterable[tuple[str, date]],
+    returns: dict[tuple[str, str], float] | None = None,
+) -> int:
+    """
+    Recompute the materialized WeeklyReturn cells touched by a price ingest.
+    `cells` are (symbol, price_date) pairs; they are folded into (symbol, iso_week)
+    so only the affected weeks are re-read (one grouped query + one lookup per week).
+    If `returns` is given, each written cell's new return_pct is recorded in it
+    under (symbol, iso_week). Does NOT commit. Returns the number of cells written.
+    """
+    by_week: dict[str, set[str]] = {}
+    for sym, d in cells:
+        by_week.setdefault(iso_week_label(d), set()).add(sym)
+
+    written = 0
+    W = models.WeeklyReturn
+    for week, syms in by_week.items():
+        ends = _week_ends_from_prices(db, syms, week)
+        existing = {wr.symbol: wr for wr in db.query(W).filter(W.iso_week == week, W.symbol.in_(syms)).all()}
+        for sym, e in ends.items():
+            wr = existing.get(sym)
+            if wr is None:
+                wr = W(symbol=sym, iso_week=week)
+                db.add(wr)
+            wr.first_date = e.first_date
+            wr.first_open = e.first_open
+            wr.last_date = e.last_date
+            wr.last_close = e.last_close
+            wr.return_pct = _return_pct(e.first_open, e.last_close)
+            wr.updated_at = datetime.utcnow()
+            if returns is not None:
+                returns[(sym, week)] = wr.return_pct
+            written += 1
+    return written
+
+
+def _series_return_pct(series: PriceSeries, iso_week: str) -> float:
+    start_d, end_d = iso_week_bounds(iso_week)
+    ends = series.week_ends(start_d, end_d)
+    if ends is None:
         return 0.0
+    _, first_open, _, last_close = ends
+    return _return_pct(first_open, last_close)
 
-    return float((last_close - first_open) / first_open * 100.0)
+
+def get_week_returns(db: Session, symbols: Iterable[str], iso_week: str) -> dict[str, float]:
+    """
+    Bulk % returns for many symbols in one ISO week.
+    The materialized weekly_returns cells are authoritative and read first
+    (indexed point lookups), so a price ingest handled by any worker is seen
+    at once. Symbols with no cell yet (e.g. prices loaded outside the ingest
+    endpoints) fall back to the week's bars through the process price cache,
+    loaded in one query limited to the week. Symbols without prices map to 0.0.
+    """
+    wanted = set(symbols)
+    out = {sym: 0.0 for sym in wanted}
+    if not wanted:
+        return out
+
+    W = models.WeeklyReturn
+    cells = db.query(W.symbol, W.return_pct).filter(W.iso_week == iso_week, W.symbol.in_(wanted)).all()
+    for sym, pct in cells:
+        out[sym] = float(pct)
+
+    missing = wanted - {sym for sym, _ in cells}
+    if missing:
+        start_d, end_d = iso_week_bounds(iso_week)
+        for sym, series in price_cache.get_many(db, missing, start_d, end_d).items():
+            out[sym] = _series_return_pct(series, iso_week)
+    return out
+
+
+def get_week_return_pct(db: Session, symbol: str, iso_week: str) -> float:
+    """
+    Compute % return for `symbol` across the given ISO week:
+      ((last_close - first_open) / first_open) * 100
+    """
+    return get_week_returns(db, [symbol], iso_week)[symbol]
 
 
 def weekly_change(db: Session, symbol: str, iso_week: str) -> float:
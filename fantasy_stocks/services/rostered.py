@@ -0,0 +1,171 @@
+# fantasy_stocks/services/rostered.py
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from .. import models
+from . import data_version
+
+__all__ = ["ROSTERED_MAX_LEAGUES", "RosteredSymbols", "rostered"]
+
+ROSTERED_MAX_LEAGUES = int(os.getenv("ROSTERED_MAX_LEAGUES", "1024"))
+
+_SESSION_KEY = "rostered_pending"
+_READY_KEY = "rostered_committed"
+
+
+def _version_key(league_id: int) -> str:
+    return f"roster:{league_id}"
+
+
+def _engine_of(db: Session) -> Engine:
+    bind = db.get_bind()
+    return bind.engine if isinstance(bind, Connection) else bind
+
+
+class _LeagueRoster:
+    __slots__ = ("version", "holders")
+
+    def __init__(self, version: int, holders: dict[str, set[int]]) -> None:
+        self.version = version  # shared "roster:<league>" version the holders reflect
+        self.holders = holders  # symbol -> ids of the league's teams holding it
+
+
+class RosteredSymbols:
+    """
+    Process-wide LRU of the symbols rostered in each league, as
+    symbol -> ids of the league's teams holding it.
+
+    Availability checks become a set lookup instead of a roster_slots/teams
+    join per request. Each set is tagged with the league's shared roster
+    version (a `data_versions` row), which every roster-membership write
+    advances in its own transaction: draft picks, claims, adds and drops
+    `record` their change, other roster writers (active-slot tools, debug
+    seeding, waiver runs) `record` or `invalidate`. A read compares the tag
+    with the shared version (one primary-key lookup) and reloads when another
+    worker has changed the roster; in the committing worker the change is
+    applied to the cached set directly when it is the only one since the set
+    was loaded.
+    """
+
+    def __init__(self, max_leagues: int = ROSTERED_MAX_LEAGUES) -> None:
+        self.max_leagues = max_leagues
+        self._leagues: OrderedDict[tuple[Engine, int], _LeagueRoster] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.applied = 0
+
+    def symbols(self, db: Session, league_id: int) -> frozenset[str]:
+        """Symbols held by at least one team of the league."""
+        key = (_engine_of(db), league_id)
+        # version first: the roster read after it is at least that new
+        version = data_version.read(db, _version_key(league_id))
+        with self._lock:
+            entry = self._leagues.get(key)
+            if entry is not None and entry.version == version:
+                self._leagues.move_to_end(key)
+                self.hits += 1
+                return frozenset(entry.holders)
+
+        holders: dict[str, set[int]] = {}
+        rows = (
+            db.query(models.RosterSlot.symbol, models.RosterSlot.team_id)
+            .join(models.Team, models.Team.id == models.RosterSlot.team_id)
+            .filter(models.Team.league_id == league_id)
+        )
+        for sym, tid in rows:
+            holders.setdefault(sym, set()).add(tid)
+
+        with self._lock:
+            self.loads += 1
+            entry = self._leagues.get(key)
+            if entry is None or entry.version <= version:  # never replace a newer set
+                self._leagues[key] = _LeagueRoster(version, holders)
+                self._leagues.move_to_end(key)
+                while len(self._leagues) > self.max_leagues:
+                    self._leagues.popitem(last=False)
+        return frozenset(holders)
+
+    def record(
+        self,
+        db: Session,
+        league_id: int,
+        team_id: int,
+        *,
+        added: Iterable[str] = (),
+        dropped: Iterable[str] = (),
+    ) -> None:
+        """Queue a roster change of the session's transaction; it advances the shared roster version on commit."""
+        pending = db.info.setdefault(_SESSION_KEY, [])
+        pending.append((_engine_of(db), league_id, team_id, tuple(added), tuple(dropped)))
+
+    def invalidate(self, db: Session, league_id: int) -> None:
+        """Like `record` for writes that are not simple adds/drops: every cached copy reloads after commit."""
+        db.info.setdefault(_SESSION_KEY, []).append((_engine_of(db), league_id, None, (), ()))
+
+    def _apply(self, engine: Engine, league_id: int, version: int, changes: list[tuple]) -> None:
+        key = (engine, league_id)
+        with self._lock:
+            entry = self._leagues.get(key)
+            if entry is None:
+                return
+            if entry.version != version - 1 or any(team_id is None for team_id, _, _ in changes):
+                # another writer got in between (or the change is opaque): reload on the next read
+                del self._leagues[key]
+                return
+            for team_id, added, dropped in changes:
+                for sym in added:
+                    entry.holders.setdefault(sym, set()).add(team_id)
+                for sym in dropped:
+                    teams = entry.holders.get(sym)
+                    if teams is not None:
+                        teams.discard(team_id)
+                        if not teams:
+                            del entry.holders[sym]
+            entry.version = version
+            self.applied += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._leagues.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"leagues": len(self._leagues), "hits": self.hits, "loads": self.loads, "applied": self.applied}
+
+
+rostered = RosteredSymbols()
+
+
+@event.listens_for(Session, "before_commit")
+def _advance_pending(session: Session) -> None:
+    pending = session.info.pop(_SESSION_KEY, None)
+    if not pending:
+        return
+    by_league: dict[tuple[Engine, int], list[tuple]] = {}
+    for engine, league_id, team_id, added, dropped in pending:
+        by_league.setdefault((engine, league_id), []).append((team_id, added, dropped))
+    ready = session.info.setdefault(_READY_KEY, [])
+    for (engine, league_id), changes in sorted(by_league.items(), key=lambda item: item[0][1]):
+        version = data_version.advance(session, _version_key(league_id))
+        ready.append((engine, league_id, version, changes))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed(session: Session) -> None:
+    for engine, league_id, version, changes in session.info.pop(_READY_KEY, ()):
+        rostered._apply(engine, league_id, version, changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_SESSION_KEY, None)
+    session.info.pop(_READY_KEY, None)
@@ -0,0 +1,241 @@
+# fantasy_stocks/services/scoreboard.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import TypedDict
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..logic.scoring import week_points
+from ..utils.team_names import TeamNames
+from . import league_version
+from .live_scores import live_scores
+
+logger = logging.getLogger("fantasy_stocks")
+
+SCOREBOARD_QUEUE_SIZE = int(os.getenv("SCOREBOARD_QUEUE_SIZE", "32"))
+# Seconds between checks of the shared league version (changes committed by other workers).
+SCOREBOARD_POLL_S = float(os.getenv("SCOREBOARD_POLL_S", "1.0"))
+
+
+class MatchupScore(TypedDict):
+    match_id: int
+    home_team_id: int
+    home_team_name: str
+    home_points: float
+    away_team_id: int
+    away_team_name: str
+    away_points: float
+    final: bool  # points come from the closed week, not the live computation
+
+
+class ScoreboardEvent(TypedDict):
+    event: str  # "snapshot" (every matchup) | "delta" (only the matchups that changed)
+    version: int  # league data version the update was computed from
+    matchups: list[MatchupScore]
+
+
+def compute_scoreboard(db: Session, league_id: int, week: str) -> dict[int, MatchupScore]:
+    """
+    match_id -> current score of every matchup in a league/week. Closed matches
+    report their stored points; open ones are scored live from active starters.
+    """
+    league = db.get(models.League, league_id)
+    if league is None:
+        return {}
+    matches = (
+        db.query(models.Match)
+        .filter(models.Match.league_id == league_id, models.Match.week == week)
+        .order_by(models.Match.id.asc())
+        .all()
+    )
+    open_teams = {
+        tid
+        for m in matches
+        if m.home_points is None or m.away_points is None
+        for tid in (m.home_team_id, m.away_team_id)
+    }
+    names = TeamNames(db, league_id)
+    if not open_teams:
+        live: dict[int, float] = {}
+    elif league.scoring_mode == models.ScoringMode.LIVE:
+        live = live_scores.get(db, league, week, names.team_ids).totals
+    else:
+        live = week_points(db, open_teams, league.scoring_mode, week, starters_limit=league.starters)
+
+    out: dict[int, MatchupScore] = {}
+    for m in matches:
+        final = m.home_points is not None and m.away_points is not None
+        out[m.id] = {
+            "match_id": m.id,
+            "home_team_id": m.home_team_id,
+            "home_team_name": names(m.home_team_id),
+            "home_points": float(m.home_points) if final else live.get(m.home_team_id, 0.0),
+            "away_team_id": m.away_team_id,
+            "away_team_name": names(m.away_team_id),
+            "away_points": float(m.away_points) if final else live.get(m.away_team_id, 0.0),
+            "final": final,
+        }
+    return out
+
+
+class ScoreboardSubscriber:
+    """One connected client: a bounded queue of events it has not read yet."""
+
+    def __init__(self, channel: _Channel, maxsize: int) -> None:
+        self.channel = channel
+        self.queue: asyncio.Queue[ScoreboardEvent] = asyncio.Queue(maxsize)
+        self.resyncs = 0
+
+    def offer(self, event: ScoreboardEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow reader: drop its backlog and replace it with one snapshot, so it
+            # catches up in a single event and never holds more than `maxsize`.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(self.channel.snapshot())
+            self.resyncs += 1
+
+
+class _Channel:
+    """
+    Shared state for one (league, week) on one event loop. A single task polls
+    the league's shared data version (score changes and price ticks for rostered
+    symbols advance it, whichever worker commits them); when it moves, the task
+    recomputes the scoreboard once and fans the changed matchups out to every
+    subscriber. Commits made in this process also wake the task right away
+    instead of at the next poll.
+    """
+
+    def __init__(self, hub: ScoreboardHub, engine: Engine, league_id: int, week: str) -> None:
+        self.hub = hub
+        self.engine = engine
+        self.league_id = league_id
+        self.week = week
+        self.loop = asyncio.get_running_loop()
+        self.subscribers: set[ScoreboardSubscriber] = set()
+        self.state: dict[int, MatchupScore] = {}
+        self.version = 0
+        self.ready = asyncio.Event()
+        self.error: BaseException | None = None
+        self._dirty = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._subscription: league_version.Subscription | None = None
+
+    def _compute(self) -> tuple[int, dict[int, MatchupScore]]:
+        # version first: the scores read after it are at least that new
+        with Session(bind=self.engine) as db:
+            version = league_version.current(db, self.league_id)
+            return version, compute_scoreboard(db, self.league_id, self.week)
+
+    def _read_version(self) -> int:
+        with Session(bind=self.engine) as db:
+            return league_version.current(db, self.league_id)
+
+    def _on_bump(self, _league_id: int, _version: int) -> None:
+        # Runs on the committing thread; only schedule an early check.
+        try:
+            self.loop.call_soon_threadsafe(self._dirty.set)
+        except RuntimeError:  # loop already closed
+            pass
+
+    async def start(self) -> None:
+        try:
+            # Subscribe first so a change landing during the initial compute is not missed.
+            self._subscription = league_version.subscribe(self.league_id, self._on_bump)
+            self.version, self.state = await asyncio.to_thread(self._compute)
+            self.hub.computes += 1
+            self._task = self.loop.create_task(self._run())
+        except BaseException as exc:
+            self.error = exc
+            raise
+        finally:
+            self.ready.set()
+
+    def snapshot(self) -> ScoreboardEvent:
+        return {"event": "snapshot", "version": self.version, "matchups": list(self.state.values())}
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._dirty.wait(), self.hub.poll_interval)
+            except TimeoutError:
+                pass
+            self._dirty.clear()
+            try:
+                if await asyncio.to_thread(self._read_version) == self.version:
+                    continue
+                version, state = await asyncio.to_thread(self._compute)
+            except Exception:
+                logger.exception("scoreboard recompute failed for league %s week %s", self.league_id, self.week)
+                continue
+            self.hub.computes += 1
+            changed = [score for mid, score in state.items() if self.state.get(mid) != score]
+            self.state, self.version = state, version
+            if not changed:
+                continue
+            event: ScoreboardEvent = {"event": "delta", "version": version, "matchups": changed}
+            for sub in list(self.subscribers):
+                sub.offer(event)
+
+    def close(self) -> None:
+        if self._subscription is not None:
+            self._subscription.close()
+        if self._task is not None:
+            self._task.cancel()
+
+
+class ScoreboardHub:
+    """Live scoreboard channels keyed by (league, week, event loop)."""
+
+    def __init__(self, queue_size: int = SCOREBOARD_QUEUE_SIZE, poll_interval: float = SCOREBOARD_POLL_S) -> None:
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        self._channels: dict[tuple, _Channel] = {}
+        self.computes = 0
+
+    async def subscribe(self, engine: Engine, league_id: int, week: str) -> ScoreboardSubscriber:
+        """Join (or open) the channel; the subscriber's queue starts with a full snapshot."""
+        key = (league_id, week, asyncio.get_running_loop())
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = self._channels[key] = _Channel(self, engine, league_id, week)
+            try:
+                await channel.start()
+            except BaseException:
+                self._channels.pop(key, None)
+                channel.close()
+                raise
+        await channel.ready.wait()
+        if channel.error is not None:
+            raise channel.error
+
+        sub = ScoreboardSubscriber(channel, self.queue_size)
+        channel.subscribers.add(sub)
+        sub.offer(channel.snapshot())
+        return sub
+
+    def unsubscribe(self, sub: ScoreboardSubscriber) -> None:
+        channel = sub.channel
+        channel.subscribers.discard(sub)
+        if not channel.subscribers:
+            key = (channel.league_id, channel.week, channel.loop)
+            if self._channels.get(key) is channel:
+                del self._channels[key]
+            channel.close()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "channels": len(self._channels),
+            "subscribers": sum(len(c.subscribers) for c in self._channels.values()),
+            "computes": self.computes,
+        }
+
+
+scoreboard_hub = ScoreboardHub()
@@ -0,0 +1,147 @@
+# fantasy_stocks/services/search_index.py
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+
+from sqlalchemy import DDL, bindparam, case, event, or_, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from .. import models
+
+__all__ = ["FTS_TABLE", "MIN_FTS_CHARS", "SearchIndex", "search_index"]
+
+# Contentful FTS5 table over the catalog; its rowid mirrors securities.rowid.
+FTS_TABLE = "securities_fts"
+# The trigram tokenizer can only answer MATCH for three or more characters.
+MIN_FTS_CHARS = 3
+# Bound on symbols per IN (...) list when syncing a batch.
+_SYNC_CHUNK = 500
+
+_CREATE_FTS = DDL(f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(symbol, name, tokenize='trigram')")
+
+
+def _fts5_supported(_ddl, target, bind: Connection, **_kw) -> bool:
+    if bind.dialect.name != "sqlite":
+        return False
+    return bool(bind.exec_driver_sql("SELECT sqlite_compileoption_used('ENABLE_FTS5')").scalar())
+
+
+# Created next to `securities` by Base.metadata.create_all; `install` covers older databases.
+event.listen(models.Security.__table__, "after_create", _CREATE_FTS.execute_if(callable_=_fts5_supported))
+
+
+def rank_expr(q: str) -> ColumnElement[int]:
+    """0 exact symbol, 1 symbol prefix, 2 name prefix, 3 name word prefix, 4 other substring."""
+    S = models.Security
+    return case(
+        (S.symbol == q.upper(), 0),
+        (S.symbol.istartswith(q, autoescape=True), 1),
+        (S.name.istartswith(q, autoescape=True), 2),
+        (S.name.icontains(f" {q}", autoescape=True), 3),
+        else_=4,
+    )
+
+
+class SearchIndex:
+    """
+    Name/symbol search over the securities catalog.
+
+    On SQLite with FTS5 the catalog is mirrored into a trigram-tokenized
+    virtual table, so substring queries of three or more characters are
+    answered from the index instead of scanning `securities`. Writers keep the
+    mirror in step with `sync` (same transaction as the upsert) and `clear`.
+    Shorter queries, other dialects and SQLite builds without FTS5 fall back to
+    case-insensitive LIKE on the base table. Either way results carry the same
+    relevance rank (see rank_expr).
+    """
+
+    def __init__(self) -> None:
+        self._available: dict[Engine, bool] = {}
+        self._lock = threading.Lock()
+
+    def available(self, db: Session) -> bool:
+        """Whether the bound database has the FTS table (checked once per engine)."""
+        bind = db.get_bind()
+        engine = bind.engine if isinstance(bind, Connection) else bind
+        with self._lock:
+            found = self._available.get(engine)
+        if found is None:
+            found = (
+                engine.dialect.name == "sqlite"
+                and db.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :n"), {"n": FTS_TABLE}
+                ).first()
+                is not None
+            )
+            with self._lock:
+                self._available[engine] = found
+        return found
+
+    def install(self, engine: Engine) -> bool:
+        """
+        Create the FTS table if the engine supports it and (re)fill it when it is
+        out of step with the catalog. Run at startup for databases created
+        before the index existed. Returns whether the index is available.
+        """
+        with engine.begin() as conn:
+            if not _fts5_supported(None, None, conn):
+                ok = False
+            else:
+                conn.execute(_CREATE_FTS)
+                indexed = conn.exec_driver_sql(f"SELECT count(*) FROM {FTS_TABLE}").scalar()
+                total = conn.exec_driver_sql("SELECT count(*) FROM securities").scalar()
+                if indexed != total:
+                    conn.exec_driver_sql(f"DELETE FROM {FTS_TABLE}")
+                    conn.exec_driver_sql(
+                        f"INSERT INTO {FTS_TABLE}(rowid, symbol, name) "
+                        "SELECT rowid, symbol, coalesce(name, '') FROM securities"
+                    )
+                ok = True
+        with self._lock:
+            self._available[engine] = ok
+        return ok
+
+    def sync(self, db: Session, symbols: Iterable[str]) -> None:
+        """Re-index the given symbols from `securities` (flushes first). Does NOT commit."""
+        if not self.available(db):
+            return
+        db.flush()
+        batch = sorted(set(symbols))
+        delete = text(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid IN (SELECT rowid FROM securities WHERE symbol IN :syms)"
+        ).bindparams(bindparam("syms", expanding=True))
+        insert = text(
+            f"INSERT INTO {FTS_TABLE}(rowid, symbol, name) "
+            "SELECT rowid, symbol, coalesce(name, '') FROM securities WHERE symbol IN :syms"
+        ).bindparams(bindparam("syms", expanding=True))
+        for i in range(0, len(batch), _SYNC_CHUNK):
+            chunk = {"syms": batch[i : i + _SYNC_CHUNK]}
+            db.execute(delete, chunk)
+            db.execute(insert, chunk)
+
+    def clear(self, db: Session) -> None:
+        """Empty the index (the catalog was wiped). Does NOT commit."""
+        if self.available(db):
+            db.execute(text(f"DELETE FROM {FTS_TABLE}"))
+
+    def match(self, db: Session, q: str) -> tuple[ColumnElement[bool], ColumnElement[int]]:
+        """
+        (filter, rank) for a free-text query on Security: the filter keeps rows
+        whose symbol or name contains `q` (case-insensitive); order by the rank
+        ascending for best matches first.
+        """
+        q = q.strip()
+        S = models.Security
+        if len(q) >= MIN_FTS_CHARS and self.available(db):
+            phrase = '"' + q.replace('"', '""') + '"'
+            hits = text(f"SELECT symbol FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :fts_q").bindparams(fts_q=phrase)
+            where = S.symbol.in_(hits.columns(symbol=S.symbol.type))
+        else:
+            where = or_(S.symbol.icontains(q, autoescape=True), S.name.icontains(q, autoescape=True))
+        return where, rank_expr(q)
+
+
+search_index = SearchIndex()
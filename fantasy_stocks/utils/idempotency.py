@@ -1,13 +1,178 @@
 # fantasy_stocks/utils/idempotency.py
 import hashlib
 import inspect
+import json
 import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import datetime, timedelta
 from functools import wraps
+from typing import Any, Protocol
 
 from fastapi import HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, select
+from sqlalchemy.engine import Engine
 
-# Simple in-memory store (per-process). Fine for dev/tests.
-_idempotency_store = {}
+from .. import models
+
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+IDEMPOTENCY_MAX_BYTES = int(os.getenv("IDEMPOTENCY_MAX_BYTES", str(32 * 1024 * 1024)))
+
+
+class IdempotencyBackend(Protocol):
+    """Stores JSON-serialized endpoint results by cache key."""
+
+    def get(self, key: str) -> str | None: ...
+
+    def set(self, key: str, payload: str) -> None: ...
+
+    def stats(self) -> dict[str, int]: ...
+
+
+class MemoryIdempotencyBackend:
+    """
+    Per-process LRU with a TTL, bounded by entry count and payload bytes.
+    Expired entries are dropped on access; the least recently used go first
+    when either cap is exceeded.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = IDEMPOTENCY_TTL_SECONDS,
+        max_entries: int = IDEMPOTENCY_MAX_ENTRIES,
+        max_bytes: int = IDEMPOTENCY_MAX_BYTES,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[float, str, int]] = OrderedDict()  # key -> (expires_at, payload, bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _drop(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._drop(key)
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, payload: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            size = len(payload.encode("utf-8"))
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, payload, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+class DBIdempotencyBackend:
+    """
+    Stores results in the idempotency_keys table so every worker sharing the
+    database sees them. Uses its own short transactions on `engine`, never the
+    request session. Expired rows are purged on write.
+    """
+
+    def __init__(self, engine: Engine, ttl_seconds: float = IDEMPOTENCY_TTL_SECONDS) -> None:
+        self.engine = engine
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _hash(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        R = models.IdempotencyRecord
+        with self.engine.connect() as conn:
+            payload = conn.execute(
+                select(R.response).where(R.key_hash == self._hash(key), R.expires_at > datetime.utcnow())
+            ).scalar_one_or_none()
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return payload
+
+    def set(self, key: str, payload: str) -> None:
+        R = models.IdempotencyRecord
+        now = datetime.utcnow()
+        key_hash = self._hash(key)
+        with self.engine.begin() as conn:
+            conn.execute(delete(R).where(R.key_hash == key_hash))
+            purged = conn.execute(delete(R).where(R.expires_at <= now)).rowcount
+            conn.execute(
+                R.__table__.insert().values(
+                    key_hash=key_hash,
+                    response=payload,
+                    created_at=now,
+                    expires_at=now + timedelta(seconds=self.ttl_seconds),
+                )
+            )
+        with self._lock:
+            self.evictions += purged or 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+def _backend_from_env() -> IdempotencyBackend:
+    if os.getenv("IDEMPOTENCY_BACKEND", "memory").lower() == "db":
+        from ..db import engine
+
+        return DBIdempotencyBackend(engine)
+    return MemoryIdempotencyBackend()
+
+
+_backend: IdempotencyBackend = _backend_from_env()
+
+
+def get_idempotency_backend() -> IdempotencyBackend:
+    return _backend
+
+
+def set_idempotency_backend(backend: IdempotencyBackend) -> IdempotencyBackend:
+    """Swap the process-wide backend; returns the previous one."""
+    global _backend
+    previous, _backend = _backend, backend
+    return previous
 
 
 async def _request_fingerprint(request: Request) -> str:
@@ -30,7 +195,12 @@ async def _request_fingerprint(request: Request) -> str:
     return f"{method}|{path}|{query}|{body_hash}"
 
 
-def with_idempotency(key_prefix: str):
+def with_idempotency(
+    key_prefix: str,
+    *,
+    store: Callable[[Any, dict[str, Any]], Any] | None = None,
+    replay: Callable[[Any, dict[str, Any]], Any] | None = None,
+):
     """
     Decorator for FastAPI/Starlette endpoints.
     Requires header 'Idempotency-Key' in normal runs.
@@ -38,6 +208,10 @@ def with_idempotency(key_prefix: str):
 
     Cache key includes the header AND a fingerprint of the request
     (method+path+query+body), so different leagues/paths don’t collide.
+
+    `store(result, kwargs)` picks what gets cached (default: the result) and
+    `replay(cached, kwargs)` rebuilds the response from it on a hit (default:
+    the cached value as-is), for results that go stale, like a job's status.
     """
 
     def decorator(func):
@@ -68,8 +242,11 @@ def with_idempotency(key_prefix: str):
             cache_key = f"{key_prefix}::{header_key}::{fp}"
 
             # Serve from cache if present
-            if cache_key in _idempotency_store:
-                return _idempotency_store[cache_key]
+            backend = _backend
+            cached = backend.get(cache_key)
+            if cached is not None:
+                cached = json.loads(cached)
+                return replay(cached, kwargs) if replay is not None else cached
 
             # Execute underlying function and cache result
             if inspect.iscoroutinefunction(func):
@@ -77,9 +254,13 @@ def with_idempotency(key_prefix: str):
             else:
                 result = func(*args, **kwargs)
 
-            _idempotency_store[cache_key] = result
+            stored = store(result, kwargs) if store is not None else result
+            backend.set(cache_key, json.dumps(jsonable_encoder(stored), separators=(",", ":")))
             return result
 
+        # FastAPI resolves string annotations against the wrapper's module (this one);
+        # hand it the endpoint's signature already evaluated in its own module.
+        wrapper.__signature__ = inspect.signature(func, eval_str=True)
         return wrapper
 
     return decorator
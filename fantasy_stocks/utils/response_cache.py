@@ -0,0 +1,145 @@
+# fantasy_stocks/utils/response_cache.py
+import hashlib
+import inspect
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import wraps
+from typing import Any
+
+from fastapi import HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from ..services import league_version
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+
+
+class ResponseCache:
+    """
+    Serialized JSON bodies keyed by (endpoint, league, query string), each
+    tagged with the league data version it was built from. An entry is only
+    served while the league is still at that version; the version is the
+    shared one (league_version.current), so a write handled by any worker
+    retires every worker's entries.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[int, str, bytes]] = OrderedDict()  # key -> (version, etag, body)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple, version: int) -> tuple[str, bytes] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def put(self, key: tuple, version: int, etag: str, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (version, etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def drop_league(self, league_id: int) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[1] == league_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+response_cache = ResponseCache()
+# Stale entries would never be served again; free them as soon as this process changes the league.
+league_version.subscribe(None, lambda league_id, _version: response_cache.drop_league(league_id))
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {c.strip().removeprefix("W/") for c in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _respond(request: Request, etag: str, body: bytes) -> Response:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def etag_cached(name: str, *, cache_if: Callable[[dict[str, Any]], bool] | None = None):
+    """
+    Decorator for read-only league endpoints taking `league_id`, `request`
+    and `db`.
+
+    While the league's data version is unchanged, repeat calls are answered
+    from the cached serialized body without running the endpoint (a single
+    primary-key read of the version, no JSON encoding). Responses carry a
+    strong ETag (hash of the body) and `If-None-Match` is honored with 304.
+
+    `cache_if(kwargs)` returning False runs the endpoint uncached, for calls
+    whose result is not a function of the league data (e.g. unseeded RNG).
+    """
+
+    def decorator(func):
+        is_async = inspect.iscoroutinefunction(func)
+
+        def _lookup(kwargs) -> tuple[Request, tuple, int, Response | None]:
+            request: Request | None = kwargs.get("request")
+            if request is None:
+                raise HTTPException(status_code=500, detail="Request object not found")
+            league_id = int(kwargs["league_id"])
+            key = (name, league_id, str(request.url.query))
+            version = league_version.current(kwargs["db"], league_id)
+            hit = response_cache.get(key, version)
+            return request, key, version, (_respond(request, *hit) if hit else None)
+
+        def _store(request: Request, key: tuple, version: int, result) -> Response:
+            if isinstance(result, Response):
+                return result
+            body = JSONResponse(jsonable_encoder(result)).body
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            response_cache.put(key, version, etag, body)
+            return _respond(request, etag, body)
+
+        if is_async:
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if cache_if is not None and not cache_if(kwargs):
+                    return await func(*args, **kwargs)
+                request, key, version, cached = _lookup(kwargs)
+                if cached is not None:
+                    return cached
+                return _store(request, key, version, await func(*args, **kwargs))
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if cache_if is not None and not cache_if(kwargs):
+                return func(*args, **kwargs)
+            request, key, version, cached = _lookup(kwargs)
+            if cached is not None:
+                return cached
+            return _store(request, key, version, func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,52 @@
+# fantasy_stocks/utils/team_names.py
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from .. import models
+
+
+class TeamNames:
+    """
+    Per-request team-name resolver for one league.
+    All of the league's team names are loaded with one query on first use;
+    unknown ids resolve to "Team {id}".
+    """
+
+    def __init__(self, db: Session, league_id: int) -> None:
+        self._db = db
+        self._league_id = league_id
+        self._names: dict[int, str] | None = None
+
+    def _load(self) -> dict[int, str]:
+        if self._names is None:
+            self._names = {
+                tid: name
+                for tid, name in self._db.query(models.Team.id, models.Team.name)
+                .filter(models.Team.league_id == self._league_id)
+                .order_by(models.Team.id.asc())
+            }
+        return self._names
+
+    def __call__(self, team_id: int) -> str:
+        return self._load().get(team_id, f"Team {team_id}")
+
+    @property
+    def team_ids(self) -> list[int]:
+        return list(self._load())
+
+
+def serialize_match(names: TeamNames, m: models.Match) -> dict[str, Any]:
+    return {
+        "id": m.id,
+        "week": m.week,
+        "home_team_id": m.home_team_id,
+        "home_team_name": names(m.home_team_id),
+        "home_points": None if m.home_points is None else float(m.home_points),
+        "away_team_id": m.away_team_id,
+        "away_team_name": names(m.away_team_id),
+        "away_points": None if m.away_points is None else float(m.away_points),
+        "winner_team_id": m.winner_team_id,
+    }
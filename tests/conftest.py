@@ -1,8 +1,10 @@
 # tests/conftest.py
 import os
+import time
+from contextlib import contextmanager
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -55,3 +57,68 @@ def client(db_session):
         yield c
 
     app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def league_with_teams(client):
+    """
+    league_with_teams(n_teams, proj=2.0) -> (league_id, team_ids, week)
+
+    Seeds four LARGE_CAP symbols worth `proj` each, creates a league of
+    `n_teams` where team i starts (i % 4) + 1 of them, and generates one week.
+    """
+
+    def make(n_teams: int, proj: float = 2.0) -> tuple[int, list[int], str]:
+        syms = [f"BS{i}" for i in range(4)]
+        r = client.post(
+            "/players/seed",
+            json=[
+                {"symbol": s, "name": s, "is_etf": False, "primary_bucket": "LARGE_CAP", "proj_points": proj}
+                for s in syms
+            ],
+        )
+        assert r.status_code == 200, r.text
+
+        r = client.post("/leagues/", json={"name": f"batch-{n_teams}-{time.time_ns()}"})
+        assert r.status_code == 200, r.text
+        league_id = r.json()["id"]
+
+        team_ids = []
+        for i in range(n_teams):
+            r = client.post(f"/leagues/{league_id}/join", json={"name": f"T{i}", "owner": f"O{i}"})
+            assert r.status_code == 200, r.text
+            tid = r.json()["id"]
+            team_ids.append(tid)
+            for s in syms[: (i % 4) + 1]:
+                rr = client.post(f"/teams/{tid}/roster/active", json={"symbol": s, "bucket": "LARGE_CAP"})
+                assert rr.status_code == 201, rr.text
+
+        r = client.post(f"/schedule/generate/{league_id}", json={})
+        assert r.status_code == 200, r.text
+        return league_id, team_ids, r.json()["week"]
+
+    return make
+
+
+@pytest.fixture()
+def sql_statements(engine):
+    """
+    with sql_statements() as stmts: ...
+
+    Collects every SQL statement run on the test engine inside the block.
+    """
+
+    @contextmanager
+    def capture():
+        seen: list[str] = []
+
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            seen.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _before)
+        try:
+            yield seen
+        finally:
+            event.remove(engine, "before_cursor_execute", _before)
+
+    return capture
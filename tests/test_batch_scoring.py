@@ -0,0 +1,95 @@
+# tests/test_batch_scoring.py
+
+import pytest
+
+from fantasy_stocks import models
+from fantasy_stocks.logic.scoring import close_week, close_week_with_proj_points
+
+
+def test_close_week_statement_count_is_constant(db_session, league_with_teams, sql_statements):
+    small_id, _, small_week = league_with_teams(2)
+    large_id, _, large_week = league_with_teams(8)
+
+    with sql_statements() as small:
+        close_week(db_session, small_id, small_week)
+    with sql_statements() as large:
+        close_week(db_session, large_id, large_week)
+    assert len(small) == len(large)
+
+    # re-closing updates existing TeamScore rows, still constant
+    with sql_statements() as again:
+        close_week(db_session, large_id, large_week)
+    assert len(again) <= len(large)
+
+
+def test_close_week_persists_points_winner_and_team_scores(client, db_session, league_with_teams):
+    league_id, team_ids, week = league_with_teams(4, proj=3.0)
+
+    close_week_with_proj_points(db_session, league_id, week)
+
+    matches = db_session.query(models.Match).filter(models.Match.league_id == league_id).all()
+    assert len(matches) == 2
+    for m in matches:
+        hi, ai = team_ids.index(m.home_team_id), team_ids.index(m.away_team_id)
+        assert m.home_points == 3.0 * ((hi % 4) + 1)
+        assert m.away_points == 3.0 * ((ai % 4) + 1)
+        assert m.winner_team_id == (m.home_team_id if m.home_points > m.away_points else m.away_team_id)
+
+    scores = db_session.query(models.TeamScore).filter(models.TeamScore.league_id == league_id).all()
+    assert {s.team_id: s.points for s in scores} == {tid: 3.0 * ((i % 4) + 1) for i, tid in enumerate(team_ids)}
+
+    # the standings close path skips already-scored matches
+    r = client.post(f"/standings/{league_id}/close_week")
+    assert r.status_code == 200, r.text
+    assert r.json()["matches_scored"] == 0
+
+
+def test_close_week_live_mode_uses_weekly_returns(client, db_session, league_with_teams):
+    league_id, team_ids, _ = league_with_teams(2)
+    r = client.patch(f"/leagues/{league_id}/mode", json={"scoring_mode": "LIVE"})
+    assert r.status_code == 200, r.text
+
+    week = "2025-W38"  # Mon 2025-09-15 .. Sun 2025-09-21
+    m = models.Match(league_id=league_id, week=week, home_team_id=team_ids[0], away_team_id=team_ids[1])
+    db_session.add(m)
+    db_session.commit()
+
+    # BS0 +10%, BS1 -5% over the week; team 0 starts BS0, team 1 starts BS0+BS1
+    r = client.post(
+        "/prices/bulk",
+        json=[
+            {"symbol": "BS0", "date": "2025-09-15", "open": 100.0, "close": 101.0},
+            {"symbol": "BS0", "date": "2025-09-19", "open": 105.0, "close": 110.0},
+            {"symbol": "BS1", "date": "2025-09-16", "open": 20.0, "close": 19.0},
+        ],
+    )
+    assert r.status_code == 200, r.text
+
+    close_week(db_session, league_id, week)
+    db_session.refresh(m)
+    assert abs(m.home_points - 10.0) < 1e-9
+    assert abs(m.away_points - 5.0) < 1e-9
+    assert m.winner_team_id == team_ids[0]
+
+
+def test_simulate_season_with_proj_points_and_missing_league(client, db_session, league_with_teams):
+    from fantasy_stocks.logic.scoring import simulate_season_with_proj_points
+
+    league_id, _, _ = league_with_teams(4)
+    r = client.post(f"/schedule/season/{league_id}")
+    assert r.status_code == 200, r.text
+
+    simulate_season_with_proj_points(db_session, league_id)
+    open_matches = (
+        db_session.query(models.Match)
+        .filter(models.Match.league_id == league_id, models.Match.home_points.is_(None))
+        .count()
+    )
+    assert open_matches == 0
+
+    with pytest.raises(ValueError, match="not found"):
+        close_week(db_session, 999_999, "2025-W38")
+    with pytest.raises(ValueError, match="not found"):
+        close_week_with_proj_points(db_session, 999_999, "2025-W38")
+    with pytest.raises(ValueError, match="not found"):
+        simulate_season_with_proj_points(db_session, 999_999)
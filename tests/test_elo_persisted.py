@@ -0,0 +1,115 @@
+# tests/test_elo_persisted.py
+import pytest
+
+from fantasy_stocks import models
+from fantasy_stocks.logic import scoring
+from fantasy_stocks.logic.analytics import LeagueAnalytics
+from fantasy_stocks.logic.elo import rebuild_elo
+from fantasy_stocks.logic.scoring import close_week_with_proj_points, score_week, simulate_season_fast
+
+
+@pytest.fixture()
+def season(client, db_session, league_with_teams):
+    """season(n_teams) -> (league_id, team_ids, weeks) with the full schedule generated."""
+
+    def make(n_teams: int) -> tuple[int, list[int], list[str]]:
+        league_id, team_ids, _ = league_with_teams(n_teams)
+        assert client.post(f"/schedule/season/{league_id}").status_code == 200
+        weeks = sorted({w for (w,) in db_session.query(models.Match.week).filter(models.Match.league_id == league_id)})
+        return league_id, team_ids, weeks
+
+    return make
+
+
+def _persisted(db, league_id: int) -> dict[int, float]:
+    db.expire_all()
+    return {r.team_id: r.rating for r in db.query(models.TeamElo).filter(models.TeamElo.league_id == league_id)}
+
+
+def _assert_matches_replay(db, league_id: int) -> None:
+    replay = LeagueAnalytics(db, league_id).elo
+    persisted = _persisted(db, league_id)
+    assert persisted.keys() == replay.keys()
+    for tid, rating in replay.items():
+        assert abs(persisted[tid] - rating) < 1e-9
+
+
+def test_ratings_follow_each_closed_week(client, db_session, season):
+    league_id, team_ids, weeks = season(4)
+    for wk in weeks:
+        close_week_with_proj_points(db_session, league_id, wk)
+        _assert_matches_replay(db_session, league_id)
+
+    history = client.get(f"/standings/{league_id}/elo/history", params={"team_id": team_ids[3]}).json()
+    assert [h["week"] for h in history] == weeks
+    assert history[0]["rating_before"] == 1500.0
+    assert all(a["rating_after"] == b["rating_before"] for a, b in zip(history, history[1:], strict=False))
+    assert history[-1]["rating_after"] == _persisted(db_session, league_id)[team_ids[3]]
+
+
+def test_out_of_order_and_rescore_rebuild(db_session, season):
+    league_id, _, weeks = season(4)
+    close_week_with_proj_points(db_session, league_id, weeks[1])
+    close_week_with_proj_points(db_session, league_id, weeks[0])  # older matches -> replayed in id order
+    _assert_matches_replay(db_session, league_id)
+
+    # re-score week 0 with one starter per team: past results change
+    league = db_session.get(models.League, league_id)
+    score_week(db_session, league, weeks[0], mode=models.ScoringMode.PROJECTIONS, starters_limit=1)
+    db_session.commit()
+    _assert_matches_replay(db_session, league_id)
+    n_history = db_session.query(models.EloHistory).filter(models.EloHistory.league_id == league_id).count()
+    assert n_history == 2 * 2 * 2  # two weeks x two matches x two teams, no stale rows
+
+
+def test_float_noise_between_totals_is_a_tie(db_session, season, monkeypatch):
+    league_id, team_ids, weeks = season(4)
+    # 0.1 + 0.2 != 0.3 in binary floating point; half the league scores each
+    noisy = {tid: 0.1 + 0.2 if i % 2 else 0.3 for i, tid in enumerate(team_ids)}
+    monkeypatch.setattr(scoring, "week_points", lambda *_a, **_kw: dict(noisy))
+    league = db_session.get(models.League, league_id)
+
+    score_week(db_session, league, weeks[0], mode=models.ScoringMode.PROJECTIONS)
+    db_session.commit()
+    week0 = db_session.query(models.Match).filter(models.Match.league_id == league_id, models.Match.week == weeks[0])
+    assert [m.winner_team_id for m in week0] == [None, None]
+
+    simulate_season_fast(db_session, league)
+    db_session.commit()
+    matches = db_session.query(models.Match).filter(models.Match.league_id == league_id).all()
+    assert matches and all(m.winner_team_id is None for m in matches)
+
+
+def test_default_k_endpoint_is_a_read(client, db_session, season, sql_statements):
+    league_id, team_ids, weeks = season(4)
+    for wk in weeks:
+        close_week_with_proj_points(db_session, league_id, wk)
+
+    with sql_statements() as stmts:
+        r = client.get(f"/standings/{league_id}/elo")
+    assert r.status_code == 200, r.text
+    assert not any("FROM matches" in s for s in stmts)
+    table = r.json()
+    assert table[0]["team_id"] == team_ids[3]
+    assert abs(sum(row["elo"] for row in table) - 1500.0 * len(team_ids)) < 1e-6
+
+    replayed = client.get(f"/standings/{league_id}/elo", params={"k": 32.0001}).json()
+    assert [row["team_id"] for row in replayed] == [row["team_id"] for row in table]
+    assert [row["gp"] for row in replayed] == [row["gp"] for row in table]
+
+
+def test_backfill_for_leagues_scored_before_persistence(client, db_session, season):
+    league_id, _, weeks = season(4)
+    close_week_with_proj_points(db_session, league_id, weeks[0])
+    db_session.query(models.EloHistory).filter(models.EloHistory.league_id == league_id).delete()
+    db_session.query(models.TeamElo).filter(models.TeamElo.league_id == league_id).delete()
+    db_session.commit()
+
+    r = client.get(f"/standings/{league_id}/elo")
+    assert r.status_code == 200
+    _assert_matches_replay(db_session, league_id)
+
+    rebuild_elo(db_session, league_id)  # idempotent
+    db_session.commit()
+    _assert_matches_replay(db_session, league_id)
+    assert client.get("/standings/999999/elo/history").status_code == 404
@@ -0,0 +1,153 @@
+# tests/test_free_agency_waivers.py
+import pytest
+from sqlalchemy.orm import Session
+
+from fantasy_stocks import models
+from fantasy_stocks.logic import waivers
+from fantasy_stocks.logic.waivers import run_waivers
+
+CATALOG = [
+    {"symbol": "WV1", "name": "Waiver One", "primary_bucket": "LARGE_CAP"},
+    {"symbol": "WV2", "name": "Waiver Two", "primary_bucket": "MID_CAP"},
+    {"symbol": "WV3", "name": "Waiver Three", "market_cap": 5e9},  # derived MID_CAP
+    {"symbol": "WV4", "name": "Waiver Four", "is_etf": True},
+]
+
+
+def _league(client, name: str) -> tuple[int, list[int]]:
+    assert client.post("/players/seed", json=CATALOG).status_code == 200
+    league_id = client.post("/leagues/", json={"name": name}).json()["id"]
+    teams = [
+        client.post(f"/leagues/{league_id}/join", json={"name": f"W{i}", "owner": "o"}).json()["id"] for i in range(3)
+    ]
+    return league_id, teams
+
+
+def _claim(client, league_id: int, team_id: int, ticker: str, **extra) -> int:
+    body = {"league_id": league_id, "team_id": team_id, "player_id": 0, "ticker": ticker, **extra}
+    r = client.post(f"/free-agency/{league_id}/waivers", json=body)
+    assert r.status_code == 200, r.text
+    assert r.json()["status"] == "pending"
+    return r.json()["id"]
+
+
+def test_waiver_run_settles_claims_by_bid_then_priority(client, db_session):
+    league_id, (t0, t1, t2) = _league(client, "Waivers run")
+    # t1 has the worst record, so it has first priority; t0 and t2 tie on wins, t0 scored less
+    for tid, wins, pf in ((t0, 2, 90.0), (t1, 1, 200.0), (t2, 2, 120.0)):
+        db_session.add(models.TeamStanding(league_id=league_id, team_id=tid, wins=wins, points_for=pf))
+    db_session.commit()
+    assert client.post("/draft/pick", json={"team_id": t0, "symbol": "WV1"}).status_code == 200
+
+    contested = [_claim(client, league_id, t, "WV2") for t in (t0, t2, t1)]
+    outbid = _claim(client, league_id, t1, "WV3")
+    rich = _claim(client, league_id, t2, "WV3", bid_amount=7.5)
+    swap = _claim(client, league_id, t0, "WV4", drop_symbol="wv1")
+    taken = _claim(client, league_id, t2, "WV1")
+    bad_drop = _claim(client, league_id, t1, "WV4", drop_symbol="NOPE")
+    assert len(client.get(f"/free-agency/{league_id}/waivers").json()) == 8
+
+    r = client.post(f"/free-agency/{league_id}/waivers/run")
+    assert r.status_code == 200, r.text
+    report = r.json()
+    assert report["waiver_order"] == [t1, t0, t2]
+    assert (report["claims"], report["won"], report["lost"], report["invalid"]) == (8, 3, 4, 1)
+    assert report["wall_ms"] >= 0.0
+
+    by_id = {o["claim_id"]: o for o in report["results"]}
+    assert report["results"][0]["claim_id"] == rich  # highest bid goes first
+    assert (by_id[rich]["status"], by_id[rich]["bucket"], by_id[rich]["activated"]) == ("won", "MID_CAP", True)
+    assert (by_id[outbid]["status"], by_id[outbid]["reason"]) == ("lost", "claimed_by_higher_priority")
+    assert by_id[contested[2]]["status"] == "won"  # t1, first in waiver order
+    assert [by_id[c]["reason"] for c in contested[:2]] == ["claimed_by_higher_priority"] * 2
+    assert (by_id[swap]["status"], by_id[swap]["bucket"], by_id[swap]["drop_symbol"]) == ("won", "ETF", "WV1")
+    # a symbol dropped in this run is not claimable until the next one
+    assert (by_id[taken]["status"], by_id[taken]["reason"]) == ("lost", "already_rostered")
+    assert (by_id[bad_drop]["status"], by_id[bad_drop]["reason"]) == ("invalid", "drop_not_on_roster")
+
+    roster = {s["symbol"]: s for s in client.get(f"/draft/roster/{t0}").json()}
+    assert set(roster) == {"WV4"} and roster["WV4"]["is_active"] is True
+    assert roster["WV4"]["id"] == by_id[swap]["slot_id"]
+    avail = client.get("/players/search", params={"available_in_league": league_id}).json()
+    assert [p["symbol"] for p in avail if p["symbol"].startswith("WV")] == ["WV1"]
+
+    settled = client.get(f"/free-agency/{league_id}/waivers", params={"status": "won"}).json()
+    assert sorted(c["id"] for c in settled) == sorted([rich, contested[2], swap])
+    assert client.get(f"/free-agency/{league_id}/waivers").json() == []
+    again = client.post(f"/free-agency/{league_id}/waivers/run").json()
+    assert (again["claims"], again["results"]) == (0, [])
+
+
+def test_waiver_run_is_one_batch_of_reads(client, db_session, sql_statements):
+    league_id, (t0, t1, _) = _league(client, "Waivers batch")
+    seeded = client.post(f"/teams/{t1}/debug/seed-active", json={"counts": {"LARGE_CAP": 14}})
+    assert seeded.status_code == 200, seeded.text
+    full = _claim(client, league_id, t1, "WVX")
+    for sym in ("WV1", "WV2", "WV3", "WV4"):
+        _claim(client, league_id, t0, sym)
+
+    with sql_statements() as stmts:
+        run_waivers(db_session, league_id)
+    report = db_session.query(models.WaiverClaim).filter(models.WaiverClaim.id == full).one()
+    assert (report.status, report.reason) == ("lost", "roster_full")
+
+    reads = [s for s in stmts if s.lstrip().upper().startswith("SELECT")]
+    assert sum("FROM roster_slots" in s for s in reads) == 1
+    assert sum("FROM securities" in s for s in reads) == 1
+    roster = client.get(f"/draft/roster/{t0}").json()
+    assert sorted((s["symbol"], s["is_active"]) for s in roster) == [
+        ("WV1", True),
+        ("WV2", True),
+        ("WV3", True),
+        ("WV4", True),
+    ]
+
+
+def test_waiver_claim_validation(client):
+    league_id, (t0, _, _) = _league(client, "Waivers validation")
+    other = client.post("/leagues/", json={"name": "Waivers other"}).json()["id"]
+    stranger = client.post(f"/leagues/{other}/join", json={"name": "X", "owner": "o"}).json()["id"]
+
+    body = {"league_id": league_id, "team_id": stranger, "player_id": 1}
+    assert client.post(f"/free-agency/{league_id}/waivers", json=body).status_code == 404
+    body = {"league_id": other, "team_id": t0, "player_id": 1}
+    assert client.post(f"/free-agency/{league_id}/waivers", json=body).status_code == 400
+    body = {"league_id": league_id, "team_id": t0, "player_id": 1, "bid_amount": -1}
+    assert client.post(f"/free-agency/{league_id}/waivers", json=body).status_code == 400
+    assert client.post("/free-agency/999999/waivers/run").status_code == 404
+
+    body = {"league_id": league_id, "team_id": t0, "player_id": 42, "primary_bucket": "small_cap"}
+    claim = client.post(f"/free-agency/{league_id}/waivers", json=body).json()
+    assert (claim["symbol"], claim["bucket_hint"]) == ("PID42", "SMALL_CAP")
+    result = client.post(f"/free-agency/{league_id}/waivers/run").json()["results"][0]
+    assert (result["status"], result["bucket"], result["activated"]) == ("won", "SMALL_CAP", True)
+
+
+def test_overlapping_runs_settle_each_claim_once(client, db_session, engine):
+    league_id, (t0, t1, _) = _league(client, "Waivers overlap")
+    first = _claim(client, league_id, t0, "WV1")
+    second = _claim(client, league_id, t1, "WV1")
+
+    with Session(bind=engine) as other:  # another worker's run has taken the queue
+        taken = waivers._claim_pending(other, league_id)
+        assert sorted(c.id for c in taken) == [first, second]
+        listed = client.get(f"/free-agency/{league_id}/waivers", params={"status": "processing"}).json()
+        assert [(c["id"], c["reason"]) for c in listed] == [(first, None), (second, None)]
+        assert run_waivers(db_session, league_id)["claims"] == 0
+        report = waivers._settle(other, league_id, taken, 0.0)
+    assert [(r["claim_id"], r["status"]) for r in report["results"]] == [(first, "won"), (second, "lost")]
+    assert [s["symbol"] for s in client.get(f"/draft/roster/{t1}").json()] == []
+
+
+def test_failed_run_puts_claims_back(client, db_session, monkeypatch):
+    league_id, (t0, _, _) = _league(client, "Waivers failure")
+    claim_id = _claim(client, league_id, t0, "WV2")
+
+    def boom(*_args):
+        raise RuntimeError("registry down")
+
+    monkeypatch.setattr(waivers, "resolve_buckets_db_first", boom)
+    with pytest.raises(RuntimeError):
+        run_waivers(db_session, league_id)
+    pending = client.get(f"/free-agency/{league_id}/waivers").json()
+    assert [(c["id"], c["status"], c["reason"]) for c in pending] == [(claim_id, "pending", None)]
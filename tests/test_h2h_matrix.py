@@ -204,3 +204,31 @@ def test_h2h_matrix(client):
             # pf/pa mirrored
             assert abs(a["pf"] - b["pa"]) < 1e-9
             assert abs(a["pa"] - b["pf"]) < 1e-9
+
+
+def test_h2h_sparse_and_columnar_match_dense(client, league_with_teams):
+    league_id, _, _ = league_with_teams(6)
+    assert client.post(f"/schedule/season/{league_id}").status_code == 200
+    assert client.post(f"/standings/{league_id}/close_season").status_code == 200
+
+    def get(fmt):
+        r = client.get(f"/analytics/{league_id}/h2h_matrix", params={"format": fmt})
+        assert r.status_code == 200, r.text
+        return r.json()
+
+    dense, sparse, columnar = get("dense"), get("sparse"), get("columnar")
+    team_ids = [t["team_id"] for t in dense["teams"]]
+    n = len(team_ids)
+    M = dense["matrix"]
+
+    stats = sparse["fields"][2:]
+    expected = [
+        [team_ids[i], team_ids[j], *(M[i][j][s] for s in stats)] for i in range(n) for j in range(n) if M[i][j]["gp"]
+    ]
+    assert sparse["pairs"] == expected
+    assert 0 < len(expected) < n * n
+
+    for s in stats:
+        assert columnar["stats"][s] == [M[i][j][s] for i in range(n) for j in range(n)]
+
+    assert client.get(f"/analytics/{league_id}/h2h_matrix", params={"format": "xml"}).status_code == 400
@@ -0,0 +1,62 @@
+# tests/test_idempotency_backends.py
+import time
+
+from fantasy_stocks.utils.idempotency import (
+    DBIdempotencyBackend,
+    MemoryIdempotencyBackend,
+    set_idempotency_backend,
+)
+
+
+def test_memory_backend_lru_ttl_and_caps():
+    b = MemoryIdempotencyBackend(ttl_seconds=60, max_entries=2, max_bytes=1000)
+    b.set("a", '{"n":1}')
+    b.set("b", '{"n":2}')
+    assert b.get("a") == '{"n":1}'  # a is now most recent
+    b.set("c", '{"n":3}')  # entry cap evicts b
+    assert b.get("b") is None
+    assert b.stats() == {"hits": 1, "misses": 1, "evictions": 1, "entries": 2, "bytes": 14}
+
+    b.set("big", "x" * 2000)  # larger than the byte cap: not stored
+    assert b.get("big") is None
+    b.set("wide", "é" * 600)  # 600 characters, but 1200 bytes encoded
+    assert b.get("wide") is None
+
+    short = MemoryIdempotencyBackend(ttl_seconds=0.01)
+    short.set("k", "{}")
+    time.sleep(0.02)
+    assert short.get("k") is None
+    assert short.stats()["evictions"] == 1
+
+
+def test_db_backend_is_shared_between_workers_and_replays_endpoint(client, engine):
+    worker_a = DBIdempotencyBackend(engine, ttl_seconds=60)
+    worker_b = DBIdempotencyBackend(engine, ttl_seconds=60)
+    worker_a.set("shared", '{"ok":true}')
+    assert worker_b.get("shared") == '{"ok":true}'
+    assert worker_b.get("other") is None
+    assert worker_b.stats() == {"hits": 1, "misses": 1, "evictions": 0}
+
+    expired = DBIdempotencyBackend(engine, ttl_seconds=-1)
+    expired.set("gone", "{}")
+    assert expired.get("gone") is None
+    before = expired.stats()["evictions"]
+    expired.set("gone", "{}")  # replacing the key's own row is not an eviction
+    assert expired.stats()["evictions"] == before
+    before = worker_a.stats()["evictions"]
+    worker_a.set("shared", '{"ok":true}')  # purges the expired row
+    assert worker_a.stats()["evictions"] == before + 1
+
+    r = client.post("/leagues/", json={"name": f"idem-{time.time_ns()}"})
+    league_id = r.json()["id"]
+    previous = set_idempotency_backend(worker_a)
+    try:
+        headers = {"Idempotency-Key": "close-1"}
+        first = client.post(f"/standings/{league_id}/close_week", headers=headers)
+        assert first.status_code == 200, first.text
+        set_idempotency_backend(worker_b)  # retry lands on another worker
+        again = client.post(f"/standings/{league_id}/close_week", headers=headers)
+        assert again.json() == first.json()
+        assert worker_b.stats()["hits"] == 2
+    finally:
+        set_idempotency_backend(previous)
@@ -0,0 +1,104 @@
+# tests/test_jobs.py
+
+from fantasy_stocks import models
+from fantasy_stocks.routers.scoring import _simulate_season
+from fantasy_stocks.services.jobs import job_queue
+
+
+def _finished(client, job_id: str) -> dict:
+    job_queue.wait(job_id, timeout=30)
+    r = client.get(f"/jobs/{job_id}")
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_simulate_season_async_reports_progress_and_result(client, db_session, league_with_teams):
+    league_id, _, _ = league_with_teams(4)
+    assert client.post(f"/schedule/season/{league_id}").status_code == 200
+    n_weeks = len({w for (w,) in db_session.query(models.Match.week).filter(models.Match.league_id == league_id)})
+
+    headers = {"Idempotency-Key": f"sim-{league_id}"}
+    r = client.post(f"/scoring/simulate_season/{league_id}?async=true", headers=headers)
+    assert r.status_code == 202, r.text
+    job_id = r.json()["id"]
+    assert r.json()["kind"] == "simulate_season"
+
+    job = _finished(client, job_id)
+    assert job["status"] == "succeeded", job
+    assert job["progress"] == 1.0
+    assert job["started_at"] and job["finished_at"]
+    assert len(job["result"]["closed_weeks"]) == n_weeks
+    assert job["message"] == f"closed {job['result']['closed_weeks'][-1]['week']}"
+
+    db_session.expire_all()
+    open_matches = (
+        db_session.query(models.Match)
+        .filter(models.Match.league_id == league_id, models.Match.home_points.is_(None))
+        .count()
+    )
+    assert open_matches == 0
+
+    # same Idempotency-Key -> same job, nothing re-run
+    again = client.post(f"/scoring/simulate_season/{league_id}?async=true", headers=headers)
+    assert again.status_code == 202
+    assert again.json()["id"] == job_id
+
+
+def test_simulate_season_reports_each_week(client, db_session, league_with_teams):
+    league_id, _, _ = league_with_teams(4)
+    assert client.post(f"/schedule/season/{league_id}").status_code == 200
+    seen: list[tuple[int, int, str | None]] = []
+    result = _simulate_season(db_session, db_session.get(models.League, league_id), lambda *p: seen.append(p))
+
+    weeks = [w["week"] for w in result["closed_weeks"]]
+    assert len(weeks) > 1
+    assert seen == [(i, len(weeks), f"closed {wk}") for i, wk in enumerate(weeks, start=1)]
+
+
+def test_close_season_and_advance_async(client, league_with_teams):
+    league_id, _, week = league_with_teams(4)
+
+    headers = {"Idempotency-Key": f"cs-{league_id}"}
+    r = client.post(f"/standings/{league_id}/close_season?async=true", headers=headers)
+    assert r.status_code == 202, r.text
+    job = _finished(client, r.json()["id"])
+    assert job["status"] == "succeeded", job
+    assert job["result"] == {"ok": True, "weeks": [week], "matches_scored": 2}
+    assert job["message"] == f"scored {week}"
+
+    # a retry replays the same job as it stands now, not the queued snapshot
+    again = client.post(f"/standings/{league_id}/close_season?async=true", headers=headers)
+    assert again.status_code == 202, again.text
+    assert again.json() == job
+
+    r = client.post(f"/season/{league_id}/advance?async=true")
+    assert r.status_code == 202, r.text
+    job = _finished(client, r.json()["id"])
+    assert job["status"] == "succeeded", job
+    assert job["result"]["action"] == "generated_playoffs"
+
+
+def test_failed_job_records_error(client, db_session):
+    def boom(db, progress):
+        progress(1, 2, "half way")
+        raise RuntimeError("kaboom")
+
+    job = job_queue.submit(db_session, "test_boom", boom)
+    body = _finished(client, job.id)
+    assert body["status"] == "failed"
+    assert body["error"] == "RuntimeError: kaboom"
+    assert body["progress"] == 0.5
+
+    assert client.get("/jobs/does-not-exist").status_code == 404
+
+
+def test_startup_fails_jobs_left_unfinished(db_session, engine):
+    for status in ("queued", "running", "succeeded"):
+        db_session.add(models.Job(id=f"orphan-{status}", kind="test_orphan", status=status, progress=0.0))
+    db_session.commit()
+
+    assert job_queue.fail_interrupted(engine) >= 2
+    db_session.expire_all()
+    jobs = {j.id: j for j in db_session.query(models.Job).filter(models.Job.kind == "test_orphan")}
+    assert [jobs[f"orphan-{s}"].status for s in ("queued", "running", "succeeded")] == ["failed", "failed", "succeeded"]
+    assert jobs["orphan-running"].error.startswith("interrupted") and jobs["orphan-running"].finished_at
@@ -0,0 +1,38 @@
+# tests/test_league_analytics.py
+
+from fantasy_stocks.logic.analytics import LeagueAnalytics, last5_from, streak_from
+from fantasy_stocks.logic.scoring import simulate_season_with_proj_points
+
+
+def test_analytics_endpoints_load_matches_once(client, db_session, league_with_teams, sql_statements):
+    league_id, team_ids, _ = league_with_teams(4)
+    r = client.post(f"/schedule/season/{league_id}")
+    assert r.status_code == 200, r.text
+    simulate_season_with_proj_points(db_session, league_id)
+
+    for path in ("power_rankings", "insights", "elo?k=24"):
+        with sql_statements() as stmts:
+            r = client.get(f"/standings/{league_id}/{path}")
+        assert r.status_code == 200, r.text
+        assert sum("FROM matches" in s for s in stmts) == 1, path
+
+    la = LeagueAnalytics(db_session, league_id)
+    table = {row["team_id"]: row for row in client.get(f"/standings/{league_id}/table").json()}
+    for tid in team_ids:
+        rec = la.record(tid)
+        assert (rec["wins"], rec["losses"], rec["ties"], rec["gp"]) == (
+            table[tid]["wins"],
+            table[tid]["losses"],
+            table[tid]["ties"],
+            table[tid]["games_played"],
+        )
+        assert abs(la.pf[tid] - table[tid]["points_for"]) < 1e-9
+    # Elo is zero-sum
+    assert abs(sum(la.elo.values()) - 1500.0 * len(team_ids)) < 1e-6
+
+
+def test_streak_and_last5_helpers():
+    assert streak_from([]) == ""
+    assert streak_from(["W", "L", "L"]) == "L2"
+    assert last5_from([]) == "0-0-0"
+    assert last5_from(["L", "W", "W", "T", "L", "W"]) == "3-1-1"
@@ -0,0 +1,67 @@
+# tests/test_league_version.py
+import time
+
+from fantasy_stocks import models
+from fantasy_stocks.services import league_version
+
+
+def test_writes_publish_version_changes(client, db_session, league_with_teams):
+    league_id, team_ids, week = league_with_teams(2)
+    events: list[tuple[int, int]] = []
+
+    with league_version.subscribe(league_id, lambda lid, v: events.append((lid, v))):
+        # draft pick
+        r = client.post("/draft/pick", json={"team_id": team_ids[0], "symbol": "LV1"})
+        assert r.status_code == 200, r.text
+        # price ingest for a rostered symbol (BS0 is on both rosters)
+        r = client.post("/prices/bulk", json=[{"symbol": "BS0", "date": "2025-09-15", "open": 1.0, "close": 2.0}])
+        assert r.status_code == 200, r.text
+        # close_week through the standings router
+        r = client.post(f"/standings/{league_id}/close_week")
+        assert r.status_code == 200, r.text
+
+    assert len(events) >= 3
+    assert [v for _, v in events] == sorted(v for _, v in events)
+    assert events[-1] == (league_id, league_version.current(db_session, league_id))
+
+    # closed subscription: no more events
+    n = len(events)
+    client.post(f"/teams/{team_ids[1]}/roster/active", json={"symbol": "LV2", "bucket": "ETF"})
+    assert len(events) == n
+
+
+def test_rollback_discards_touch_and_listener_errors_are_isolated(client, db_session):
+    r = client.post("/leagues/", json={"name": f"lv-{time.time_ns()}"})
+    league_id = r.json()["id"]
+    v = league_version.current(db_session, league_id)
+
+    league_version.touch(db_session, league_id)
+    db_session.rollback()
+    db_session.commit()
+    assert league_version.current(db_session, league_id) == v
+
+    seen: list[int] = []
+
+    def _boom(lid: int, version: int) -> None:
+        raise RuntimeError("listener bug")
+
+    with league_version.subscribe(None, _boom), league_version.subscribe(league_id, lambda lid, ver: seen.append(ver)):
+        db_session.add(models.Team(league_id=league_id, name="LV team"))
+        league_version.touch(db_session, league_id)
+        db_session.commit()
+    assert seen == [v + 1]
+
+
+def test_mode_and_settings_changes_advance_the_version(client, db_session):
+    league_id = client.post("/leagues/", json={"name": f"lv-mode-{time.time_ns()}"}).json()["id"]
+    v0 = league_version.current(db_session, league_id)
+
+    assert client.patch(f"/leagues/{league_id}/mode", json={"scoring_mode": "LIVE"}).status_code == 200
+    v1 = league_version.current(db_session, league_id)
+    assert v1 > v0
+
+    league = db_session.get(models.League, league_id)
+    league.roster_slots = 3  # drifted from the fixed rules; PATCH /settings puts it back
+    db_session.commit()
+    assert client.patch(f"/leagues/{league_id}/settings", json={}).status_code == 200
+    assert league_version.current(db_session, league_id) > v1
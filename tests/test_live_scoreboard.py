@@ -0,0 +1,116 @@
+# tests/test_live_scoreboard.py
+import asyncio
+import json
+
+from sqlalchemy.orm import Session
+
+from fantasy_stocks import models
+from fantasy_stocks.logic.scoring import close_week
+from fantasy_stocks.services import data_version
+from fantasy_stocks.services.scoreboard import ScoreboardHub
+
+
+def _read_events(client, path: str) -> list[tuple[str, dict]]:
+    events = []
+    with client.stream("GET", path) as r:
+        assert r.status_code == 200, r.read()
+        assert r.headers["content-type"].startswith("text/event-stream")
+        for block in r.read().decode().split("\n\n"):
+            fields = dict(line.split(": ", 1) for line in block.splitlines() if line and not line.startswith(":"))
+            if fields:
+                events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_stream_starts_with_live_snapshot(client, db_session, league_with_teams):
+    league_id, team_ids, week = league_with_teams(4, proj=2.0)
+
+    [(kind, data)] = _read_events(client, f"/live/{league_id}/{week}/stream?max_events=1")
+    assert kind == "snapshot"
+    assert len(data["matchups"]) == 2
+    for m in data["matchups"]:
+        assert m["final"] is False
+        assert m["home_points"] == 2.0 * ((team_ids.index(m["home_team_id"]) % 4) + 1)
+        assert m["away_team_name"].startswith("T")
+
+    close_week(db_session, league_id, week)
+    [(_, data)] = _read_events(client, f"/live/{league_id}/{week}/stream?max_events=1")
+    assert all(m["final"] for m in data["matchups"])
+
+    assert client.get("/live/999999/2025-W01/stream").status_code == 404
+    assert client.get(f"/live/{league_id}/not-a-week/stream").status_code == 400
+    assert client.get("/live/stats").json()["scoreboard"]["channels"] == 0
+
+
+def test_hub_computes_once_per_change_and_fans_out(db_session, engine, league_with_teams):
+    league_id, _, week = league_with_teams(4)
+    hub = ScoreboardHub(queue_size=4)
+
+    async def scenario():
+        a = await hub.subscribe(engine, league_id, week)
+        b = await hub.subscribe(engine, league_id, week)
+        assert hub.stats() == {"channels": 1, "subscribers": 2, "computes": 1}
+        assert (await a.queue.get())["event"] == "snapshot"
+        assert (await b.queue.get())["event"] == "snapshot"
+
+        close_week(db_session, league_id, week)  # commit bumps the league version
+        deltas = [await asyncio.wait_for(s.queue.get(), 5) for s in (a, b)]
+        assert deltas[0] is deltas[1]
+        assert deltas[0]["event"] == "delta"
+        assert len(deltas[0]["matchups"]) == 2 and all(m["final"] for m in deltas[0]["matchups"])
+        assert hub.computes == 2
+
+        hub.unsubscribe(a)
+        hub.unsubscribe(b)
+        assert hub.stats()["channels"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_changes_committed_by_another_worker_reach_the_stream(engine, league_with_teams):
+    league_id, _, week = league_with_teams(2)
+    hub = ScoreboardHub(poll_interval=0.02)
+
+    async def scenario():
+        sub = await hub.subscribe(engine, league_id, week)
+        assert (await sub.queue.get())["event"] == "snapshot"
+
+        # a write from another process: shared version advances, no in-process notification
+        with Session(bind=engine) as other:
+            other.query(models.Match).filter(models.Match.league_id == league_id).update(
+                {models.Match.home_points: 5.0, models.Match.away_points: 1.0}
+            )
+            data_version.advance(other, f"league:{league_id}")
+            other.commit()
+
+        event = await asyncio.wait_for(sub.queue.get(), 5)
+        assert event["event"] == "delta"
+        assert [(m["home_points"], m["final"]) for m in event["matchups"]] == [(5.0, True)]
+        computes = hub.computes
+        await asyncio.sleep(0.1)  # unchanged version: polls do not recompute
+        assert hub.computes == computes
+        hub.unsubscribe(sub)
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_is_resynced_with_a_snapshot(client, db_session, engine, league_with_teams):
+    league_id, team_ids, week = league_with_teams(2)
+    hub = ScoreboardHub(queue_size=1)
+
+    async def scenario():
+        sub = await hub.subscribe(engine, league_id, week)  # snapshot fills the queue and is never read
+        r = client.delete(f"/teams/{team_ids[1]}/roster/active/BS0")
+        assert r.status_code in (200, 204), r.text
+        for _ in range(100):
+            if sub.resyncs:
+                break
+            await asyncio.sleep(0.01)
+        assert sub.resyncs == 1
+        assert sub.queue.qsize() == 1
+        event = sub.queue.get_nowait()
+        assert event["event"] == "snapshot"
+        assert sorted(m["away_points"] + m["home_points"] for m in event["matchups"]) == [4.0]
+        hub.unsubscribe(sub)
+
+    asyncio.run(scenario())
@@ -0,0 +1,76 @@
+# tests/test_live_scores.py
+from datetime import date, timedelta
+
+from sqlalchemy.orm import Session
+
+from fantasy_stocks import models
+from fantasy_stocks.logic.scoring import week_points
+from fantasy_stocks.services import data_version
+
+WEEK = "2031-W10"
+MONDAY = date.fromisocalendar(2031, 10, 1)
+
+
+def _prices(client, symbol: str, day: int, open_: float, close: float) -> None:
+    d = (MONDAY + timedelta(days=day)).isoformat()
+    r = client.post("/prices/bulk", json=[{"symbol": symbol, "date": d, "open": open_, "close": close}])
+    assert r.status_code == 200, r.text
+
+
+def _totals(client, league_id: int) -> dict[int, float]:
+    r = client.get(f"/live/{league_id}/{WEEK}")
+    assert r.status_code == 200, r.text
+    return {t["team_id"]: round(t["points"], 6) for t in r.json()["teams"]}
+
+
+def test_intraday_totals_follow_each_price_day_without_rescanning(
+    client, db_session, league_with_teams, sql_statements
+):
+    league_id, team_ids, _ = league_with_teams(4)
+    client.patch(f"/leagues/{league_id}/mode", json={"scoring_mode": "LIVE"})
+    assert _totals(client, league_id) == dict.fromkeys(team_ids, 0.0)
+
+    _prices(client, "BS0", 0, 100.0, 101.0)  # Monday: +1% for everyone (all teams start BS0)
+    assert _totals(client, league_id) == dict.fromkeys(team_ids, 1.0)
+
+    _prices(client, "BS1", 0, 50.0, 52.0)
+    _prices(client, "BS1", 1, 52.0, 55.0)  # Tuesday: BS1 week-to-date +10%
+
+    with sql_statements() as stmts:
+        body = client.get(f"/live/{league_id}/{WEEK}").json()
+    assert not any("FROM prices" in s or "FROM weekly_returns" in s for s in stmts)
+    assert body["price_updates"] == 3
+
+    totals = {t["team_id"]: round(t["points"], 6) for t in body["teams"]}
+    assert totals == {team_ids[0]: 1.0, team_ids[1]: 11.0, team_ids[2]: 11.0, team_ids[3]: 11.0}
+
+    league = db_session.get(models.League, league_id)
+    fresh = week_points(db_session, set(team_ids), models.ScoringMode.LIVE, WEEK, starters_limit=league.starters)
+    assert {tid: round(p, 6) for tid, p in fresh.items()} == totals
+
+    # lineup change: the next read picks it up without losing tracked returns
+    r = client.delete(f"/teams/{team_ids[1]}/roster/active/BS0")
+    assert r.status_code == 204, r.text
+    assert _totals(client, league_id)[team_ids[1]] == 10.0
+
+
+def test_ingest_by_another_worker_reaches_the_totals(client, engine, league_with_teams):
+    league_id, team_ids, _ = league_with_teams(2)
+    client.patch(f"/leagues/{league_id}/mode", json={"scoring_mode": "LIVE"})
+    _prices(client, "BS0", 0, 100.0, 102.0)
+    before = _totals(client, league_id)
+    assert before[team_ids[0]] == 2.0
+
+    # another worker's ingest: new weekly cell and a newer league version, no apply_returns here
+    with Session(bind=engine) as other:
+        other.query(models.WeeklyReturn).filter_by(symbol="BS0", iso_week=WEEK).update({"return_pct": 5.0})
+        data_version.advance(other, f"league:{league_id}")
+        other.commit()
+    after = _totals(client, league_id)
+    assert {tid: round(after[tid] - before[tid], 6) for tid in team_ids} == dict.fromkeys(team_ids, 3.0)
+
+
+def test_live_totals_validation(client, league_with_teams):
+    league_id, _, _ = league_with_teams(2)
+    assert client.get(f"/live/{league_id}/not-a-week").status_code == 400
+    assert client.get(f"/live/999999/{WEEK}").status_code == 404
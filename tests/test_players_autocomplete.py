@@ -0,0 +1,94 @@
+# tests/test_players_autocomplete.py
+from sqlalchemy.orm import Session
+
+from fantasy_stocks import models
+from fantasy_stocks.services.catalog import catalog
+
+CATALOG = [
+    {"symbol": "APP", "name": "AppLovin", "adp": 30.0, "proj_points": 9.0, "market_cap": 9e10},
+    {"symbol": "AAPL", "name": "Apple Inc", "adp": 1.0, "proj_points": 20.0, "market_cap": 3e12},
+    {"symbol": "APPN", "name": "Appian Corp", "adp": 80.0, "proj_points": 4.0},
+    {"symbol": "MAPL", "name": "Big Apple Co", "adp": 50.0, "proj_points": 6.0, "market_cap": 1e9},
+    {"symbol": "APD", "name": "Air Products", "adp": 12.0, "proj_points": 11.0, "market_cap": 6e10},
+    {"symbol": "MSFT", "name": "Microsoft", "adp": 2.0, "proj_points": 19.0, "market_cap": 2.9e12},
+]
+
+
+def _complete(client, q: str, **params) -> list[str]:
+    r = client.get("/players/autocomplete", params={"q": q, **params})
+    assert r.status_code == 200, r.text
+    return [row["symbol"] for row in r.json()]
+
+
+def test_autocomplete_ranks_symbols_then_names(client, db_session, sql_statements):
+    client.post("/players/reset")
+    assert client.post("/players/seed", json=CATALOG).status_code == 200
+
+    # exact symbol, symbol prefixes by adp, then name-word matches
+    assert _complete(client, "app") == ["APP", "APPN", "AAPL", "MAPL"]
+    assert _complete(client, "ap") == ["APD", "APP", "APPN", "AAPL", "MAPL"]
+    assert _complete(client, "ap", sort="proj_points") == ["APD", "APP", "APPN", "AAPL", "MAPL"]
+    assert _complete(client, "big app") == ["MAPL"]
+    assert _complete(client, "air prod") == ["APD"]
+    assert _complete(client, "zzz") == []
+
+    # empty prefix -> the sorted views (missing values last)
+    assert _complete(client, "", limit=3) == ["AAPL", "MSFT", "APD"]
+    assert _complete(client, "", sort="market_cap")[-1] == "APPN"
+    assert _complete(client, "", sort="symbol", limit=2) == ["AAPL", "APD"]
+    assert client.get("/players/autocomplete", params={"sort": "name"}).status_code == 400
+
+    row = client.get("/players/autocomplete", params={"q": "appn"}).json()[0]
+    assert row == {
+        "symbol": "APPN",
+        "name": "Appian Corp",
+        "is_etf": None,
+        "market_cap": None,
+        "sector": None,
+        "primary_bucket": None,
+        "adp": 80.0,
+        "proj_points": 4.0,
+    }
+
+    # served from memory: no SQL beyond the session's own bookkeeping
+    with sql_statements() as stmts:
+        _complete(client, "ap")
+    assert not any("securities" in s for s in stmts)
+
+
+def test_snapshot_is_swapped_after_ingest(client, db_session):
+    client.post("/players/reset")
+    assert client.post("/players/seed", json=CATALOG).status_code == 200
+    before = catalog.get(db_session)
+    rebuilds = client.get("/players/catalog/stats").json()["rebuilds"]
+
+    csv_text = "symbol,name,adp\nAPPX,Apex Partners,0.5\nAPP,Renamed Co,30\n"
+    assert client.post("/players/ingest_csv", json={"csv": csv_text}).status_code == 200
+    assert _complete(client, "ap")[0] == "APPX"
+    assert "APP" not in _complete(client, "applovin")
+
+    # the old snapshot is untouched; readers holding it keep a consistent view
+    assert "APPX" not in before.row_by_symbol
+    assert before.names[before.row_by_symbol["APP"]] == "AppLovin"
+
+    stats = client.get("/players/catalog/stats").json()
+    assert stats["rows"] == len(CATALOG) + 1
+    assert stats["rebuilds"] == rebuilds + 1
+    assert stats["bytes"] > 0 and stats["build_ms"] >= 0.0 and stats["tokens"] > 0
+
+
+def test_ingest_by_another_worker_is_picked_up(client, engine):
+    client.post("/players/reset")
+    assert client.post("/players/seed", json=CATALOG).status_code == 200
+    assert _complete(client, "zen") == []
+
+    # another process ingests: it advances the shared catalog version, this process never rebuilt
+    with Session(bind=engine) as other:
+        other.add(models.Security(symbol="ZEN", name="Zenith Labs", adp=5.0))
+        catalog.touch(other)
+        other.commit()
+
+    assert _complete(client, "zen") == ["ZEN"]
+    rebuilds = client.get("/players/catalog/stats").json()["rebuilds"]
+    assert _complete(client, "zen") == ["ZEN"]
+    assert client.get("/players/catalog/stats").json()["rebuilds"] == rebuilds
@@ -0,0 +1,136 @@
+# tests/test_players_pagination.py
+import pytest
+from sqlalchemy import event
+
+from fantasy_stocks.logic.player_query import KEYSET_INDEXES, install_indexes
+
+CATALOG = [
+    {"symbol": f"PG{i:02d}", "name": f"Paged {i}", "market_cap": cap, "adp": adp, "proj_points": pts}
+    for i, (cap, adp, pts) in enumerate(
+        [
+            (5e9, 10.0, 7.0),
+            (None, 3.0, 7.0),
+            (5e9, None, 2.0),
+            (8e10, 3.0, None),
+            (1e9, 25.0, 9.5),
+            (None, None, 7.0),
+            (3e11, 1.0, 12.0),
+            (5e9, 3.0, None),
+            (2e10, 40.0, 1.0),
+            (1e9, None, 9.5),
+            (7e9, 8.0, 4.0),
+        ]
+    )
+]
+
+
+def _page_all(client, url: str, limit: int, **params) -> list[str]:
+    symbols: list[str] = []
+    cursor = None
+    for _ in range(50):
+        r = client.get(url, params={**params, "limit": limit, **({"cursor": cursor} if cursor else {})})
+        assert r.status_code == 200, r.text
+        symbols += [row.get("symbol") or row.get("ticker") for row in r.json()]
+        cursor = r.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return symbols
+    raise AssertionError("paging did not terminate")
+
+
+def _expected(key: str, descending: bool) -> list[str]:
+    desc_by_default = key in ("market_cap", "proj_points")
+    present = [c for c in CATALOG if c[key] is not None]
+    # the symbol tie-break flips along with a non-default order
+    missing = sorted((c["symbol"] for c in CATALOG if c[key] is None), reverse=descending != desc_by_default)
+    if desc_by_default:
+        ordered = sorted(present, key=lambda c: (-c[key], c["symbol"]), reverse=not descending)
+    else:
+        ordered = sorted(present, key=lambda c: (c[key], c["symbol"]), reverse=descending)
+    ordered = [c["symbol"] for c in ordered]
+    return ordered + missing if descending else missing + ordered
+
+
+@pytest.fixture()
+def catalog(client):
+    client.post("/players/reset")
+    assert client.post("/players/seed", json=CATALOG).status_code == 200
+
+
+@pytest.mark.parametrize("key", ["market_cap", "adp", "proj_points"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_every_sort_pages_through_the_full_order(client, catalog, key, order):
+    one_page = _page_all(client, "/players/search", 200, sort=key, order=order)
+    assert one_page == _expected(key, order == "desc")
+    for limit in (1, 2, 4):
+        assert _page_all(client, "/players/search", limit, sort=key, order=order) == one_page
+
+
+def test_symbol_and_ranked_search_pages(client, catalog):
+    symbols = sorted(c["symbol"] for c in CATALOG)
+    assert _page_all(client, "/players/search", 3) == symbols
+    assert _page_all(client, "/players/search", 3, sort="symbol", order="desc") == symbols[::-1]
+    # relevance order: "PG01" exact first, then the symbol-prefix matches
+    ranked = _page_all(client, "/players/search", 2, q="pg01")
+    assert ranked == ["PG01"]
+    assert _page_all(client, "/players/search", 2, q="paged") == symbols
+
+
+def test_pages_are_stable_under_inserts(client, catalog):
+    r = client.get("/players/search", params={"sort": "adp", "limit": 4})
+    first = [row["symbol"] for row in r.json()]
+    # a row that sorts before the cursor must not shift the next page
+    client.post("/players/seed", json=[{"symbol": "AAEARLY", "adp": 0.5}])
+    r = client.get("/players/search", params={"sort": "adp", "limit": 50, "cursor": r.headers["X-Next-Cursor"]})
+    rest = [row["symbol"] for row in r.json()]
+    assert not set(first) & set(rest)
+    assert first + rest == _expected("adp", False)
+
+
+def test_free_agents_page_and_bad_cursors(client, catalog):
+    league_id = client.post("/leagues/", json={"name": "Paging FA"}).json()["id"]
+    team_id = client.post(f"/leagues/{league_id}/join", json={"name": "T", "owner": "o"}).json()["id"]
+    assert client.post("/draft/pick", json={"team_id": team_id, "symbol": "PG06"}).status_code == 200
+
+    url = f"/free-agency/{league_id}/players"
+    paged = _page_all(client, url, 3, sort="proj_points", q="paged")
+    assert paged == [s for s in _expected("proj_points", True) if s != "PG06"]
+
+    r = client.get("/players/search", params={"sort": "adp", "limit": 2})
+    cursor = r.headers["X-Next-Cursor"]
+    assert client.get("/players/search", params={"sort": "market_cap", "cursor": cursor}).status_code == 400
+    assert client.get("/players/search", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get(url, params={"sort": "adp", "order": "desc", "cursor": cursor}).status_code == 400
+
+
+def test_deep_pages_use_the_composite_index(client, catalog, engine):
+    r = client.get("/players/search", params={"sort": "market_cap", "limit": 3})
+    cursor = r.headers["X-Next-Cursor"]
+
+    seen: list[tuple[str, tuple]] = []
+
+    def _before(conn, cursor_, statement, parameters, context, executemany):
+        if "FROM securities" in statement:
+            seen.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _before)
+    try:
+        assert client.get("/players/search", params={"sort": "market_cap", "limit": 3, "cursor": cursor}).status_code
+    finally:
+        event.remove(engine, "before_cursor_execute", _before)
+
+    with engine.connect() as conn:
+        for statement, params in seen:
+            plan = " ".join(row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, params))
+            assert "ix_securities_market_cap_symbol" in plan, plan
+            assert "TEMP B-TREE" not in plan, plan
+
+
+def test_startup_adds_keyset_indexes_to_an_existing_table(engine):
+    with engine.begin() as conn:
+        for name in KEYSET_INDEXES:
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+    install_indexes(engine)
+    install_indexes(engine)  # idempotent
+    with engine.connect() as conn:
+        present = {row[0] for row in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert set(KEYSET_INDEXES) <= present
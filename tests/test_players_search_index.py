@@ -0,0 +1,83 @@
+# tests/test_players_search_index.py
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from fantasy_stocks import models
+from fantasy_stocks.db import Base
+from fantasy_stocks.services.search_index import search_index
+
+CATALOG = [
+    {"symbol": "SNPR", "name": "Snapper Inc"},
+    {"symbol": "APPN", "name": "Appian"},
+    {"symbol": "OTHR", "name": "Other Corp"},
+    {"symbol": "MAPL", "name": "Big Apple Co"},
+    {"symbol": "APP", "name": "AppLovin"},
+    {"symbol": "AAPL", "name": "Apple Inc"},
+]
+RANKED = ["APP", "APPN", "AAPL", "MAPL", "SNPR"]
+
+
+def _seed(client):
+    client.post("/players/reset")
+    r = client.post("/players/seed", json=CATALOG)
+    assert r.status_code == 200, r.text
+
+
+def _symbols(client, url: str, **params) -> list[str]:
+    r = client.get(url, params=params)
+    assert r.status_code == 200, r.text
+    return [row.get("symbol") or row.get("ticker") for row in r.json()]
+
+
+def test_search_is_ranked_and_served_from_the_index(client, sql_statements):
+    _seed(client)
+    with sql_statements() as stmts:
+        _symbols(client, "/players/search", q="app")
+    assert any("securities_fts MATCH" in s for s in stmts)
+
+    assert _symbols(client, "/players/search", q="app") == RANKED
+    assert _symbols(client, "/players/search", q="APP", sort="symbol") == sorted(RANKED)
+    # too short for trigrams: LIKE fallback with the same ranking
+    assert _symbols(client, "/players/search", q="ap") == ["APP", "APPN", "AAPL", "MAPL", "SNPR"]
+    assert _symbols(client, "/players/search", q='"%_') == []
+
+    league = client.post("/leagues/", json={"name": "SearchLeague"}).json()
+    assert _symbols(client, f"/free-agency/{league['id']}/players", q="app") == RANKED
+
+
+def test_fallback_matches_index_results(client, db_session, engine, sql_statements):
+    _seed(client)
+    indexed = _symbols(client, "/players/search", q="pple")
+    search_index._available[engine] = False
+    try:
+        with sql_statements() as stmts:
+            _symbols(client, "/players/search", q="pple")
+        assert not any("securities_fts" in s for s in stmts)
+        assert _symbols(client, "/players/search", q="pple") == indexed == ["AAPL", "MAPL"]
+    finally:
+        search_index._available.pop(engine)
+
+
+def test_index_follows_ingest_and_reset(client):
+    _seed(client)
+    r = client.post("/players/ingest_csv", json={"csv": "symbol,name\nSNPR,Snap Holdings\nNEWA,New Apparel\n"})
+    assert r.status_code == 200, r.text
+    assert _symbols(client, "/players/search", q="app") == ["APP", "APPN", "AAPL", "MAPL", "NEWA"]
+
+    client.post("/players/reset")
+    assert _symbols(client, "/players/search", q="app") == []
+
+
+def test_install_backfills_existing_catalog(tmp_path):
+    eng = create_engine(f"sqlite:///{tmp_path / 'catalog.db'}")
+    Base.metadata.create_all(bind=eng)
+    with Session(eng) as db:
+        db.add_all(models.Security(**row) for row in CATALOG)
+        db.commit()
+    try:
+        assert search_index.install(eng) is True
+        with eng.connect() as conn:
+            assert conn.exec_driver_sql("SELECT count(*) FROM securities_fts").scalar() == len(CATALOG)
+    finally:
+        search_index._available.pop(eng, None)
+        eng.dispose()
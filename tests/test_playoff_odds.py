@@ -0,0 +1,84 @@
+# tests/test_playoff_odds.py
+import pytest
+
+from fantasy_stocks import models
+from fantasy_stocks.logic.scoring import close_week_with_proj_points, simulate_season_with_proj_points
+from fantasy_stocks.routers.playoffs import _seed_order_by_tiebreakers
+
+
+@pytest.fixture()
+def season(client, league_with_teams):
+    """season(n_teams) -> (league_id, team_ids) with the full schedule generated."""
+
+    def make(n_teams: int) -> tuple[int, list[int]]:
+        league_id, team_ids, _ = league_with_teams(n_teams)
+        r = client.post(f"/schedule/season/{league_id}")
+        assert r.status_code == 200, r.text
+        return league_id, team_ids
+
+    return make
+
+
+def _odds(client, league_id: int, **params) -> dict:
+    r = client.get(f"/standings/{league_id}/playoff_odds", params=params)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_completed_season_reproduces_tiebreaker_seeding(client, db_session, season):
+    league_id, team_ids = season(6)
+    simulate_season_with_proj_points(db_session, league_id)
+
+    body = _odds(client, league_id, trials=50, seed=1)
+    assert body["remaining_matches"] == 0
+    seeds = _seed_order_by_tiebreakers(db_session, league_id)
+    by_team = {t["team_id"]: t for t in body["teams"]}
+    for pos, tid in enumerate(seeds, start=1):
+        assert by_team[tid]["expected_seed"] == pos
+        assert by_team[tid]["p_top4"] == (1.0 if pos <= 4 else 0.0)
+    # projections are constant, so the four-symbol team wins every bracket
+    assert by_team[team_ids[3]]["p_champion"] == 1.0
+
+
+def test_odds_are_seeded_and_sum_to_bracket_size(client, db_session, season):
+    league_id, team_ids = season(6)
+    weeks = sorted({w for (w,) in db_session.query(models.Match.week).filter(models.Match.league_id == league_id)})
+    close_week_with_proj_points(db_session, league_id, weeks[0])
+    # add spread to the score history so trials differ
+    for i, tid in enumerate(team_ids):
+        db_session.add(models.TeamScore(league_id=league_id, team_id=tid, period="2000-W01", points=float(i * 3)))
+    db_session.commit()
+
+    a = _odds(client, league_id, trials=400, seed=7)
+    b = _odds(client, league_id, trials=400, seed=7, x=1)  # distinct query string, same seed
+    assert [t["p_champion"] for t in a["teams"]] == [t["p_champion"] for t in b["teams"]]
+    assert a["remaining_matches"] == 3 * (len(weeks) - 1)
+    assert abs(sum(t["p_top4"] for t in a["teams"]) - 4.0) < 1e-9
+    assert abs(sum(t["p_champion"] for t in a["teams"]) - 1.0) < 1e-9
+    assert abs(sum(t["expected_seed"] for t in a["teams"]) - sum(range(1, 7))) < 1e-9
+    assert 0.0 < max(t["p_champion"] for t in a["teams"]) < 1.0
+
+
+def test_playoff_odds_validation(client, league_with_teams):
+    small, _, _ = league_with_teams(2)
+    assert client.get(f"/standings/{small}/playoff_odds").status_code == 400
+    assert client.get("/standings/999999/playoff_odds").status_code == 404
+
+
+def test_hundred_thousand_trials(client, season):
+    league_id, _ = season(6)
+    body = _odds(client, league_id, trials=100_000, seed=3)
+    assert body["trials"] == 100_000
+    assert abs(sum(t["p_champion"] for t in body["teams"]) - 1.0) < 1e-9
+    assert client.get(f"/standings/{league_id}/playoff_odds", params={"trials": 100_001}).status_code == 422
+
+
+def test_cached_odds_follow_schedule_changes_and_skip_unseeded_runs(client, league_with_teams):
+    league_id, _, _ = league_with_teams(4)
+    assert _odds(client, league_id, trials=50, seed=1)["remaining_matches"] == 2
+    assert client.post(f"/schedule/season/{league_id}", params={"weeks": 5}).status_code == 200
+    assert _odds(client, league_id, trials=50, seed=1)["remaining_matches"] == 12
+
+    seeded = client.get(f"/standings/{league_id}/playoff_odds", params={"trials": 50, "seed": 1})
+    unseeded = client.get(f"/standings/{league_id}/playoff_odds", params={"trials": 50})
+    assert "ETag" in seeded.headers and "ETag" not in unseeded.headers
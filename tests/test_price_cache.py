@@ -0,0 +1,78 @@
+# tests/test_price_cache.py
+from datetime import date
+
+from sqlalchemy.orm import Session
+
+from fantasy_stocks import models
+from fantasy_stocks.services.price_cache import PriceCache, price_cache
+from fantasy_stocks.services.pricing import get_week_returns
+
+
+def test_price_cache_reads_through_and_is_invalidated_by_ingest(client, db_session, engine, sql_statements):
+    # prices written outside the ingest endpoints: no weekly cell, so the cache loads them
+    db_session.add_all(
+        [
+            models.Price(symbol="PC1", date=date(2025, 6, 30), open=50.0, close=50.0),  # the week before
+            models.Price(symbol="PC1", date=date(2025, 7, 7), open=100.0, close=101.0),
+            models.Price(symbol="PC1", date=date(2025, 7, 11), open=None, close=110.0),
+        ]
+    )
+    db_session.commit()
+    week = "2025-W28"
+    monday, sunday = date(2025, 7, 7), date(2025, 7, 13)
+
+    before = client.get("/prices/cache/stats").json()
+    assert abs(get_week_returns(db_session, ["PC1"], week)["PC1"] - 10.0) < 1e-9
+
+    with sql_statements() as statements:
+        assert abs(get_week_returns(db_session, ["PC1"], week)["PC1"] - 10.0) < 1e-9
+    # the weekly_returns lookup comes first; the bars are served from memory
+    assert len(statements) == 1 and "FROM weekly_returns" in statements[0]
+
+    stats = client.get("/prices/cache/stats").json()
+    assert stats["misses"] == before["misses"] + 1
+    assert stats["hits"] == before["hits"] + 1
+    assert len(price_cache.peek_many(["PC1"], monday, sunday)["PC1"]) == 2  # only the week's bars
+
+    # ingest drops the cached series, next read sees the new close
+    r = client.post("/prices/bulk", json=[{"symbol": "PC1", "date": "2025-07-11", "open": None, "close": 120.0}])
+    assert r.status_code == 200, r.text
+    assert abs(get_week_returns(db_session, ["PC1"], week)["PC1"] - 20.0) < 1e-9
+
+    # a cell written by another worker wins over anything this process cached
+    price_cache.get_many(db_session, ["PC1"], monday, sunday)
+    with Session(bind=engine) as other:
+        other.query(models.WeeklyReturn).filter_by(symbol="PC1", iso_week=week).update({"return_pct": 30.0})
+        other.commit()
+    assert abs(get_week_returns(db_session, ["PC1"], week)["PC1"] - 30.0) < 1e-9
+
+
+def test_price_cache_evicts_least_recently_used_by_bytes(db_session):
+    db_session.add_all(
+        [
+            models.Price(symbol=f"EV{i}", date=date(2025, 7, 14 + d), open=1.0, close=2.0)
+            for i in range(3)
+            for d in range(3)
+        ]
+    )
+    db_session.commit()
+
+    window = (date(2025, 7, 14), date(2025, 7, 20))
+    cache = PriceCache(max_bytes=10**6)
+    one = cache.get_many(db_session, ["EV0"], *window)["EV0"]
+    assert len(one) == 3
+    cache.max_bytes = 2 * one.nbytes
+
+    cache.get_many(db_session, ["EV1"], *window)
+    cache.get_many(db_session, ["EV0"], *window)  # EV0 becomes most recent
+    cache.get_many(db_session, ["EV2"], *window)  # evicts EV1
+    assert set(cache.peek_many(["EV0", "EV1", "EV2"], *window)) == {"EV0", "EV2"}
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= stats["max_bytes"]
+
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+    assert price_cache.max_bytes > 0
@@ -0,0 +1,47 @@
+# tests/test_prices_bulk_upsert.py
+from datetime import date
+
+from fantasy_stocks import models
+
+
+def test_chunked_upsert_counts_are_exact(client, db_session):
+    rows = [
+        {"symbol": "cu1", "date": "2025-05-05", "open": 1.0, "close": 2.0},
+        {"symbol": "CU1", "date": "2025-05-06", "open": 2.0, "close": 3.0},
+        {"symbol": "CU2", "date": "2025-05-05", "open": 5.0, "close": 6.0},
+        # duplicate key in the same payload (next chunk): sequential upsert -> 1 update
+        {"symbol": "CU1", "date": "2025-05-05", "open": None, "close": 2.5},
+        {"symbol": "CU3", "date": "2025-05-05", "open": None, "close": 9.0},
+    ]
+    r = client.post("/prices/bulk?chunk_size=2", json=rows)
+    assert r.status_code == 200, r.text
+    assert r.json() == {"inserted": 4, "updated": 1}
+
+    db_session.expire_all()
+    row = db_session.query(models.Price).filter_by(symbol="CU1", date=date(2025, 5, 5)).one()
+    assert (row.open, row.close) == (1.0, 2.5)  # None open keeps the stored value
+
+    # mixed: one unchanged, one changed, one new
+    rows2 = [
+        {"symbol": "CU2", "date": "2025-05-05", "open": 5.0, "close": 6.0},
+        {"symbol": "CU3", "date": "2025-05-05", "open": 8.5, "close": 9.0},
+        {"symbol": "CU3", "date": "2025-05-06", "open": 9.0, "close": 9.5},
+    ]
+    r = client.post("/prices/bulk", json=rows2)
+    assert r.status_code == 200, r.text
+    assert r.json() == {"inserted": 1, "updated": 1}
+
+    r = client.post("/prices/bulk?chunk_size=0", json=rows2)
+    assert r.status_code == 422
+
+
+def test_upsert_statement_count_scales_with_chunks_not_rows(client, sql_statements):
+    def _count(payload: list[dict]) -> int:
+        with sql_statements() as stmts:
+            r = client.post("/prices/bulk?chunk_size=500", json=payload)
+            assert r.status_code == 200, r.text
+        return sum("prices" in s and "weekly_returns" not in s for s in stmts)
+
+    small = [{"symbol": f"SC{i}", "date": "2025-04-07", "open": 1.0, "close": 1.1} for i in range(3)]
+    large = [{"symbol": f"LC{i}", "date": "2025-04-07", "open": 1.0, "close": 1.1} for i in range(300)]
+    assert _count(small) == _count(large)
@@ -0,0 +1,47 @@
+# tests/test_prices_csv_streaming.py
+import gzip
+from io import BytesIO
+
+from fantasy_stocks import models
+
+
+def _upload(client, name: str, payload: bytes, chunk_size: int | None = None):
+    url = "/prices/csv" if chunk_size is None else f"/prices/csv?chunk_size={chunk_size}"
+    return client.post(url, files={"file": (name, BytesIO(payload), "application/octet-stream")})
+
+
+def test_csv_stream_in_small_batches_and_gzip(client):
+    lines = ["Symbol,Date,Open,Close"] + [f"ST{i},2025-03-0{3 + i % 5},{10 + i},{11 + i}" for i in range(7)]
+    text = "\n".join(lines) + "\n"
+
+    r = _upload(client, "prices.csv", text.encode("utf-8"), chunk_size=2)
+    assert r.status_code == 200, r.text
+    assert r.json() == {"inserted": 7, "updated": 0}
+
+    # same rows gzip-compressed, two changed closes
+    text2 = text.replace(",10,11", ",10,11.5").replace(",16,17", ",16,17.5")
+    r = _upload(client, "prices.csv.gz", gzip.compress(text2.encode("utf-8")), chunk_size=3)
+    assert r.status_code == 200, r.text
+    assert r.json() == {"inserted": 0, "updated": 2}
+
+
+def test_csv_stream_bad_row_after_flushed_batch_rolls_back(client, db_session):
+    text = "symbol,date,open,close\nRB1,2025-03-03,1,2\nRB2,2025-03-03,1,2\nRB3,2025-03-03,1,2\nRB4,not-a-date,1,2\n"
+    r = _upload(client, "prices.csv", text.encode("utf-8"), chunk_size=2)
+    assert r.status_code == 400
+    assert "Row 5: invalid date" in r.json()["detail"]
+
+    assert db_session.query(models.Price).filter(models.Price.symbol.in_(["RB1", "RB2", "RB3"])).count() == 0
+
+
+def test_csv_stream_rejects_bad_encoding_gzip_and_extension(client):
+    r = _upload(client, "prices.csv", b"symbol,date\n\xff\xfe,2025-03-03\n")
+    assert r.status_code == 400
+    assert "UTF-8" in r.json()["detail"]
+
+    r = _upload(client, "prices.csv.gz", b"definitely not gzip")
+    assert r.status_code == 400
+    assert "gzip" in r.json()["detail"]
+
+    r = _upload(client, "prices.txt", b"symbol,date\n")
+    assert r.status_code == 400
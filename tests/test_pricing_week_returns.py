@@ -0,0 +1,38 @@
+# tests/test_pricing_week_returns.py
+
+from fantasy_stocks.services.pricing import get_week_return_pct, get_week_returns
+
+
+def test_bulk_week_returns_match_single_symbol_in_constant_queries(client, db_session, sql_statements):
+    rows = [
+        # WR1: 50 -> 60 over the week (+20%), mid-week row ignored
+        {"symbol": "WR1", "date": "2025-10-06", "open": 50.0, "close": 51.0},
+        {"symbol": "WR1", "date": "2025-10-08", "open": 70.0, "close": 40.0},
+        {"symbol": "WR1", "date": "2025-10-10", "open": 59.0, "close": 60.0},
+        # outside the week: must not leak in
+        {"symbol": "WR1", "date": "2025-10-13", "open": 1.0, "close": 1000.0},
+        # WR2: missing open on first day falls back to close; single-day week
+        {"symbol": "WR2", "date": "2025-10-07", "open": None, "close": 40.0},
+        {"symbol": "WR2", "date": "2025-10-09", "open": 30.0, "close": None},
+        # WR3: zero open -> 0.0
+        {"symbol": "WR3", "date": "2025-10-06", "open": 0.0, "close": 5.0},
+    ]
+    r = client.post("/prices/bulk", json=rows)
+    assert r.status_code == 200, r.text
+
+    week = "2025-W41"  # Mon 2025-10-06 .. Sun 2025-10-12
+    symbols = ["WR1", "WR2", "WR3", "NOPRICE"]
+
+    with sql_statements() as statements:
+        bulk = get_week_returns(db_session, symbols, week)
+
+    # materialized-cell lookup + one grouped fallback query for NOPRICE
+    assert len(statements) <= 2
+    assert abs(bulk["WR1"] - 20.0) < 1e-9
+    assert abs(bulk["WR2"] - (-25.0)) < 1e-9
+    assert bulk["WR3"] == 0.0
+    assert bulk["NOPRICE"] == 0.0
+    for sym in symbols:
+        assert abs(get_week_return_pct(db_session, sym, week) - bulk[sym]) < 1e-12
+
+    assert get_week_returns(db_session, [], week) == {}
@@ -0,0 +1,79 @@
+# tests/test_response_cache.py
+from sqlalchemy.orm import Session
+
+from fantasy_stocks import models
+from fantasy_stocks.logic.scoring import close_week
+from fantasy_stocks.services import data_version, league_version
+
+
+def test_etag_304_without_db_until_league_changes(client, db_session, league_with_teams, sql_statements):
+    league_id, team_ids, week = league_with_teams(2)
+    path = f"/standings/{league_id}/table"
+
+    first = client.get(path)
+    assert first.status_code == 200, first.text
+    etag = first.headers["ETag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+
+    with sql_statements() as statements:
+        not_modified = client.get(path, headers={"If-None-Match": etag})
+        again = client.get(path)
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert again.json() == first.json()
+    # one version read per request, nothing else
+    assert len(statements) == 2 and all("FROM data_versions" in s for s in statements)
+
+    # scoring bumps the league version: the old tag no longer matches
+    v = league_version.current(db_session, league_id)
+    close_week(db_session, league_id, week)
+    assert league_version.current(db_session, league_id) == v + 1
+    scored = client.get(path, headers={"If-None-Match": etag})
+    assert scored.status_code == 200
+    assert scored.headers["ETag"] != etag
+    assert sum(row["games_played"] for row in scored.json()) == 2
+
+    # roster writes bump it too
+    v = league_version.current(db_session, league_id)
+    r = client.post(f"/teams/{team_ids[0]}/roster/active", json={"symbol": "BS3", "bucket": "LARGE_CAP"})
+    assert r.status_code == 201, r.text
+    assert league_version.current(db_session, league_id) == v + 1
+
+
+def test_writes_by_another_worker_retire_cached_bodies(client, db_session, engine, league_with_teams):
+    league_id, _, week = league_with_teams(2)
+    path = f"/standings/{league_id}/table"
+    first = client.get(path)
+    assert client.get(path, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    # another process scores the week: its commit advances the shared version,
+    # but none of this process's in-process listeners run
+    with Session(bind=engine) as other:
+        other.query(models.Match).filter(models.Match.league_id == league_id).update(
+            {models.Match.home_points: 3.0, models.Match.away_points: 1.0}
+        )
+        data_version.advance(other, f"league:{league_id}")
+        other.commit()
+    assert db_session.info.get("league_version_committed") is None
+
+    r = client.get(path, headers={"If-None-Match": first.headers["ETag"]})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != first.headers["ETag"]
+
+
+def test_cached_endpoints_emit_etags(client, db_session, league_with_teams):
+    league_id, _, week = league_with_teams(4)
+    close_week(db_session, league_id, week)
+
+    for path in (
+        f"/standings/{league_id}/power_rankings",
+        f"/standings/{league_id}/insights",
+        f"/analytics/{league_id}/h2h_matrix",
+        f"/records/{league_id}/all",
+    ):
+        r = client.get(path)
+        assert r.status_code == 200, r.text
+        r2 = client.get(path, headers={"If-None-Match": f'W/{r.headers["ETag"]}, "other"'})
+        assert r2.status_code == 304, path
+
+    assert client.get("/standings/999999/table").status_code == 404
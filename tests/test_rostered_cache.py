@@ -0,0 +1,86 @@
+# tests/test_rostered_cache.py
+from sqlalchemy.orm import Session
+
+from fantasy_stocks import models
+from fantasy_stocks.services import data_version
+from fantasy_stocks.services.rostered import rostered
+
+CATALOG = [{"symbol": s, "name": f"Rostered {s}", "primary_bucket": "LARGE_CAP"} for s in ("RC1", "RC2", "RC3", "RC4")]
+
+
+def _league(client, name: str, n_teams: int = 2) -> tuple[int, list[int]]:
+    client.post("/players/reset")
+    assert client.post("/players/seed", json=CATALOG).status_code == 200
+    league_id = client.post("/leagues/", json={"name": name}).json()["id"]
+    team_ids = [
+        client.post(f"/leagues/{league_id}/join", json={"name": f"T{i}", "owner": "o"}).json()["id"]
+        for i in range(n_teams)
+    ]
+    return league_id, team_ids
+
+
+def _available(client, league_id: int) -> list[str]:
+    r = client.get("/players/search", params={"available_in_league": league_id})
+    assert r.status_code == 200, r.text
+    fa = client.get(f"/free-agency/{league_id}/players")
+    assert [p["ticker"] for p in fa.json()] == [row["symbol"] for row in r.json()]
+    return [row["symbol"] for row in r.json()]
+
+
+def test_picks_claims_and_drops_update_the_set_without_reloads(client, sql_statements):
+    league_id, (t0, t1) = _league(client, "Rostered picks")
+    assert _available(client, league_id) == ["RC1", "RC2", "RC3", "RC4"]
+    loads = rostered.stats()["loads"]
+
+    assert client.post("/draft/pick", json={"team_id": t0, "symbol": "RC1"}).status_code == 200
+    claim = {"league_id": league_id, "team_id": t1, "player_id": 1, "ticker": "RC2"}
+    assert client.post(f"/free-agency/{league_id}/claim", json=claim).status_code == 200
+    add = {"league_id": league_id, "team_id": t1, "player_id": 2, "ticker": "RC1"}
+    assert client.post(f"/free-agency/{league_id}/add", json=add).status_code == 200
+
+    with sql_statements() as stmts:
+        _available(client, league_id)
+    assert _available(client, league_id) == ["RC3", "RC4"]
+    assert not any("roster_slots" in s for s in stmts)
+
+    # RC1 is held twice; dropping one copy keeps it rostered
+    drop = {"league_id": league_id, "team_id": t0, "symbol": "RC1"}
+    assert client.post(f"/free-agency/{league_id}/drop", json=drop).status_code == 200
+    assert _available(client, league_id) == ["RC3", "RC4"]
+    drop = {"league_id": league_id, "team_id": t1, "symbol": "RC1"}
+    assert client.post(f"/free-agency/{league_id}/drop", json=drop).status_code == 200
+    assert _available(client, league_id) == ["RC1", "RC3", "RC4"]
+
+    # a failed pick (duplicate) rolls back and leaves the set alone
+    assert client.post("/draft/pick", json={"team_id": t1, "symbol": "RC2"}).status_code == 400
+    assert _available(client, league_id) == ["RC1", "RC3", "RC4"]
+    assert rostered.stats()["loads"] == loads
+
+
+def test_other_roster_writes_force_a_reload(client):
+    league_id, (t0, _) = _league(client, "Rostered tools")
+    assert _available(client, league_id) == ["RC1", "RC2", "RC3", "RC4"]
+    loads = rostered.stats()["loads"]
+
+    r = client.post(f"/teams/{t0}/roster/active", json={"symbol": "RC3", "bucket": "LARGE_CAP"})
+    assert r.status_code == 201, r.text
+    assert _available(client, league_id) == ["RC1", "RC2", "RC4"]
+    assert rostered.stats()["loads"] == loads + 1
+
+    assert client.delete(f"/teams/{t0}/roster/active/RC3").status_code == 204
+    assert _available(client, league_id) == ["RC1", "RC2", "RC3", "RC4"]
+
+
+def test_roster_changes_by_another_worker_are_seen(client, engine):
+    league_id, (t0, _) = _league(client, "Rostered workers")
+    assert _available(client, league_id) == ["RC1", "RC2", "RC3", "RC4"]
+
+    # another process drafts RC2: its commit advances the shared roster version only
+    with Session(bind=engine) as other:
+        other.add(models.RosterSlot(team_id=t0, symbol="RC2", is_active=False))
+        data_version.advance(other, f"roster:{league_id}")
+        other.commit()
+
+    loads = rostered.stats()["loads"]
+    assert _available(client, league_id) == ["RC1", "RC3", "RC4"]
+    assert rostered.stats()["loads"] == loads + 1
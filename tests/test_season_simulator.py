@@ -0,0 +1,82 @@
+# tests/test_season_simulator.py
+import pytest
+
+from fantasy_stocks import models
+from fantasy_stocks.logic.scoring import close_week_with_proj_points, simulate_season_with_proj_points
+
+
+@pytest.fixture()
+def season(client, league_with_teams):
+    """season(n_teams) -> (league_id, team_ids) with the full schedule generated."""
+
+    def make(n_teams: int) -> tuple[int, list[int]]:
+        league_id, team_ids, _ = league_with_teams(n_teams)
+        r = client.post(f"/schedule/season/{league_id}")
+        assert r.status_code == 200, r.text
+        return league_id, team_ids
+
+    return make
+
+
+def _weeks(db, league_id: int) -> list[str]:
+    return sorted({w for (w,) in db.query(models.Match.week).filter(models.Match.league_id == league_id)})
+
+
+def _outcome(db, league_id: int, team_ids: list[int]) -> tuple:
+    db.expire_all()
+    slot = {tid: i for i, tid in enumerate(team_ids)}  # compare leagues by team position, not id
+    matches = sorted(
+        (m.week, slot[m.home_team_id], slot[m.away_team_id], m.home_points, m.away_points, slot.get(m.winner_team_id))
+        for m in db.query(models.Match).filter(models.Match.league_id == league_id)
+    )
+    scores = sorted(
+        (ts.period, slot[ts.team_id], ts.points)
+        for ts in db.query(models.TeamScore).filter(models.TeamScore.league_id == league_id)
+    )
+    standings = sorted(
+        (slot[st.team_id], st.wins, st.losses, st.ties, st.points_for)
+        for st in db.query(models.TeamStanding).filter(models.TeamStanding.league_id == league_id)
+    )
+    return matches, scores, standings
+
+
+def test_fast_simulator_matches_week_by_week_close(db_session, season):
+    slow_id, slow_teams = season(6)
+    fast_id, fast_teams = season(6)
+
+    for wk in _weeks(db_session, slow_id):
+        close_week_with_proj_points(db_session, slow_id, wk)
+    summaries = simulate_season_with_proj_points(db_session, fast_id)
+
+    assert _outcome(db_session, fast_id, fast_teams) == _outcome(db_session, slow_id, slow_teams)
+    assert [s["week"] for s in summaries] == _weeks(db_session, fast_id)
+    assert all(s["matches_scored"] == 3 for s in summaries)
+    # team 3 starts four symbols -> top scorer every week
+    assert {s["top_team_id"] for s in summaries} == {fast_teams[3]}
+
+
+def test_statement_count_does_not_grow_with_weeks(db_session, league_with_teams, season, sql_statements):
+    one_week_id, _, _ = league_with_teams(6)
+    season_id, _ = season(6)
+    assert len(_weeks(db_session, season_id)) > 1
+
+    with sql_statements() as short:
+        simulate_season_with_proj_points(db_session, one_week_id)
+    with sql_statements() as long:
+        simulate_season_with_proj_points(db_session, season_id)
+    assert len(long) == len(short)
+
+
+def test_simulate_season_endpoint_scores_only_open_matches(client, db_session, season):
+    league_id, _ = season(4)
+    weeks = _weeks(db_session, league_id)
+    close_week_with_proj_points(db_session, league_id, weeks[0])
+
+    r = client.post(f"/scoring/simulate_season/{league_id}")
+    assert r.status_code == 200, r.text
+    closed = r.json()["closed_weeks"]
+    assert [c["week"] for c in closed] == weeks[1:]
+    assert all(c["matches_scored"] == 2 for c in closed)
+
+    again = client.post(f"/scoring/simulate_season/{league_id}")
+    assert again.json()["closed_weeks"] == []
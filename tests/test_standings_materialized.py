@@ -0,0 +1,53 @@
+# tests/test_standings_materialized.py
+
+from fantasy_stocks import models
+from fantasy_stocks.logic.scoring import close_week
+
+
+def _table(client, league_id: int) -> dict[int, dict]:
+    r = client.get(f"/standings/{league_id}/table")
+    assert r.status_code == 200, r.text
+    return {row["team_id"]: row for row in r.json()}
+
+
+def test_rescoring_a_week_moves_standings_by_the_difference(client, db_session, league_with_teams):
+    league_id, team_ids, week = league_with_teams(2, proj=1.0)
+    t0, t1 = team_ids  # t0 starts 1 symbol, t1 starts 2 -> t1 wins 2-1
+
+    close_week(db_session, league_id, week)
+    table = _table(client, league_id)
+    assert (table[t1]["wins"], table[t1]["points_for"], table[t1]["points_against"]) == (1, 2.0, 1.0)
+    assert (table[t0]["losses"], table[t0]["games_played"]) == (1, 1)
+
+    # t0 adds two more starters and the week is re-scored: t0 now wins 3-2
+    for sym in ("BS1", "BS2"):
+        r = client.post(f"/teams/{t0}/roster/active", json={"symbol": sym, "bucket": "LARGE_CAP"})
+        assert r.status_code == 201, r.text
+    close_week(db_session, league_id, week)
+
+    table = _table(client, league_id)
+    assert (table[t0]["wins"], table[t0]["losses"], table[t0]["games_played"]) == (1, 0, 1)
+    assert (table[t1]["wins"], table[t1]["losses"], table[t1]["games_played"]) == (0, 1, 1)
+    assert (table[t0]["points_for"], table[t0]["points_against"]) == (3.0, 2.0)
+    assert table[t0]["win_pct"] == 1.0
+
+
+def test_table_reads_do_not_scan_matches_and_backfill_legacy_leagues(
+    client, db_session, league_with_teams, sql_statements
+):
+    league_id, team_ids, week = league_with_teams(4, proj=2.0)
+    close_week(db_session, league_id, week)
+    expected = _table(client, league_id)
+
+    with sql_statements() as statements:
+        for path in ("table", "snapshot", "tiebreakers"):
+            assert client.get(f"/standings/{league_id}/{path}").status_code == 200
+    table_reads = [s for s in statements if "team_standings" in s]
+    assert table_reads and not any("FROM matches" in s for s in table_reads)
+
+    # a league scored before the aggregate existed is rebuilt on first read
+    db_session.query(models.TeamStanding).filter(models.TeamStanding.league_id == league_id).delete()
+    db_session.commit()
+    r = client.get(f"/standings/{league_id}/snapshot")
+    assert {row["team_id"]: row for row in r.json()} == expected
+    assert db_session.query(models.TeamStanding).filter(models.TeamStanding.league_id == league_id).count() == 4
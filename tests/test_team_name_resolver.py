@@ -0,0 +1,26 @@
+# tests/test_team_name_resolver.py
+
+from fantasy_stocks.logic.scoring import close_week, simulate_season_with_proj_points
+
+
+def test_serializer_statement_count_does_not_grow_with_matches(client, db_session, league_with_teams, sql_statements):
+    short_id, _, week = league_with_teams(4)
+    close_week(db_session, short_id, week)
+
+    long_id, _, _ = league_with_teams(4)
+    r = client.post(f"/schedule/season/{long_id}")
+    assert r.status_code == 200, r.text
+    simulate_season_with_proj_points(db_session, long_id)
+
+    for path in ("/records/{}/all", "/awards/{}/season", "/awards/{}/weekly"):
+        db_session.expire_all()  # no warm identity map for either league
+        with sql_statements() as short:
+            assert client.get(path.format(short_id)).status_code == 200
+        db_session.expire_all()
+        with sql_statements() as long:
+            assert client.get(path.format(long_id)).status_code == 200
+        assert len(short) == len(long), path
+
+    body = client.get(f"/records/{long_id}/all").json()
+    assert body["game_total_high"]["home_team_name"].startswith("T")
+    assert len(body["current"]) == 4
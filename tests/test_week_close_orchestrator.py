@@ -0,0 +1,105 @@
+# tests/test_week_close_orchestrator.py
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from fantasy_stocks import cli, models
+from fantasy_stocks.db import Base
+from fantasy_stocks.logic import week_close
+from fantasy_stocks.logic.week_close import close_week_for_leagues
+
+WEEK = "2030-W05"
+
+
+@pytest.fixture()
+def file_factory(tmp_path):
+    eng = create_engine(f"sqlite:///{tmp_path / 'close.db'}", connect_args={"timeout": 5})
+    Base.metadata.create_all(bind=eng)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=eng)
+    with factory() as db:
+        for i in range(6):
+            league = models.League(name=f"wc-{i}")
+            db.add(league)
+            db.flush()
+            home = models.Team(name="H", league_id=league.id)
+            away = models.Team(name="A", league_id=league.id)
+            db.add_all([home, away])
+            db.flush()
+            db.add(models.Match(league_id=league.id, week=WEEK, home_team_id=home.id, away_team_id=away.id))
+        db.commit()
+    yield factory
+    eng.dispose()
+
+
+def test_close_week_all_endpoint_reports_per_league_outcomes(client, db_session, league_with_teams):
+    a, _, week = league_with_teams(4)
+    b, _, _ = league_with_teams(2)
+
+    r = client.post("/standings/close_week", json={"week": week, "league_ids": [a, b, 999999], "workers": 1})
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert (body["leagues"], body["ok"], body["not_found"], body["failed"], body["matches_scored"]) == (3, 2, 1, 0, 3)
+    assert [res["status"] for res in body["results"]] == ["ok", "ok", "not_found"]
+    assert body["leagues_per_second"] > 0
+
+    # idempotent scoring: re-running scores nothing new
+    r = client.post("/standings/close_week", json={"week": week, "league_ids": [a, b], "workers": 1})
+    assert r.json()["matches_scored"] == 0
+
+    assert client.post("/standings/close_week", json={"week": "bogus"}).status_code == 400
+
+
+def test_parallel_close_uses_worker_pool_and_all_leagues(file_factory):
+    report = close_week_for_leagues(file_factory, WEEK, workers=3)
+    assert report["workers"] == 3
+    assert (report["leagues"], report["ok"], report["matches_scored"]) == (6, 6, 6)
+
+    with file_factory() as db:
+        assert db.query(models.Match).filter(models.Match.home_points.is_(None)).count() == 0
+        assert db.query(models.TeamStanding).count() == 12
+
+
+def test_transient_errors_are_retried_and_others_recorded(file_factory, monkeypatch):
+    real = week_close.score_week
+    calls: dict[int, int] = {}
+
+    def flaky(db, league, week, **kwargs):
+        calls[league.id] = calls.get(league.id, 0) + 1
+        if league.id == 1:
+            raise ValueError("boom")
+        if calls[league.id] == 1:
+            raise OperationalError("UPDATE matches", {}, Exception("database is locked"))
+        return real(db, league, week, **kwargs)
+
+    monkeypatch.setattr(week_close, "score_week", flaky)
+    report = close_week_for_leagues(file_factory, WEEK, [1, 2, 3], workers=2, retry_backoff=0)
+    by_id = {r["league_id"]: r for r in report["results"]}
+    assert (report["ok"], report["not_found"], report["failed"]) == (2, 0, 1)
+    assert by_id[1]["status"] == "failed" and by_id[1]["attempts"] == 1 and "boom" in by_id[1]["error"]
+    assert by_id[2]["status"] == "ok" and by_id[2]["attempts"] == 2
+    assert by_id[3]["matches_scored"] == 1
+
+
+def test_cli_close_week(file_factory, monkeypatch, capsys):
+    monkeypatch.setattr(cli, "SessionLocal", file_factory)
+    assert cli.main(["close-week", "--week", WEEK, "--league", "4", "--workers", "2"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["results"][0]["league_id"] == 4
+    assert report["matches_scored"] == 1
+
+    # an unknown league id is reported but does not fail the run
+    assert cli.main(["close-week", "--week", WEEK, "--league", "5", "--league", "999999"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert (report["ok"], report["not_found"], report["failed"]) == (1, 1, 0)
+
+    monkeypatch.setattr(week_close, "score_week", lambda *a, **kw: 1 / 0)
+    assert cli.main(["close-week", "--week", WEEK, "--league", "6", "--max-attempts", "1"]) == 1
+    assert json.loads(capsys.readouterr().out)["failed"] == 1
+
+    with pytest.raises(SystemExit) as exc:
+        cli.main(["close-week", "--week", "2030-W99"])
+    assert exc.value.code == 2
+    assert "--week" in capsys.readouterr().err
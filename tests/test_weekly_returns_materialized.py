@@ -0,0 +1,62 @@
+# tests/test_weekly_returns_materialized.py
+from datetime import date
+from io import BytesIO
+
+from fantasy_stocks import models
+from fantasy_stocks.services.pricing import get_week_returns
+
+
+def _cells(db_session, symbol: str) -> dict[str, models.WeeklyReturn]:
+    db_session.expire_all()
+    rows = db_session.query(models.WeeklyReturn).filter(models.WeeklyReturn.symbol == symbol).all()
+    return {r.iso_week: r for r in rows}
+
+
+def test_ingest_maintains_only_affected_weekly_cells(client, db_session):
+    r = client.post(
+        "/prices/bulk",
+        json=[
+            {"symbol": "MAT1", "date": "2025-06-02", "open": 10.0, "close": 10.5},  # 2025-W23
+            {"symbol": "MAT1", "date": "2025-06-04", "open": 10.5, "close": 11.0},
+            {"symbol": "MAT1", "date": "2025-06-09", "open": 20.0, "close": 22.0},  # 2025-W24
+        ],
+    )
+    assert r.status_code == 200, r.text
+
+    cells = _cells(db_session, "MAT1")
+    assert set(cells) == {"2025-W23", "2025-W24"}
+    assert abs(cells["2025-W23"].return_pct - 10.0) < 1e-9
+    assert cells["2025-W23"].first_date == date(2025, 6, 2)
+    assert cells["2025-W23"].last_date == date(2025, 6, 4)
+    assert abs(cells["2025-W24"].return_pct - 10.0) < 1e-9
+    w24_stamp = cells["2025-W24"].updated_at
+
+    # a new Friday bar only touches W23 (CSV path)
+    csv_text = "symbol,date,open,close\nMAT1,2025-06-06,11.0,12.0\n"
+    files = {"file": ("prices.csv", BytesIO(csv_text.encode("utf-8")), "text/csv")}
+    r = client.post("/prices/csv", files=files)
+    assert r.status_code == 200, r.text
+
+    cells = _cells(db_session, "MAT1")
+    assert abs(cells["2025-W23"].return_pct - 20.0) < 1e-9
+    assert cells["2025-W23"].last_date == date(2025, 6, 6)
+    assert cells["2025-W24"].updated_at == w24_stamp
+
+    # scoring reads the materialized cell, not the raw prices
+    cells["2025-W24"].return_pct = 42.0
+    db_session.commit()
+    assert get_week_returns(db_session, ["MAT1"], "2025-W24") == {"MAT1": 42.0}
+
+
+def test_week_returns_fall_back_to_raw_prices_without_cell(db_session):
+    db_session.add_all(
+        [
+            models.Price(symbol="RAW1", date=date(2025, 6, 16), open=50.0, close=50.0),
+            models.Price(symbol="RAW1", date=date(2025, 6, 20), open=50.0, close=45.0),
+        ]
+    )
+    db_session.commit()
+
+    out = get_week_returns(db_session, ["RAW1", "NONE1"], "2025-W25")
+    assert abs(out["RAW1"] - (-10.0)) < 1e-9
+    assert out["NONE1"] == 0.0